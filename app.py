@@ -1,8 +1,48 @@
-import pygame
-from src.menu_screen import MainMenuScreen
+import argparse
+
+from src.startup import PROFILER
 
 if __name__ == "__main__":
-    pygame.init()
-    pygame.key.set_repeat(500, 50)
+    parser = argparse.ArgumentParser(description="Waids & Wyverns")
+    parser.add_argument("--seed", type=int, help="seed for dice, weather and encounters")
+    parser.add_argument("--record", metavar="LOG", help="record input to an event log")
+    parser.add_argument("--replay", metavar="LOG", help="replay input from an event log")
+    parser.add_argument("--realtime", action="store_true",
+                        help="replay at the recorded speed instead of full speed")
+    parser.add_argument("--startup-report", metavar="FILE",
+                        help="write the time spent importing and creating screens to a file")
+    args = parser.parse_args()
+
+    if args.startup_report:
+        PROFILER.start()
+
+    with PROFILER.section("imports"):
+        import pygame
+        from src import rng
+        from src.gui.event_log import EventPlayer, EventRecorder
+        from src.gui.screen import Screen
+        from src.menu_screen import MainMenuScreen
+
+    seed = args.seed
+    if args.replay:
+        Screen.player = EventPlayer(args.replay, realtime=args.realtime)
+        seed = Screen.player.seed
+    if seed is not None or args.record:
+        rng.session().reseed(seed)
+    if args.record:
+        Screen.recorder = EventRecorder(args.record, rng.session().seed)
+
+    with PROFILER.section("pygame.init"):
+        pygame.init()
+        pygame.key.set_repeat(500, 50)
 
-    MainMenuScreen().open()
+    try:
+        with PROFILER.section("MainMenuScreen"):
+            menu = MainMenuScreen()
+        menu.open()
+    finally:
+        if Screen.recorder is not None:
+            Screen.recorder.close()
+        if args.startup_report:
+            PROFILER.stop()
+            PROFILER.write(args.startup_report)
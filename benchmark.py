@@ -0,0 +1,278 @@
+"""
+Measure the frame times of every screen with scripted input.
+
+Runs headless with the SDL dummy drivers in a copy of the assets, so saves
+and notes are left alone. Prints JSON, eg.
+
+    python benchmark.py --frames 300 --output before.json
+    python benchmark.py --compare before.json
+    python benchmark.py notes_10k --replay game_night.wwlog
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame # pylint: disable=wrong-import-position
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PHASES = ("_update", "_handle_events", "_draw")
+
+
+def _mouse_motion(frame, buttons=(0, 0, 0)):
+    pos = (frame * 7 % 640, frame * 5 % 480)
+    return pygame.event.Event(pygame.MOUSEMOTION, pos=pos, rel=(7, 5), buttons=buttons)
+
+
+def _key(key, unicode=""):
+    return pygame.event.Event(pygame.KEYDOWN, key=key, unicode=unicode, mod=0)
+
+
+def _main_menu():
+    from src.menu_screen import MainMenuScreen # pylint: disable=import-outside-toplevel
+    return MainMenuScreen(preload=False), lambda frame: [_mouse_motion(frame)]
+
+
+def _initiative():
+    # pylint: disable=import-outside-toplevel
+    from src.initiative import InitiativeTracker
+    from src.initiative_screen import InitiativeTrackerScreen
+
+    tracker = InitiativeTracker()
+    for i in range(200):
+        tracker.create_character(f"goblin {i}", i % 20 + 1, 7)
+    screen = InitiativeTrackerScreen(tracker)
+    screen.journal.path = None
+    return screen, lambda frame: [_mouse_motion(frame)]
+
+
+def _notes():
+    from src.notes_screen import NotesScreen # pylint: disable=import-outside-toplevel
+
+    screen = NotesScreen()
+    # pylint: disable=protected-access
+    screen._textarea.value = ("The party rests at the Prancing Pony. " * 4 + "\n") * 64
+
+    def events(frame):
+        if frame % 10 == 9:
+            return [_key(pygame.K_BACKSPACE)]
+        return [_key(pygame.K_a, "a")]
+    return screen, events
+
+
+def _map():
+    # pylint: disable=import-outside-toplevel
+    from src.map_screen import MapAndCharacterScreen
+    from src.map_view import MapView
+
+    screen = MapAndCharacterScreen()
+    # pylint: disable=protected-access
+    screen._map = MapView(pygame.Surface((4000, 4000)), (screen.screen_width, screen.screen_height))
+    screen.zoom = screen.MAX_ZOOM
+    screen.zoom_offset = (0, 0)
+
+    def events(frame):
+        if frame % 2:
+            return [_mouse_motion(frame, buttons=(1, 0, 0))]
+        return [pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(320, 240), button=1)]
+    return screen, events
+
+
+def _map_tokens():
+    from src.map_screen import _Character # pylint: disable=import-outside-toplevel
+
+    screen, events = _map()
+    token = os.path.join(".", "assets", "images", "characters", "placeholder.jpg")
+    # pylint: disable=protected-access
+    for i in range(100):
+        screen._add_character(_Character(token, pos=(i % 10 * 60, i // 10 * 45), size=(40, 40)))
+    screen.zoom = 2.0
+    screen.zoom_offset = (0, 0)
+    return screen, events
+
+
+def _dice_roller():
+    from src.dice_roller_screen import DiceRollerScreen # pylint: disable=import-outside-toplevel
+    return DiceRollerScreen(), lambda frame: [_mouse_motion(frame)]
+
+
+def _sound_player():
+    from src.sound_screen import SoundPlayerScreen # pylint: disable=import-outside-toplevel
+    return SoundPlayerScreen(), lambda frame: [_mouse_motion(frame)]
+
+
+def _weather_time():
+    # pylint: disable=import-outside-toplevel
+    from src.weather_time_screen import WeatherAndTimeScreen
+    return WeatherAndTimeScreen(), lambda frame: [_mouse_motion(frame)]
+
+
+def _spell_list():
+    from src.spell_list import SpellList # pylint: disable=import-outside-toplevel
+
+    screen = SpellList()
+    # pylint: disable=protected-access
+    screen._search_bar.selected = True
+    screen._search_bar.value = "a"
+    return screen, lambda frame: [_mouse_motion(frame)]
+
+
+SCENARIOS = {
+    "main_menu": _main_menu,
+    "initiative_200": _initiative,
+    "notes_10k": _notes,
+    "map_4000_max_zoom": _map,
+    "map_100_tokens": _map_tokens,
+    "dice_roller": _dice_roller,
+    "sound_player": _sound_player,
+    "weather_time": _weather_time,
+    "spell_list": _spell_list,
+}
+
+
+def _replay_setup(setup, player):
+    """Get setup that uses the frames of an EventPlayer, repeated, as the scripted input."""
+    def replay_setup():
+        screen, _ = setup()
+        return screen, lambda frame: player.frames[frame % len(player)][1]
+    return replay_setup
+
+
+def _percentiles(values):
+    values = sorted(values)
+    return {
+        "p50": values[len(values) // 2],
+        "p99": values[min(int(len(values) * 0.99), len(values) - 1)],
+        "mean": statistics.mean(values),
+    }
+
+
+def _timed(method, times):
+    def timed(*args):
+        start = time.perf_counter()
+        result = method(*args)
+        times.append(time.perf_counter() - start)
+        return result
+    return timed
+
+
+def run_scenario(setup, frames, display):
+    """
+    Run frames of a scenario, first timed and then with tracemalloc.
+
+    :returns: Dictionary of frame and phase times in ms and bytes allocated per frame.
+    """
+    # pylint: disable=protected-access
+    screen, events = setup()
+    phase_times = {phase: [] for phase in PHASES}
+    for phase in PHASES:
+        setattr(screen, phase, _timed(getattr(screen, phase), phase_times[phase]))
+
+    screen.mark_dirty()
+    frame_times = []
+    for frame in range(frames):
+        start = time.perf_counter()
+        screen._frame(display, events(frame))
+        frame_times.append(time.perf_counter() - start)
+
+    allocations = []
+    tracemalloc.start()
+    for frame in range(frames, frames + max(frames // 10, 1)):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        screen._frame(display, events(frame))
+        allocations.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+
+    result = {"frame_ms": _percentiles([t * 1000 for t in frame_times])}
+    for phase, times in phase_times.items():
+        if times:
+            result[phase.strip("_") + "_ms"] = _percentiles([t * 1000 for t in times[:frames]])
+    result["alloc_bytes"] = _percentiles(allocations)
+    return result
+
+
+def compare(old, new):
+    """Print the change in p50 and p99 frame times between two results."""
+    for name, result in new["screens"].items():
+        if name not in old["screens"]:
+            continue
+        before = old["screens"][name]["frame_ms"]
+        after = result["frame_ms"]
+        print(f"{name:>20}: p50 {before['p50']:8.3f} -> {after['p50']:8.3f} ms, "
+              f"p99 {before['p99']:8.3f} -> {after['p99']:8.3f} ms", file=sys.stderr)
+
+
+def main():
+    """Run the benchmarks chosen on the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n", maxsplit=1)[0])
+    parser.add_argument("scenarios", nargs="*",
+                        help=f"scenarios to run, all if none: {', '.join(SCENARIOS)}")
+    parser.add_argument("--frames", type=int, default=200, help="frames to time per scenario")
+    parser.add_argument("--output", help="file to write the JSON to instead of stdout")
+    parser.add_argument("--compare", help="JSON of an earlier run to compare with")
+    parser.add_argument("--replay", metavar="LOG",
+                        help="event log recorded with app.py --record to use as input")
+    args = parser.parse_args()
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    pygame.init()
+    sys.path.insert(0, ROOT)
+    # pylint: disable=import-outside-toplevel
+    from src import rng
+    from src.gui.event_log import EventPlayer
+
+    player = None
+    if args.replay:
+        player = EventPlayer(args.replay)
+        if not player.frames:
+            parser.error(f'"{args.replay}" has no events')
+
+    results = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "frames": args.frames,
+        "screens": {},
+    }
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        shutil.copytree(os.path.join(ROOT, "assets"), os.path.join(directory, "assets"))
+        os.chdir(directory)
+        try:
+            display = pygame.display.set_mode((640, 480))
+            for name in args.scenarios or SCENARIOS:
+                setup = SCENARIOS[name]
+                if player is not None:
+                    rng.session().reseed(player.seed)
+                    setup = _replay_setup(setup, player)
+                results["screens"][name] = run_scenario(setup, args.frames, display)
+        finally:
+            os.chdir(cwd)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output:
+            output.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as old:
+            compare(json.load(old), results)
+
+
+if __name__ == "__main__":
+    main()
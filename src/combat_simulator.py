@@ -0,0 +1,289 @@
+"""All utilities and classes for simulating combat damage.
+
+Runs without any GUI so it can be used from scripts, eg.
+
+    report = simulate_combat([Attack(5, "1d8+3"), Attack(7, "2d6+4", advantage=True)],
+                             Target(15, 60))
+    print(report)
+"""
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .dice_expression import compile_expression
+from .rng import RandomStreams, ENCOUNTER_STREAM
+
+
+class Attack:
+    """Class to represent a single attack made every round."""
+
+    def __init__(self, attack_bonus, damage, advantage=None, critical_range=20):
+        """
+        Create an instance of Attack.
+
+        :param attack_bonus: Number added to the d20 attack roll.
+        :param damage: Dice notation of the damage, eg. "1d8+3".
+        :param advantage: True for advantage, False for disadvantage, None for neither.
+        :param critical_range: Lowest d20 roll that is a critical hit.
+        """
+        self.attack_bonus = attack_bonus
+        self.damage = damage
+        self.advantage = advantage
+        self.critical_range = critical_range
+        compile_expression(damage)
+
+
+class Target:
+    """Class to represent the stat block being attacked."""
+
+    def __init__(self, armor_class, health):
+        """
+        Create an instance of Target.
+
+        :param armor_class: Armor class attacks must meet to hit.
+        :param health: Hit points of the target.
+        """
+        self.armor_class = armor_class
+        self.health = health
+
+
+class SimulationReport:
+    """Class to hold the results of a combat simulation."""
+
+    def __init__(self, damage_histogram, rounds_histogram, elapsed, confidence):
+        """
+        Create an instance of SimulationReport.
+
+        :param damage_histogram: Array counting rounds that dealt each amount of damage.
+        :param rounds_histogram: Array counting trials that killed the target in each
+                                 round, index 0 counts trials where the target survived.
+        :param elapsed: Seconds the simulation took.
+        :param confidence: Confidence level of the reported intervals.
+        """
+        self.damage_histogram = damage_histogram
+        self.rounds_histogram = rounds_histogram
+        self.elapsed = elapsed
+        self.confidence = confidence
+        self.trials = int(rounds_histogram.sum())
+
+    @property
+    def trials_per_second(self):
+        """Number of simulated fights per second."""
+        return self.trials / self.elapsed if self.elapsed else float("inf")
+
+    @property
+    def damage_per_round(self):
+        """Mean damage dealt per round."""
+        return _histogram_mean(self.damage_histogram)
+
+    @property
+    def damage_per_round_interval(self):
+        """Confidence interval (low, high) of damage_per_round."""
+        return _histogram_interval(self.damage_histogram, self.confidence)
+
+    @property
+    def rounds_to_kill(self):
+        """Mean number of rounds needed to kill the target."""
+        return _histogram_mean(self._kill_histogram())
+
+    @property
+    def rounds_to_kill_interval(self):
+        """Confidence interval (low, high) of rounds_to_kill."""
+        return _histogram_interval(self._kill_histogram(), self.confidence)
+
+    @property
+    def survival_rate(self):
+        """Fraction of trials where the target was not killed."""
+        return self.rounds_histogram[0] / self.trials
+
+    def kill_probability(self, rounds):
+        """Get the probability the target is dead after some number of rounds."""
+        return self._kill_histogram()[:rounds + 1].sum() / self.trials
+
+    def _kill_histogram(self):
+        histogram = self.rounds_histogram.copy()
+        histogram[0] = 0
+        return histogram
+
+    def __str__(self): # pragma: no cover
+        low, high = self.damage_per_round_interval
+        return (f"{self.trials} trials in {self.elapsed:.2f}s "
+                f"({self.trials_per_second:.0f} trials/sec)\n"
+                f"damage per round: {self.damage_per_round:.2f} ({low:.2f} - {high:.2f})\n"
+                f"rounds to kill: {self.rounds_to_kill:.2f}, "
+                f"survived: {self.survival_rate:.2%}")
+
+
+def _histogram_mean(histogram):
+    count = histogram.sum()
+    if not count:
+        return float("nan")
+    return float(np.dot(np.arange(len(histogram)), histogram) / count)
+
+
+# Coefficients of Acklam's rational approximation of the normal quantile
+_QUANTILE_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+               1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_QUANTILE_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+               6.680131188771972e+01, -1.328068155288572e+01)
+_QUANTILE_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+               -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_QUANTILE_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00,
+               3.754408661907416e+00)
+_QUANTILE_LOW = 0.02425
+
+
+def _polynomial(coefficients, x):
+    result = 0.0
+    for coefficient in coefficients:
+        result = result * x + coefficient
+    return result
+
+
+def _normal_quantile(probability):
+    """
+    Get the value the standard normal distribution is below with probability.
+
+    statistics.NormalDist needs Python 3.8, this is accurate to about 1e-8.
+    """
+    if not 0 < probability < 1:
+        raise ValueError(f"probability must be between 0 and 1, not {probability}")
+
+    if probability < _QUANTILE_LOW or probability > 1 - _QUANTILE_LOW:
+        q = math.sqrt(-2 * math.log(min(probability, 1 - probability)))
+        x = _polynomial(_QUANTILE_C, q) / (_polynomial(_QUANTILE_D, q) * q + 1)
+        return x if probability < _QUANTILE_LOW else -x
+
+    q = probability - 0.5
+    r = q * q
+    return _polynomial(_QUANTILE_A, r) * q / (_polynomial(_QUANTILE_B, r) * r + 1)
+
+
+def _histogram_interval(histogram, confidence):
+    count = histogram.sum()
+    mean = _histogram_mean(histogram)
+    if count < 2:
+        return (mean, mean)
+
+    values = np.arange(len(histogram))
+    variance = np.dot((values - mean) ** 2, histogram) / (count - 1)
+    half_width = _normal_quantile(0.5 + confidence / 2) * (variance / count) ** 0.5
+    return (mean - half_width, mean + half_width)
+
+
+def _merge_histograms(first, second):
+    if len(first) < len(second):
+        first, second = second, first
+    merged = first.copy()
+    merged[:len(second)] += second
+    return merged
+
+
+def _round_damage(attacks, armor_class, trials, rng):
+    """Get array of the damage dealt by every attack in one round of each trial."""
+    total = np.zeros(trials, dtype=np.int64)
+
+    for attack in attacks:
+        if attack.advantage is None:
+            d20 = rng.integers(1, 21, size=trials)
+        else:
+            rolls = rng.integers(1, 21, size=(trials, 2))
+            d20 = rolls.max(axis=1) if attack.advantage else rolls.min(axis=1)
+
+        critical = d20 >= attack.critical_range
+        hit = critical | ((d20 != 1) & (d20 + attack.attack_bonus >= armor_class))
+        damage = compile_expression(attack.damage).roll_batch(trials, rng, critical=critical)
+        total += np.where(hit, np.maximum(damage, 0), 0)
+
+    return total
+
+
+def _run_shard(attacks, target, trials, max_rounds, streams):
+    """Simulate trials fights, returns their damage and rounds histograms."""
+    rng = streams.stream(ENCOUNTER_STREAM)
+    health = np.full(trials, target.health, dtype=np.int64)
+    rounds = np.zeros(trials, dtype=np.int64)
+    alive = np.arange(trials)
+    damage_histogram = np.zeros(1, dtype=np.int64)
+
+    for round_number in range(1, max_rounds + 1):
+        if alive.size == 0:
+            break
+
+        damage = _round_damage(attacks, target.armor_class, len(alive), rng)
+        damage_histogram = _merge_histograms(damage_histogram, np.bincount(damage))
+
+        health[alive] -= damage
+        killed = health[alive] <= 0
+        rounds[alive[killed]] = round_number
+        alive = alive[~killed]
+
+    return damage_histogram, np.bincount(rounds, minlength=max_rounds + 1)
+
+
+def _converged(damage_histogram, rounds_histogram, confidence, tolerance):
+    """True if both intervals are within tolerance (relative) of their mean."""
+    kill_histogram = rounds_histogram.copy()
+    kill_histogram[0] = 0
+
+    for histogram in (damage_histogram, kill_histogram):
+        if histogram.sum() < 2:
+            continue
+        low, high = _histogram_interval(histogram, confidence)
+        if (high - low) / 2 > tolerance * abs(_histogram_mean(histogram)):
+            return False
+    return True
+
+
+def simulate_combat(attacks, target, *, confidence=0.95, tolerance=0.01,
+                    batch_size=100000, max_trials=10000000, max_rounds=100,
+                    workers=None, seed=None):
+    """
+    Estimate damage per round and rounds to kill with Monte Carlo trials.
+
+    Trials are run in batches of batch_size per worker process until the
+    confidence intervals are within tolerance of the means or max_trials
+    have been run.
+
+    :param attacks: List of Attack made each round.
+    :param target: Target being attacked.
+    :param confidence: Confidence level of the intervals, eg. 0.95.
+    :param tolerance: Largest half width of the intervals relative to their mean.
+    :param batch_size: Number of trials per worker per batch.
+    :param max_trials: Stop after this many trials even if not converged.
+    :param max_rounds: Fights still going after this many rounds count as survived.
+    :param workers: Number of worker processes, 1 runs in this process and
+                    None uses one per CPU.
+    :param seed: Seed to make the simulation reproducible.
+    :returns: SimulationReport
+    """
+    # pylint: disable=too-many-arguments,too-many-locals
+    workers = workers if workers is not None else os.cpu_count() or 1
+    streams = RandomStreams(seed)
+    damage_histogram = np.zeros(1, dtype=np.int64)
+    rounds_histogram = np.zeros(max_rounds + 1, dtype=np.int64)
+    executor = ProcessPoolExecutor(workers) if workers > 1 else None
+    start = time.perf_counter()
+
+    try:
+        while rounds_histogram.sum() < max_trials:
+            shards = min(workers, -(-(max_trials - rounds_histogram.sum()) // batch_size))
+            args = ([attacks] * shards, [target] * shards, [batch_size] * shards,
+                    [max_rounds] * shards, streams.spawn(shards))
+            results = executor.map(_run_shard, *args) if executor else map(_run_shard, *args)
+
+            for shard_damage, shard_rounds in results:
+                damage_histogram = _merge_histograms(damage_histogram, shard_damage)
+                rounds_histogram += shard_rounds
+
+            if _converged(damage_histogram, rounds_histogram, confidence, tolerance):
+                break
+    finally:
+        if executor:
+            executor.shutdown()
+
+    return SimulationReport(damage_histogram, rounds_histogram,
+                            time.perf_counter() - start, confidence)
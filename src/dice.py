@@ -1,36 +1,85 @@
 """ All utilities and classes for dice functions"""
 # Goal: https://www.wizards.com/dnd/dice/dice.htm
-import random
+import numpy as np
 
+from .rng import get_stream, DICE_STREAM
 
-def roll_results(times, dice_type, enable_modifier, mod_num):
+DICE_SIDES = {"d4": 4, "d6": 6, "d8": 8, "d10": 10, "d12": 12, "d20": 20, "d100": 100}
+
+
+class BatchRoll:
+    """
+    Results of rolling several groups of dice in one call.
+
+    Every die rolled is stored in a single flat array, groups are
+    slices of that array. Use rolls(group) to get the dice of a group.
+    """
+
+    def __init__(self, values, offsets, totals, modifiers):
+        """
+        Create an instance of BatchRoll.
+
+        :param values: Flat array of every die rolled, grouped in order.
+        :param offsets: Array of len(groups) + 1 offsets into values.
+        :param totals: Array of the sum of each group including its modifier.
+        :param modifiers: Array of the modifier of each group.
+        """
+        self.values = values
+        self.offsets = offsets
+        self.totals = totals
+        self.modifiers = modifiers
+
+    def __len__(self):
+        return len(self.totals)
+
+    def rolls(self, group):
+        """Get array of the dice rolled for a single group."""
+        return self.values[self.offsets[group]:self.offsets[group + 1]]
+
+
+def roll_batch(times, sides, modifiers=0, rng=None):
+    """
+    Roll many groups of dice at once.
+
+    Each group is times[i] dice with sides[i] sides plus modifiers[i].
+    sides and modifiers may be single numbers shared by every group.
+
+    :param times: Number of dice to roll for each group.
+    :param sides: Number of sides of the dice of each group.
+    :param modifiers: Modifier added to the total of each group.
+    :param rng: numpy Generator to roll with, defaults to the session's dice stream.
+    :returns: BatchRoll
+    """
+    rng = rng if rng is not None else get_stream(DICE_STREAM)
+    times = np.atleast_1d(np.asarray(times, dtype=np.int64))
+    sides = np.broadcast_to(np.asarray(sides, dtype=np.int64), times.shape)
+    modifiers = np.broadcast_to(np.asarray(modifiers, dtype=np.int64), times.shape)
+
+    offsets = np.zeros(len(times) + 1, dtype=np.int64)
+    np.cumsum(times, out=offsets[1:])
+
+    die_sides = np.repeat(sides, times)
+    values = rng.integers(1, die_sides + 1, size=len(die_sides))
+
+    groups = np.repeat(np.arange(len(times)), times)
+    totals = np.bincount(groups, weights=values, minlength=len(times)).astype(np.int64)
+    totals += modifiers
+    return BatchRoll(values, offsets, totals, modifiers)
+
+
+def roll_results(times, dice_type, enable_modifier, mod_num, rng=None):
     """Returns roll results"""
-    count = 0
-    total = 0
-    rolls = []
-    if enable_modifier:
-        total += _modifier(total, mod_num)
-    while count < times:
-        value = roll_dice(dice_type)
-        rolls.append(value)
-        total += value
-        count += 1
-    return [rolls, mod_num, total]
-
-
-def _modifier(total, mod_num):
-    """Increments/Decrements dice as needed"""
-    # Positive vs Negative selection button
-    total += mod_num
-    return total
-
-
-def advantage_disadvantage(advantage, dice_type):
+    modifier = mod_num if enable_modifier else 0
+    result = roll_batch([times], DICE_SIDES[dice_type], modifier, rng=rng)
+    return [result.rolls(0).tolist(), mod_num, int(result.totals[0])]
+
+
+def advantage_disadvantage(advantage, dice_type, rng=None):
     """Advantage rolls same dice again and picks larger,
     disadvantage rolls again, picks lower"""
     # Rules: https://5thsrd.org/rules/advantage_and_disadvantage/
     # Use the same dice type that is picked, i.e roll d4 twice
-    roll1, roll2 = roll_dice(dice_type), roll_dice(dice_type)
+    roll1, roll2 = roll_batch([2], DICE_SIDES[dice_type], rng=rng).values.tolist()
     if advantage:
         value = max(roll1, roll2)
     else:
@@ -38,22 +87,8 @@ def advantage_disadvantage(advantage, dice_type):
     return ([roll1, roll2], value)
 
 
-def roll_dice(dice_type):
+def roll_dice(dice_type, rng=None):
     """Returns dice value"""
-    value = None
-
-    if dice_type == "d4":
-        value = random.randint(1, 4)
-    elif dice_type == "d6":
-        value = random.randint(1, 6)
-    elif dice_type == "d8":
-        value = random.randint(1, 8)
-    elif dice_type == "d10":
-        value = random.randint(1, 10)
-    elif dice_type == "d12":
-        value = random.randint(1, 12)
-    elif dice_type == "d20":
-        value = random.randint(1, 20)
-    elif dice_type == "d100":
-        value = random.randint(1, 100)
-    return value
+    if dice_type not in DICE_SIDES:
+        return None
+    return int(roll_batch([1], DICE_SIDES[dice_type], rng=rng).values[0])
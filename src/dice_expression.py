@@ -0,0 +1,190 @@
+"""All utilities and classes for dice expressions in standard dice notation.
+
+Supported notation (case insensitive, spaces allowed around + and -):
+
+* ``NdM``   roll N dice with M sides, N defaults to 1 and ``d%`` is a d100
+* ``!``     exploding dice, every max roll adds another roll of that die
+* ``rX``    reroll once any die showing X or less, ``r`` alone rerolls 1s
+* ``khX``   keep highest X dice (``kX`` is the same)
+* ``klX``   keep lowest X dice
+* ``dhX``   drop highest X dice
+* ``dlX``   drop lowest X dice
+* ``+ -``   add or subtract dice terms and numbers
+
+eg. ``4d6kh3+2d8!+5`` or ``2d20kl1``
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+from .probability import pool_distribution
+from .rng import get_stream, DICE_STREAM
+
+# Limit how many times a single die can explode
+MAX_EXPLOSIONS = 100
+
+_TERM = re.compile(r"([+-]?)(?:(\d*)d(\d+|%)((?:!|r\d*|k[hl]?\d+|d[hl]\d+)*)|(\d+))")
+_OPTION = re.compile(r"(!)|r(\d*)|(k[hl]?|d[hl])(\d+)")
+
+DiceTerm = namedtuple("DiceTerm", ["sign", "count", "sides", "reroll", "explode",
+                                   "keep_highest", "keep"])
+
+
+class DiceExpression:
+    """Class to represent a compiled dice expression."""
+
+    def __init__(self, text, terms, modifier):
+        """
+        Create an instance of DiceExpression.
+
+        Use compile_expression instead of creating these directly.
+
+        :param text: Dice notation this expression was compiled from.
+        :param terms: List of DiceTerm making up this expression.
+        :param modifier: Sum of all numbers in the expression.
+        """
+        self.text = text
+        self.terms = terms
+        self.modifier = modifier
+        self._plan = [_compile_term(term) for term in terms]
+
+    def __str__(self): # pragma: no cover
+        return self.text
+
+    def roll(self, rng=None):
+        """
+        Roll this expression once.
+
+        :param rng: numpy Generator to roll with, defaults to the session's dice stream.
+        :returns: [rolls, modifier, total] like dice.roll_results, subtracted
+                  dice are negative in rolls.
+        """
+        rng = rng if rng is not None else get_stream(DICE_STREAM)
+        rolls = []
+        for roll_term in self._plan:
+            rolls.extend(roll_term(1, rng)[0].tolist())
+        return [rolls, self.modifier, sum(rolls) + self.modifier]
+
+    def roll_batch(self, trials, rng=None, critical=None):
+        """
+        Roll this expression many times at once.
+
+        :param trials: Number of times to roll.
+        :param rng: numpy Generator to roll with, defaults to the session's dice stream.
+        :param critical: Boolean array, dice are rolled twice for the trials that are True.
+        :returns: Array of the total of each roll.
+        """
+        rng = rng if rng is not None else get_stream(DICE_STREAM)
+        totals = np.full(trials, self.modifier, dtype=np.int64)
+        critical_count = int(critical.sum()) if critical is not None else 0
+
+        for roll_term in self._plan:
+            totals += roll_term(trials, rng).sum(axis=1)
+            if critical_count:
+                totals[critical] += roll_term(critical_count, rng).sum(axis=1)
+        return totals
+
+    def distribution(self):
+        """
+        Get the exact probability Distribution of this expression.
+
+        :returns: Distribution, or None if the expression rerolls, explodes,
+                  keeps or subtracts dice.
+        """
+        counts = {}
+        for term in self.terms:
+            if term.sign < 0 or term.reroll or term.explode or term.keep is not None:
+                return None
+            counts[term.sides] = counts.get(term.sides, 0) + term.count
+
+        die_sides = sorted(counts)
+        return pool_distribution([counts[sides] for sides in die_sides],
+                                 self.modifier, die_sides)
+
+
+def _compile_term(term):
+    """Compile a DiceTerm into a function rolling it trials times."""
+    sign, count, sides, reroll, explode, keep_highest, keep = term
+
+    def roll_term(trials, rng):
+        values = rng.integers(1, sides + 1, size=(trials, count))
+
+        if reroll:
+            rerolled = values <= reroll
+            values[rerolled] = rng.integers(1, sides + 1, size=int(rerolled.sum()))
+
+        if explode:
+            exploding = values == sides
+            for _ in range(MAX_EXPLOSIONS):
+                if not exploding.any():
+                    break
+                extra = rng.integers(1, sides + 1, size=int(exploding.sum()))
+                values[exploding] += extra
+                exploding[exploding] = extra == sides
+
+        if keep is not None:
+            values = np.sort(values, axis=1)
+            values = values[:, count - keep:] if keep_highest else values[:, :keep]
+
+        return values * sign
+
+    return roll_term
+
+
+def _parse_term(sign, count, sides, options):
+    count = int(count) if count else 1
+    sides = 100 if sides == "%" else int(sides)
+    reroll, explode, keep_highest, keep = 0, False, True, None
+
+    if sides < 1:
+        raise ValueError("dice must have at least 1 side")
+
+    for explode_option, reroll_option, keep_option, keep_count in _OPTION.findall(options):
+        if explode_option:
+            if sides < 2:
+                raise ValueError("dice with 1 side can not explode")
+            explode = True
+        elif keep_option:
+            keep_count = int(keep_count)
+            if keep_count > count:
+                raise ValueError(f"can not keep or drop {keep_count} of {count} dice")
+            keep_highest = keep_option in ("k", "kh", "dl")
+            keep = keep_count if keep_option[0] == "k" else count - keep_count
+        else:
+            reroll = int(reroll_option) if reroll_option else 1
+
+    return DiceTerm(sign, count, sides, reroll, explode, keep_highest, keep)
+
+
+@lru_cache(maxsize=512)
+def compile_expression(text):
+    """
+    Compile dice notation into a DiceExpression.
+
+    Compiled expressions are cached by text, so compiling the same
+    expression again costs no parsing.
+
+    :param text: Dice notation, eg. "4d6kh3+2d8!+5".
+    :raises ValueError: If text is not valid dice notation.
+    """
+    normalized = re.sub(r"\s*([+-])\s*", r"\1", text.lower().strip())
+    terms, modifier, pos = [], 0, 0
+
+    while pos < len(normalized):
+        match = _TERM.match(normalized, pos)
+        if match is None or match.end() == pos or (pos and not match.group(1)):
+            raise ValueError(f'Invalid dice expression "{text}"')
+
+        sign = -1 if match.group(1) == "-" else 1
+        if match.group(5) is not None:
+            modifier += sign * int(match.group(5))
+        else:
+            terms.append(_parse_term(sign, *match.group(2, 3, 4)))
+        pos = match.end()
+
+    if pos == 0:
+        raise ValueError(f'Invalid dice expression "{text}"')
+
+    return DiceExpression(text, terms, modifier)
@@ -11,6 +11,7 @@ from .gui.screen import Screen
 from .gui.textbox import TextBox, NUMERIC_KEYS, ARITHMETIC_KEYS
 from .gui.utils import draw_text, Button, load_font
 from .dice import roll_results, advantage_disadvantage
+from .dice_expression import compile_expression
 
 
 class DiceRollerScreen(Screen):
@@ -119,7 +120,17 @@ class DiceRollerScreen(Screen):
         self._macro_output = f'Invalid macro "{macro_name}"'
 
         if macro_name in self._macros:
-            self._macro_output = self._macros[macro_name].roll()
+            macro_name = self._macros[macro_name].expression
+        try:
+            # saved macros can be invalid too, eg. with a negative number of dice
+            expression = compile_expression(macro_name)
+        except ValueError:
+            return
+
+        self._macro_output = _format_roll(expression.roll())
+        distribution = expression.distribution()
+        if distribution is not None:
+            self._macro_output += f" (avg {distribution.mean:g})"
 
     def _roll_advantage(self):
         self._advantage_result = advantage_disadvantage(True, "d20")
@@ -210,11 +221,16 @@ class _Macro:
         self.dice_count = dice_count
         self.mod = mod
 
-    def roll(self):
-        """Get string representing result of rolling this macro."""
-        dice_rolls = []
-        for times, sides in zip(self.dice_count, self.die_sides):
-            dice_rolls.extend(roll_results(times, f"d{sides}", False, 0)[0])
+    @property
+    def expression(self):
+        """Dice notation for this macro, eg. "3d4-33"."""
+        terms = [f"{times}d{sides}" for times, sides in zip(self.dice_count, self.die_sides)
+                 if times]
+        return "+".join(terms) + f"{self.mod:+d}"
 
-        dice_rolls_string = " + ".join([str(roll) for roll in dice_rolls])
-        return f"{dice_rolls_string} + ({self.mod}) = {sum(dice_rolls) + self.mod}"
+
+def _format_roll(result):
+    """Get string representing a [rolls, modifier, total] roll result."""
+    rolls, mod, total = result
+    dice_rolls_string = " + ".join([str(roll) for roll in rolls])
+    return f"{dice_rolls_string} + ({mod}) = {total}"
@@ -0,0 +1,229 @@
+"""All utilities and classes for simulating whole encounters.
+
+Does not import pygame, so it starts fast in worker processes, eg.
+
+    party = [Combatant("Bilbo", "party", 20, 14, 5, damage="1d6+3", initiative_bonus=3)]
+    goblins = [Combatant(f"goblin {i}", "goblins", 7, 15, 4, damage="1d6+2") for i in range(3)]
+    print(simulate_encounters(party + goblins, encounters=10000))
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .dice_expression import compile_expression
+from .initiative import InitiativeTracker
+from .rng import RandomStreams, ENCOUNTER_STREAM
+from .turn_engine import TurnEngine
+
+
+def _target_random(enemies, rng):
+    return enemies[rng.integers(len(enemies))]
+
+
+def _target_weakest(enemies, _rng):
+    return min(enemies, key=lambda enemy: enemy.health)
+
+
+def _target_strongest(enemies, _rng):
+    return max(enemies, key=lambda enemy: enemy.health)
+
+
+def _target_first(enemies, _rng):
+    return enemies[0]
+
+
+POLICIES = {
+    "random": _target_random,
+    "weakest": _target_weakest,
+    "strongest": _target_strongest,
+    "first": _target_first,
+}
+
+
+class Combatant:
+    """Class to represent the stat block of one combatant."""
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, name, side, health, armor_class, attack_bonus, *, damage,
+                 initiative_bonus=0, attacks=1, policy="random"):
+        """
+        Create an instance of Combatant.
+
+        :param name: Name of the combatant.
+        :param side: Name of the side the combatant fights for.
+        :param health: Hit points.
+        :param armor_class: Armor class.
+        :param attack_bonus: Number added to d20 attack rolls.
+        :param damage: Dice notation of the damage of each attack, eg. "1d8+3".
+        :param initiative_bonus: Number added to the d20 initiative roll.
+        :param attacks: Number of attacks each turn.
+        :param policy: Name of the POLICIES used to pick a target.
+        """
+        # pylint: disable=too-many-arguments
+        if policy not in POLICIES:
+            raise ValueError(f'Unknown policy "{policy}"')
+
+        self.name = name
+        self.side = side
+        self.health = health
+        self.armor_class = armor_class
+        self.attack_bonus = attack_bonus
+        self.damage = damage
+        self.initiative_bonus = initiative_bonus
+        self.attacks = attacks
+        self.policy = policy
+        compile_expression(damage)
+
+
+class EncounterReport:
+    """Class to hold the results of many simulated encounters."""
+
+    def __init__(self, combatants, wins, rounds_histogram, damage_taken):
+        """
+        Create an instance of EncounterReport.
+
+        :param combatants: List of Combatant that fought.
+        :param wins: Dictionary of side to number of encounters won, None for draws.
+        :param rounds_histogram: Array counting encounters that lasted each number of rounds.
+        :param damage_taken: Array of the total damage taken by each combatant.
+        """
+        self.combatants = combatants
+        self.wins = wins
+        self.rounds_histogram = rounds_histogram
+        self.damage_taken = damage_taken
+        self.encounters = int(rounds_histogram.sum())
+
+    @property
+    def win_rates(self):
+        """Dictionary of side to fraction of encounters won, None for draws."""
+        return {side: wins / self.encounters for side, wins in self.wins.items()}
+
+    @property
+    def mean_rounds(self):
+        """Mean number of rounds an encounter lasted."""
+        return float(np.dot(np.arange(len(self.rounds_histogram)), self.rounds_histogram)
+                     / self.encounters)
+
+    @property
+    def mean_damage_taken(self):
+        """List of the mean damage taken per encounter by each of combatants, in order."""
+        return (self.damage_taken / self.encounters).tolist()
+
+    def __str__(self): # pragma: no cover
+        rates = ", ".join(f"{side}: {rate:.1%}" for side, rate in self.win_rates.items())
+        return f"{self.encounters} encounters, {self.mean_rounds:.2f} rounds, wins {rates}"
+
+
+def _attack(attacker, target, rng):
+    """Get damage of one attack, 0 on a miss."""
+    d20 = rng.integers(1, 21)
+    if d20 == 1 or (d20 != 20 and d20 + attacker.attack_bonus < target.armor_class):
+        return 0
+
+    expression = compile_expression(attacker.damage)
+    damage = expression.roll_batch(1, rng, critical=np.array([d20 == 20]))
+    return max(int(damage[0]), 0)
+
+
+def _run_encounter(combatants, max_rounds, rng):
+    """
+    Play out a single encounter.
+
+    :returns: Tuple (winning side or None, rounds, array of damage taken)
+    """
+    # pylint: disable=too-many-locals
+    tracker = InitiativeTracker()
+    index = {}
+    alive = {}
+    for i, combatant in enumerate(combatants):
+        initiative = int(rng.integers(1, 21)) + combatant.initiative_bonus
+        character = tracker.create_character(combatant.name, initiative, combatant.health,
+                                             armor_class=combatant.armor_class)
+        index[character] = i
+        alive[combatant.side] = alive.get(combatant.side, 0) + 1
+
+    engine = TurnEngine(tracker)
+    damage_taken = np.zeros(len(combatants), dtype=np.int64)
+
+    while len(alive) > 1:
+        character = engine.next_turn()
+        if engine.round > max_rounds:
+            return None, max_rounds, damage_taken
+
+        attacker = combatants[index[character]]
+        for _ in range(attacker.attacks):
+            enemies = [enemy for enemy in tracker.character_order()
+                       if combatants[index[enemy]].side != attacker.side]
+            if not enemies:
+                break
+
+            target = POLICIES[attacker.policy](enemies, rng)
+            damage = min(_attack(attacker, target, rng), target.health)
+            damage_taken[index[target]] += damage
+            tracker.apply_damage([target], damage)
+
+            if target.health <= 0:
+                tracker.remove_character(target)
+                side = combatants[index[target]].side
+                alive[side] -= 1
+                if not alive[side]:
+                    del alive[side]
+
+    winner = next(iter(alive), None)
+    return winner, engine.round, damage_taken
+
+
+def _run_shard(combatants, encounters, max_rounds, streams):
+    """Play out encounters, returns their wins, rounds histogram and damage taken."""
+    rng = streams.stream(ENCOUNTER_STREAM)
+    wins = {}
+    rounds_histogram = np.zeros(max_rounds + 1, dtype=np.int64)
+    damage_taken = np.zeros(len(combatants), dtype=np.int64)
+
+    for _ in range(encounters):
+        winner, rounds, damage = _run_encounter(combatants, max_rounds, rng)
+        wins[winner] = wins.get(winner, 0) + 1
+        rounds_histogram[rounds] += 1
+        damage_taken += damage
+
+    return wins, rounds_histogram, damage_taken
+
+
+def simulate_encounters(combatants, encounters=1000, *, max_rounds=50, workers=None, seed=None):
+    """
+    Play out many encounters between combatants and collect the results.
+
+    Encounters are split evenly between worker processes.
+
+    :param combatants: List of Combatant, at least two sides.
+    :param encounters: Number of encounters to play out.
+    :param max_rounds: Encounters still going after this many rounds are draws.
+    :param workers: Number of worker processes, 1 runs in this process and
+                    None uses one per CPU.
+    :param seed: Seed to make the simulation reproducible.
+    :returns: EncounterReport
+    """
+    # pylint: disable=too-many-locals
+    workers = workers if workers is not None else os.cpu_count() or 1
+    workers = max(min(workers, encounters), 1)
+    shards = [encounters // workers + (i < encounters % workers) for i in range(workers)]
+    args = ([combatants] * workers, shards, [max_rounds] * workers,
+            RandomStreams(seed).spawn(workers))
+
+    if workers > 1:
+        with ProcessPoolExecutor(workers) as executor:
+            results = list(executor.map(_run_shard, *args))
+    else:
+        results = list(map(_run_shard, *args))
+
+    wins = {}
+    rounds_histogram = np.zeros(max_rounds + 1, dtype=np.int64)
+    damage_taken = np.zeros(len(combatants), dtype=np.int64)
+    for shard_wins, shard_rounds, shard_damage in results:
+        for side, count in shard_wins.items():
+            wins[side] = wins.get(side, 0) + count
+        rounds_histogram += shard_rounds
+        damage_taken += shard_damage
+
+    return EncounterReport(combatants, wins, rounds_histogram, damage_taken)
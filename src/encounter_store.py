@@ -0,0 +1,156 @@
+"""All utilities and classes for storing the stats of many combatants."""
+import numpy as np
+
+# Bits of the flags column
+PLAYER = 1
+HIDDEN = 2
+CONCENTRATING = 4
+
+
+class EncounterStore:
+    """
+    Class to store combatant stats as columns of numpy arrays.
+
+    Each combatant is a row, rows of removed combatants are reused.
+    Bulk operations take arrays of rows and run vectorized.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    columns = ("initiative", "health", "max_health", "armor_class", "flags")
+
+    def __init__(self, capacity=16):
+        """
+        Create an instance of EncounterStore.
+
+        :param capacity: Number of rows to allocate up front.
+        """
+        capacity = max(capacity, 1)
+        self.names = [None] * capacity
+        self.initiative = np.zeros(capacity, dtype=np.int64)
+        self.health = np.zeros(capacity, dtype=np.int64)
+        self.max_health = np.zeros(capacity, dtype=np.int64)
+        self.armor_class = np.zeros(capacity, dtype=np.int64)
+        self.flags = np.zeros(capacity, dtype=np.uint32)
+        self.active = np.zeros(capacity, dtype=bool)
+        self._free = list(range(capacity - 1, -1, -1))
+
+    def __len__(self):
+        return len(self.names) - len(self._free)
+
+    def _grow(self):
+        capacity = len(self.names)
+        self.names.extend([None] * capacity)
+        for column in self.columns + ("active",):
+            old = getattr(self, column)
+            new = np.zeros(capacity * 2, dtype=old.dtype)
+            new[:capacity] = old
+            setattr(self, column, new)
+        self._free.extend(range(capacity * 2 - 1, capacity - 1, -1))
+
+    def _allocate(self, count):
+        """Take count free rows, growing as needed."""
+        while len(self._free) < count:
+            self._grow()
+        rows = self._free[len(self._free) - count:]
+        del self._free[len(self._free) - count:]
+        return np.array(rows[::-1], dtype=np.int64)
+
+    def add(self, name, initiative, health, *, max_health=None, armor_class=10, flags=0):
+        """
+        Add a combatant.
+
+        :param name: Name of the combatant.
+        :param initiative: Initiative score.
+        :param health: Current hit points.
+        :param max_health: Maximum hit points, defaults to health.
+        :param armor_class: Armor class.
+        :param flags: Bitwise or of PLAYER, HIDDEN, ...
+        :returns: Row of the new combatant.
+        """
+        # pylint: disable=too-many-arguments
+        if not self._free:
+            self._grow()
+
+        row = self._free.pop()
+        self.names[row] = name
+        self.initiative[row] = initiative
+        self.health[row] = health
+        self.max_health[row] = max_health if max_health is not None else health
+        self.armor_class[row] = armor_class
+        self.flags[row] = flags
+        self.active[row] = True
+        return row
+
+    def remove(self, row):
+        """Remove the combatant in row."""
+        self.names[row] = None
+        self.active[row] = False
+        self._free.append(row)
+
+    def move(self, rows, store):
+        """
+        Move many combatants to another store, copying each column at once.
+
+        :param rows: Array of rows.
+        :param store: EncounterStore to move them to.
+        :returns: Array of their rows in store.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        new_rows = store._allocate(len(rows)) # pylint: disable=protected-access
+        for column in self.columns:
+            getattr(store, column)[new_rows] = getattr(self, column)[rows]
+        store.active[new_rows] = True
+
+        for row, new_row in zip(rows.tolist(), new_rows.tolist()):
+            store.names[new_row] = self.names[row]
+            self.names[row] = None
+        self.active[rows] = False
+        self._free.extend(rows.tolist())
+        return new_rows
+
+    def get(self, row):
+        """Get dictionary of name and all columns of a row."""
+        stats = {column: getattr(self, column)[row].item() for column in self.columns}
+        stats["name"] = self.names[row]
+        return stats
+
+    def set(self, row, column, value):
+        """
+        Set the name or a column of a row.
+
+        :param row: Row to change.
+        :param column: "name" or one of columns.
+        :param value: New value.
+        """
+        if column == "name":
+            self.names[row] = value
+        else:
+            getattr(self, column)[row] = value
+
+    def rows(self):
+        """Get array of every row in use."""
+        return np.flatnonzero(self.active)
+
+    def damage(self, rows, amounts):
+        """
+        Subtract damage from the health of many combatants, stopping at 0.
+
+        :param rows: Array of rows.
+        :param amounts: Damage for each row, or one amount for all of them.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        self.health[rows] = np.maximum(self.health[rows] - amounts, 0)
+
+    def heal(self, rows, amounts):
+        """
+        Add to the health of many combatants, stopping at their max health.
+
+        :param rows: Array of rows.
+        :param amounts: Healing for each row, or one amount for all of them.
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        self.health[rows] = np.minimum(self.health[rows] + amounts, self.max_health[rows])
+
+    def defeated(self):
+        """Get array of rows in use with 0 or less health."""
+        return np.flatnonzero(self.active & (self.health <= 0))
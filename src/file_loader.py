@@ -1,6 +1,5 @@
 """ All utilities and class for map preloading into a list """
 import os
-from tkinter import Tk, filedialog
 
 
 class FileLoader:
@@ -19,6 +18,10 @@ class FileLoader:
 
     def file_dialog(self):
         """Open a file dialog to select file."""
+        # imported here, tkinter takes a while to import and is only needed once a dialog opens
+        # pylint: disable=import-outside-toplevel
+        from tkinter import Tk, filedialog
+
         Tk().withdraw()
         filetypes = [("Files", [f"*{suffix}" for suffix in self.filetypes]), ("All Files", "*")]
         return filedialog.askopenfilename(initialdir=self.root, filetypes=filetypes)
@@ -0,0 +1,178 @@
+"""Classes for recording the events fed to screens and replaying them.
+
+A log starts with a header of the magic bytes, format version and the seed
+of the random streams. Then each frame with events is stored as
+
+    uint32 milliseconds since recording started, uint16 number of events
+
+followed by its events, each
+
+    uint32 event type, uint16 payload length, payload
+
+where the payload is the event's attributes as JSON.
+"""
+import json
+import struct
+import time
+
+import pygame
+
+MAGIC = b"WWEV"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sBB")
+_FRAME = struct.Struct("<IH")
+_EVENT = struct.Struct("<IH")
+
+
+def _encode(event):
+    payload = json.dumps(event.dict, separators=(",", ":"), default=lambda value: None)
+    return payload.encode("utf-8")
+
+
+def _decode(event_type, payload):
+    attributes = json.loads(payload.decode("utf-8"))
+    if not isinstance(attributes, dict):
+        raise ValueError(f"event attributes are not an object: {attributes!r}")
+    attributes = {key: tuple(value) if isinstance(value, list) else value
+                  for key, value in attributes.items()}
+    return pygame.event.Event(event_type, attributes)
+
+
+class EventRecorder:
+    """Class to write the events of each frame to a log file."""
+
+    def __init__(self, path, seed=None):
+        """
+        Create an instance of EventRecorder and start a new log.
+
+        :param path: File to write the log to.
+        :param seed: Integer seed of the random streams, to replay the same rolls.
+        """
+        self.path = path
+        self.seed = seed
+        self.frames = 0
+        self._start = time.perf_counter()
+
+        seed_bytes = b""
+        if seed is not None:
+            seed_bytes = seed.to_bytes(max((seed.bit_length() + 7) // 8, 1), "little")
+        # pylint: disable=consider-using-with
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, VERSION, len(seed_bytes)) + seed_bytes)
+
+    def record(self, events):
+        """Write the events of one frame, frames without events are skipped."""
+        if not events:
+            return
+
+        milliseconds = int((time.perf_counter() - self._start) * 1000)
+        chunks = [_FRAME.pack(milliseconds, len(events))]
+        for event in events:
+            payload = _encode(event)
+            chunks.append(_EVENT.pack(event.type, len(payload)))
+            chunks.append(payload)
+        self._file.write(b"".join(chunks))
+        self.frames += 1
+
+    def close(self):
+        """Finish the log."""
+        self._file.close()
+
+
+class EventPlayer:
+    """Class to read a log and hand out its frames of events in order."""
+
+    def __init__(self, path, realtime=False):
+        """
+        Create an instance of EventPlayer.
+
+        :param path: File to read the log from.
+        :param realtime: If True next_events() waits until each frame's time
+                         in the recording, otherwise frames follow each other
+                         at full speed.
+        :raises ValueError: If path is not an event log or it is truncated.
+        """
+        self.realtime = realtime
+        self.frames = []
+
+        with open(path, "rb") as log:
+            data = log.read()
+
+        if len(data) < _HEADER.size:
+            raise ValueError(f'"{path}" is not an event log')
+        magic, version, seed_length = _HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'"{path}" is not an event log')
+
+        offset = _HEADER.size
+        self.seed = int.from_bytes(data[offset:offset + seed_length], "little") \
+            if seed_length else None
+        offset += seed_length
+
+        def check(size):
+            if offset + size > len(data):
+                raise ValueError(f'"{path}" is truncated at byte {offset}')
+
+        check(0)
+        while offset < len(data):
+            check(_FRAME.size)
+            milliseconds, count = _FRAME.unpack_from(data, offset)
+            offset += _FRAME.size
+            events = []
+            for _ in range(count):
+                check(_EVENT.size)
+                event_type, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                check(length)
+                events.append(_decode(event_type, data[offset:offset + length]))
+                offset += length
+            self.frames.append((milliseconds / 1000, events))
+
+        self._next = 0
+        self._start = None
+
+    def __len__(self):
+        return len(self.frames)
+
+    @property
+    def done(self):
+        """True once every frame was handed out."""
+        return self._next >= len(self.frames)
+
+    def next_events(self):
+        """
+        Get the events of the next recorded frame.
+
+        :returns: List of events, None once every frame was handed out.
+        """
+        if self.done:
+            return None
+
+        seconds, events = self.frames[self._next]
+        if self.realtime:
+            if self._start is None:
+                self._start = time.perf_counter() - seconds
+            time.sleep(max(self._start + seconds - time.perf_counter(), 0))
+        self._next += 1
+        return events
+
+
+def replay(screen, player, display):
+    """
+    Feed every frame of a log to a screen, without opening it.
+
+    :param screen: Screen to replay the events on.
+    :param player: EventPlayer of the log.
+    :param display: Surface to draw to.
+    :returns: List of the time in seconds each frame took.
+    """
+    # pylint: disable=protected-access
+    frame_times = []
+    events = player.next_events()
+    while events is not None:
+        start = time.perf_counter()
+        screen._frame(display, events)
+        frame_times.append(time.perf_counter() - start)
+        events = player.next_events()
+    return frame_times
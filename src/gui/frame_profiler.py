@@ -0,0 +1,142 @@
+"""Class for timing the frames of screens."""
+import cProfile
+import time
+from collections import deque
+
+import pygame
+
+from .utils import IMAGE_CACHE, TEXT_CACHE
+
+PHASES = ("update", "events", "draw", "flip")
+
+
+class FrameProfiler:
+    """
+    Class to time each phase of the last frames and profile frames on request.
+
+    A frame is timed by calling begin_frame(), then mark() after each of
+    PHASES in order and end_frame().
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    GRAPH_HEIGHT = 50
+    # Pixels of graph per millisecond
+    GRAPH_SCALE = 2
+
+    def __init__(self, frames=120):
+        """
+        Create an instance of FrameProfiler.
+
+        :param frames: Number of frames to keep the timings of.
+        """
+        self.visible = False
+        self.timings = deque(maxlen=frames)
+        self.last_capture = None
+
+        self._marks = []
+        self._profile = None
+        self._capture_frames = 0
+        self._capture_path = None
+
+    @property
+    def capturing(self):
+        """True while frames are being profiled."""
+        return self._profile is not None
+
+    def begin_frame(self):
+        """Start timing a frame."""
+        self._marks = [time.perf_counter()]
+        if self._profile is not None:
+            self._profile.enable()
+
+    def mark(self):
+        """Mark the end of the next phase of the frame."""
+        self._marks.append(time.perf_counter())
+
+    def end_frame(self):
+        """Finish timing a frame, once enough frames are profiled the profile is saved."""
+        if self._profile is not None:
+            self._profile.disable()
+            self._capture_frames -= 1
+            if self._capture_frames <= 0:
+                self._profile.dump_stats(self._capture_path)
+                self.last_capture = self._capture_path
+                self._profile = None
+
+        if len(self._marks) == len(PHASES) + 1:
+            self.timings.append(tuple(end - start for start, end
+                                      in zip(self._marks, self._marks[1:])))
+
+    def capture(self, path, frames=300):
+        """
+        Profile the next frames with cProfile and save the stats, see pstats.
+
+        :param path: File to save the stats to.
+        :param frames: Number of frames to profile.
+        """
+        self._profile = cProfile.Profile()
+        self._capture_frames = frames
+        self._capture_path = path
+
+    def summary(self):
+        """
+        Get the timings of the kept frames.
+
+        :returns: Dictionary of phase, and "frame", to tuple (mean, max) in seconds.
+        """
+        if not self.timings:
+            return {}
+
+        columns = list(zip(*self.timings))
+        columns.append([sum(timing) for timing in self.timings])
+        return {name: (sum(column) / len(column), max(column))
+                for name, column in zip(PHASES + ("frame",), columns)}
+
+    def lines(self, screen):
+        """Get the lines of text shown in the overlay."""
+        lines = [f"{name:>6} {mean * 1000:6.2f} ms  max {peak * 1000:6.2f} ms"
+                 for name, (mean, peak) in self.summary().items()]
+
+        lookups = TEXT_CACHE.hits + TEXT_CACHE.misses
+        hit_rate = TEXT_CACHE.hits / lookups if lookups else 0
+        lines.append(f"text cache {hit_rate:.1%} hits, {len(TEXT_CACHE)} lines")
+
+        lookups = IMAGE_CACHE.hits + IMAGE_CACHE.misses
+        hit_rate = IMAGE_CACHE.hits / lookups if lookups else 0
+        lines.append(f"image cache {hit_rate:.1%} hits, {len(IMAGE_CACHE)} images")
+
+        surface_bytes = TEXT_CACHE.bytes + IMAGE_CACHE.bytes \
+            + screen.get_pitch() * screen.get_height()
+        lines.append(f"surfaces {surface_bytes / 1024:.0f} KB")
+
+        if self.capturing:
+            lines.append(f"profiling, {self._capture_frames} frames left")
+        elif self.last_capture:
+            lines.append(f"saved {self.last_capture}")
+        return lines
+
+    def draw(self, screen, font):
+        """Draw the overlay to the top right of screen."""
+        # rendered directly so the overlay does not fill the text cache
+        surfaces = [font.render(line, True, (255, 255, 255)) for line in self.lines(screen)]
+        width = max(max(surface.get_width() for surface in surfaces),
+                    self.timings.maxlen * 2) + 10
+        height = sum(surface.get_height() for surface in surfaces) + self.GRAPH_HEIGHT + 15
+
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 180))
+        y_pos = 5
+        for surface in surfaces:
+            panel.blit(surface, (5, y_pos))
+            y_pos += surface.get_height()
+
+        # one bar per frame, the line marks the time of a frame at 60 frames per second
+        bottom = height - 5
+        for i, timing in enumerate(self.timings):
+            bar_height = min(int(sum(timing) * 1000 * self.GRAPH_SCALE), self.GRAPH_HEIGHT)
+            color = (255, 80, 80) if sum(timing) > 1 / 60 else (80, 255, 80)
+            pygame.draw.line(panel, color, (5 + i * 2, bottom), (5 + i * 2, bottom - bar_height))
+        budget = bottom - int(1000 / 60 * self.GRAPH_SCALE)
+        pygame.draw.line(panel, (255, 255, 255), (5, budget), (width - 5, budget))
+
+        screen.blit(panel, (screen.get_width() - width, 0))
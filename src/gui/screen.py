@@ -2,9 +2,11 @@
 
 import sys
 import os
+import time
 from abc import ABC, abstractmethod
 
 import pygame
+from .frame_profiler import FrameProfiler
 from .utils import Button
 
 
@@ -16,9 +18,29 @@ class Screen(ABC):
     frames_per_second = 60
     background_color = (155, 155, 155)
 
+    # Frames to run at full frame rate after input, before waiting for events
+    busy_frames = 30
+    # Longest wait for an event when idle, in milliseconds
+    idle_timeout = 250
+
+    # event_log.EventRecorder every screen writes its events to
+    recorder = None
+    # event_log.EventPlayer every screen takes its events from instead of pygame
+    player = None
+
+    # Timings of every screen's frames, F3 shows them and F4 profiles the next frames
+    profiler = FrameProfiler()
+    profile_frames = 300
+
+    # In retained mode only regions marked dirty are drawn again each frame
+    retained_mode = False
+
     def __init__(self):
         self.running = False
         self._font = pygame.font.SysFont('comicsansms', 18)
+        self._dirty_rects = []
+        self._full_redraw = True
+        self._busy_frames = 0
 
     def open(self):
         """Open this screen."""
@@ -28,16 +50,120 @@ class Screen(ABC):
         game_icon = pygame.image.load(os.path.join(".", "assets", "wyvern_icon_red.png"))
         pygame.display.set_icon(game_icon)
         frame_clock = pygame.time.Clock()
+        self.mark_dirty()
+        self._busy_frames = self.busy_frames
 
         while self.running:
+            self._frame(screen, self._next_events(frame_clock))
+
+    def _next_events(self, frame_clock):
+        """
+        Get the events of the next frame.
+
+        Runs at full frame rate while busy, otherwise blocks until there is
+        an event or idle_timeout passed so an idle screen uses no CPU.
+        """
+        if Screen.player is not None:
+            pygame.event.pump()
+            events = Screen.player.next_events()
+            if events is not None:
+                frame_clock.tick()
+                return events
+            Screen.player = None
+
+        if self._busy_frames > 0 or self._needs_continuous_updates():
+            frame_clock.tick(self.frames_per_second)
+            events = pygame.event.get()
+        else:
+            event = pygame.event.wait(self.idle_timeout)
+            events = [event] + pygame.event.get() if event.type != pygame.NOEVENT else []
+            frame_clock.tick()
+
+        self._busy_frames = self.busy_frames if events else self._busy_frames - 1
+        return events
+
+    def _needs_continuous_updates(self):
+        """True while the screen animates or changes without input, eg. during a drag."""
+        # pylint: disable=no-self-use
+        return False
+
+    def _frame(self, screen, events):
+        """Update, handle events and draw one frame."""
+        if self.recorder is not None:
+            self.recorder.record(events)
+
+        profiler = self.profiler
+        profiler.begin_frame()
+        self._update()
+        profiler.mark()
+        self._handle_events(events)
+        profiler.mark()
+
+        rects = self._render(screen, events)
+        if profiler.visible:
+            profiler.draw(screen, self._font)
+        profiler.mark()
+
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+        profiler.mark()
+        profiler.end_frame()
+
+    def _render(self, screen, events):
+        """
+        Draw the parts of the screen that need it.
+
+        :returns: List of rects drawn, None if the whole screen was drawn.
+        """
+        if not self.retained_mode or self.profiler.visible:
             screen.fill(self.background_color)
+            self._draw(screen)
+            return None
 
-            self._update()
-            self._handle_events(pygame.event.get())
+        for event in events:
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.mark_dirty()
+        for component in self._dirty_components():
+            for rect in component.dirty_rects():
+                self.mark_dirty(rect)
+
+        rects = self._dirty_rects
+        if self._full_redraw:
+            screen.fill(self.background_color)
+            self._draw(screen)
+            rects = None
+        elif rects:
+            clip = rects[0].unionall(rects[1:])
+            screen.set_clip(clip)
+            screen.fill(self.background_color, clip)
             self._draw(screen)
+            screen.set_clip(None)
 
-            pygame.display.flip()
-            frame_clock.tick(self.frames_per_second)
+        self._full_redraw = False
+        self._dirty_rects = []
+        return rects
+
+    def mark_dirty(self, rect=None):
+        """
+        Mark a region to be drawn again next frame in retained mode.
+
+        :param rect: Rect of the region, None for the whole screen.
+        """
+        if rect is None:
+            self._full_redraw = True
+        else:
+            self._dirty_rects.append(pygame.Rect(rect))
+
+    def _dirty_components(self):
+        """
+        Get components whose dirty_rects() are drawn again in retained mode.
+
+        dirty_rects() returns a list of rects that changed since it was last drawn.
+        """
+        # pylint: disable=no-self-use
+        return []
 
     def close(self):
         """Close this screen."""
@@ -45,11 +171,17 @@ class Screen(ABC):
 
     def _handle_events(self, events):
         """Handles the event input of mouse or keyboard."""
-        # pylint: disable=no-self-use
         for event in events:
             if event.type == pygame.QUIT:
                 sys.exit()
 
+            if event.type == pygame.KEYUP and event.key == pygame.K_F3:
+                self.profiler.visible = not self.profiler.visible
+                self.mark_dirty()
+            elif event.type == pygame.KEYUP and event.key == pygame.K_F4:
+                name = f"{type(self).__name__}-{time.strftime('%Y%m%d-%H%M%S')}.prof"
+                self.profiler.capture(os.path.join(".", name), self.profile_frames)
+
     @abstractmethod
     def _draw(self, screen):
         """Draws this screen."""
@@ -83,6 +215,7 @@ class ComponentScreen(Screen):
         ALL components MUST implement:
         * draw(self, screen)
         * handle_events(self, events)
+        In retained mode components may implement dirty_rects(self), see Screen.
 
         Components will be drawn and handled in the
         same order they are added to the list.
@@ -96,6 +229,9 @@ class ComponentScreen(Screen):
         for obj in self.components:
             obj.draw(screen)
 
+    def _dirty_components(self):
+        return [obj for obj in self.components if hasattr(obj, "dirty_rects")]
+
     def _handle_events(self, events):
         super()._handle_events(events)
         for obj in self.components:
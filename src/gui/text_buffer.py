@@ -0,0 +1,137 @@
+"""Class for storing editable text."""
+
+
+class GapBuffer:
+    """
+    Class to store text that is edited at a cursor.
+
+    The characters are kept in a list with a gap of unused slots at the
+    cursor, so typing or deleting next to the cursor does not copy the text.
+    Moving the cursor moves the gap, which only copies the characters passed.
+
+    Every edit is passed to the listeners as (offset, removed, inserted), so
+    views of the text can update only the part that changed.
+    """
+
+    def __init__(self, text="", gap=64):
+        """
+        Create an instance of GapBuffer with the cursor at the end of text.
+
+        :param text: Initial text.
+        :param gap: Number of free slots to start with.
+        """
+        self._gap = gap
+        self._chars = list(text) + [""] * gap
+        self._gap_start = len(text)
+        self._gap_end = len(self._chars)
+        self._value = text
+        self.version = 0
+        self.listeners = []
+
+    def __len__(self):
+        return len(self._chars) - (self._gap_end - self._gap_start)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("GapBuffer index out of range")
+        if index >= self._gap_start:
+            index += self._gap_end - self._gap_start
+        return self._chars[index]
+
+    def __str__(self):
+        return self.value
+
+    @property
+    def value(self):
+        """Get the text as a string, it is only joined again after an edit."""
+        if self._value is None:
+            self._value = "".join(self._chars[:self._gap_start]) + \
+                          "".join(self._chars[self._gap_end:])
+        return self._value
+
+    @value.setter
+    def value(self, text):
+        """Replace the text and move the cursor to its end, nothing changes if it is the same."""
+        removed = self.value
+        if text == removed:
+            return
+        self._chars = list(text) + [""] * self._gap
+        self._gap_start = len(text)
+        self._gap_end = len(self._chars)
+        self._value = text
+        self.version += 1
+        self._notify(0, removed, text)
+
+    @property
+    def cursor(self):
+        """Get the index the cursor is at."""
+        return self._gap_start
+
+    @cursor.setter
+    def cursor(self, index):
+        """Move the cursor to index, clamped to the text."""
+        index = max(min(index, len(self)), 0)
+        if index < self._gap_start:
+            moved = self._gap_start - index
+            self._chars[self._gap_end - moved:self._gap_end] = self._chars[index:self._gap_start]
+            self._gap_start -= moved
+            self._gap_end -= moved
+        elif index > self._gap_start:
+            moved = index - self._gap_start
+            self._chars[self._gap_start:index] = self._chars[self._gap_end:self._gap_end + moved]
+            self._gap_start += moved
+            self._gap_end += moved
+
+    def _notify(self, offset, removed, inserted):
+        for listener in self.listeners:
+            listener(offset, removed, inserted)
+
+    def _changed(self, offset, removed, inserted):
+        self._value = None
+        self.version += 1
+        self._notify(offset, removed, inserted)
+
+    def insert(self, text):
+        """Insert text at the cursor and move the cursor after it."""
+        if len(text) > self._gap_end - self._gap_start:
+            grow = max(len(text), len(self._chars))
+            self._chars[self._gap_end:self._gap_end] = [""] * grow
+            self._gap_end += grow
+
+        offset = self._gap_start
+        self._chars[offset:offset + len(text)] = text
+        self._gap_start += len(text)
+        self._changed(offset, "", text)
+
+    def delete(self, count=1):
+        """Delete up to count characters before the cursor."""
+        count = min(count, self._gap_start)
+        if count:
+            self._gap_start -= count
+            # the deleted characters are still in the list, at the start of the gap
+            removed = "".join(self._chars[self._gap_start:self._gap_start + count])
+            self._changed(self._gap_start, removed, "")
+
+    def delete_forward(self, count=1):
+        """Delete up to count characters after the cursor."""
+        count = min(count, len(self._chars) - self._gap_end)
+        if count:
+            removed = "".join(self._chars[self._gap_end:self._gap_end + count])
+            self._gap_end += count
+            self._changed(self._gap_start, removed, "")
+
+    def line_start(self, index=None):
+        """Get the index of the start of the line index is on, the cursor's if None."""
+        index = self.cursor if index is None else index
+        while index > 0 and self[index - 1] != "\n":
+            index -= 1
+        return index
+
+    def line_end(self, index=None):
+        """Get the index of the end of the line index is on, the cursor's if None."""
+        index = self.cursor if index is None else index
+        while index < len(self) and self[index] != "\n":
+            index += 1
+        return index
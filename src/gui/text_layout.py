@@ -0,0 +1,154 @@
+"""Class for wrapping text into lines."""
+import re
+from bisect import bisect_right
+
+_WORDS = re.compile(r"\S*\s*")
+
+
+class TextLayout:
+    """
+    Class to word wrap text into the lines it is drawn as.
+
+    The text is split into paragraphs at newlines, an edit() only wraps the
+    paragraphs it touches again and shifts the starts of the lines after them.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, font, width):
+        """
+        Create an instance of TextLayout.
+
+        :param font: Font the text is drawn with.
+        :param width: Width in pixels to wrap the text at.
+        """
+        self.font = font
+        self.width = width
+        self.line_height = font.get_height()
+        self.lines = [""]
+        self.starts = [0]
+
+        self._paragraphs = [""]
+        self._first_lines = [0]
+
+    def _wrap(self, paragraph):
+        """Get list of the lines a paragraph wraps into."""
+        lines = []
+        line, line_width = "", 0
+
+        for word in _WORDS.findall(paragraph):
+            if not word:
+                continue
+            word_width, _ = self.font.size(word)
+
+            if line and line_width + word_width > self.width:
+                lines.append(line)
+                line, line_width = "", 0
+
+            if word_width > self.width:
+                # too long for a line by itself, break it between characters
+                for char in word:
+                    char_width, _ = self.font.size(char)
+                    if line and line_width + char_width > self.width:
+                        lines.append(line)
+                        line, line_width = "", 0
+                    line += char
+                    line_width += char_width
+            else:
+                line += word
+                line_width += word_width
+
+        lines.append(line)
+        return lines
+
+    def _layout(self, paragraphs, first_line, offset):
+        """
+        Wrap paragraphs into lines.
+
+        :param paragraphs: List of paragraphs to wrap.
+        :param first_line: Number of the line the first paragraph starts on.
+        :param offset: Index in the text of the first paragraph.
+        :returns: Tuple (lines, starts, first_lines) of the paragraphs.
+        """
+        lines, starts, first_lines = [], [], []
+        for paragraph in paragraphs:
+            first_lines.append(first_line + len(lines))
+            for line in self._wrap(paragraph):
+                lines.append(line)
+                starts.append(offset)
+                offset += len(line)
+            offset += 1
+        return lines, starts, first_lines
+
+    def update(self, text, width=None):
+        """
+        Wrap all of text, use edit() for changes to the text already laid out.
+
+        :param text: Text to lay out.
+        :param width: New width to wrap at, None to keep the current width.
+        """
+        if width is not None:
+            self.width = width
+        self._paragraphs = text.split("\n")
+        self.lines, self.starts, self._first_lines = self._layout(self._paragraphs, 0, 0)
+
+    def _paragraph_of(self, index):
+        return bisect_right(self._first_lines, self.line_of(index)) - 1
+
+    def _edited_paragraphs(self, offset, removed, inserted):
+        """
+        Apply an edit to the paragraphs it touches.
+
+        :returns: Tuple (first, last, paragraphs) of the index of the first and
+                  last paragraph edited and the paragraphs they become.
+        """
+        first = self._paragraph_of(offset)
+        last = self._paragraph_of(offset + len(removed))
+        first_start = self.starts[self._first_lines[first]]
+        last_start = self.starts[self._first_lines[last]]
+
+        text = self._paragraphs[first][:offset - first_start] + inserted + \
+            self._paragraphs[last][offset + len(removed) - last_start:]
+        return first, last, text.split("\n")
+
+    def _replace_paragraphs(self, first, last, paragraphs, shift):
+        """
+        Wrap paragraphs in place of paragraphs first to last and move the lines after them.
+
+        :param shift: Number of characters the text after them moved by.
+        """
+        first_line = self._first_lines[first]
+        end_line = self._first_lines[last + 1] if last + 1 < len(self._first_lines) \
+            else len(self.lines)
+        lines, starts, first_lines = self._layout(paragraphs, first_line, self.starts[first_line])
+        line_shift = len(lines) - (end_line - first_line)
+
+        self._paragraphs[first:last + 1] = paragraphs
+        self.lines[first_line:end_line] = lines
+        self.starts[first_line:] = starts + [start + shift for start in self.starts[end_line:]]
+        self._first_lines[first:] = first_lines + \
+            [line + line_shift for line in self._first_lines[last + 1:]]
+
+    def edit(self, offset, removed, inserted):
+        """
+        Update the layout after the text changed, only the paragraphs edited are wrapped again.
+
+        :param offset: Index in the text the edit starts at.
+        :param removed: Text that was removed at offset.
+        :param inserted: Text that was inserted at offset.
+        """
+        first, last, paragraphs = self._edited_paragraphs(offset, removed, inserted)
+        self._replace_paragraphs(first, last, paragraphs, len(inserted) - len(removed))
+
+    def line_of(self, index):
+        """Get the number of the line the character at index is on."""
+        return max(bisect_right(self.starts, index) - 1, 0)
+
+    def position(self, index):
+        """
+        Get the position of the character at index relative to the top left of the text.
+
+        :returns: Tuple (x, y)
+        """
+        line = self.line_of(index)
+        width, _ = self.font.size(self.lines[line][:index - self.starts[line]])
+        return width, line * self.line_height
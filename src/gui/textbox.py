@@ -3,7 +3,9 @@ import re
 
 import pygame
 
-from .utils import draw_text, load_font
+from .text_buffer import GapBuffer
+from .text_layout import TextLayout
+from .utils import draw_text, load_font, TEXT_CACHE
 
 ALPHA_KEYS = re.compile(r"[a-z]|[A-Z]")
 NUMERIC_KEYS = re.compile(r"[0-9]")
@@ -29,15 +31,26 @@ class TextBox:
         :param center: If True center text in textbox.
         """
         self.rect = pygame.Rect(pos, size)
-        self.value = initial_value if initial_value is not None else ""
+        self._buffer = GapBuffer(initial_value if initial_value is not None else "")
         self.font = font if font is not None else load_font()
         self.label = label
         self.allowed = allowed
         self.center = center
         self.selected = False
+        self._drawn = None
 
         self._unselect_keys = [pygame.K_RETURN, pygame.K_ESCAPE]
 
+    @property
+    def value(self):
+        """Get the text in this textbox."""
+        return self._buffer.value
+
+    @value.setter
+    def value(self, value):
+        """Set the text in this textbox, the cursor moves to its end."""
+        self._buffer.value = value
+
     def _box_rect(self):
         box_rect = self.rect
 
@@ -49,12 +62,24 @@ class TextBox:
 
         return box_rect
 
-    def _text_limit(self, text):
-        width, _ = self.font.size(text)
+    def _text_limit(self, character):
+        width, _ = self.font.size(self.value + character)
         return width > self.rect.width
 
+    def _state(self):
+        return self._buffer.version, self._buffer.cursor, self.selected, tuple(self.rect)
+
+    def dirty_rects(self):
+        """Get list of rects that changed since this element was last drawn."""
+        if self._state() == self._drawn:
+            return []
+        if self._drawn is not None and self._drawn[3] != tuple(self.rect):
+            return [pygame.Rect(self._drawn[3]), self.rect.copy()]
+        return [self.rect.copy()]
+
     def draw(self, screen): # pragma: no cover
         """Draw this element to screen."""
+        self._drawn = self._state()
         box_rect = self._box_rect()
 
         if self.label:
@@ -65,23 +90,23 @@ class TextBox:
         pygame.draw.rect(screen, border_color, box_rect, 1)
 
         text_pos = box_rect.center if self.center else (box_rect.left + 1, box_rect.top)
-        self._draw_text(screen, self.value, text_pos)
+        self._draw_text(screen, text_pos)
 
-    def _draw_text(self, screen, text, text_pos):
-        draw_text(screen, self.font, text, text_pos, center=self.center)
+    def _draw_text(self, screen, text_pos):
+        draw_text(screen, self.font, self.value, text_pos, center=self.center)
 
     def _insert_character(self, character):
-        self.value += character
+        self._buffer.insert(character)
 
     def _delete_character(self):
-        self.value = self.value[:-1]
+        self._buffer.delete()
 
     def handle_events(self, events):
         """Handle events for this element."""
         for event in events:
 
             if event.type == pygame.MOUSEBUTTONUP:
-                self.selected = self._box_rect().collidepoint(pygame.mouse.get_pos())
+                self.selected = self._box_rect().collidepoint(event.pos)
 
             if not self.selected:
                 return
@@ -92,7 +117,7 @@ class TextBox:
                 elif event.key == pygame.K_BACKSPACE:
                     self._delete_character()
                 elif self.allowed is None or self.allowed.match(event.unicode):
-                    if not self._text_limit(self.value + event.unicode):
+                    if not self._text_limit(event.unicode):
                         self._insert_character(event.unicode)
 
 
@@ -121,38 +146,46 @@ class TextArea(TextBox):
         self._always_selected = always_selected
         self.selected = always_selected
         self._unselect_keys = [pygame.K_ESCAPE]
-        self._cursor_pos = len(self.value)
+        self._layout = TextLayout(self.font, self.rect.width - 2)
+        self._layout.update(self._buffer.value)
+        self._buffer.listeners.append(self._layout.edit)
+        self._top_line = 0
 
-    def _text_limit(self, text):
+    def _text_limit(self, character):
         return False
 
-    def _draw_text(self, screen, text, text_pos):
-        char_x, char_y = text_pos
-        for i, char in enumerate(text):
-            char_width, char_height = self.font.size(char)
-
-            if char == "\n" or char_x + char_width > self.rect.width:
-                char_x = self.rect.left
-                char_y += char_height
-
-            if char != "\n":
-                draw_text(screen, self.font, char, (char_x, char_y))
-                char_x += char_width
-
-            if i == self._cursor_pos - 1 and self.selected:
-                pygame.draw.line(screen, (0, 0, 0),
-                                 (char_x + 1, char_y), (char_x + 1, char_y + char_height))
-
-    def _insert_character(self, character):
-        self.value = self.value[:self._cursor_pos] + character + self.value[self._cursor_pos:]
-        self._cursor_pos += 1
-
-    def _delete_character(self):
-        if self._cursor_pos > 0:
-            self.value = self.value[:self._cursor_pos - 1] + self.value[self._cursor_pos:]
-            self._cursor_pos -= 1
+    def _scroll_to_cursor(self):
+        """Scroll so the line of the cursor is visible."""
+        visible_lines = max(self.rect.height // self._layout.line_height, 1)
+        cursor_line = self._layout.line_of(self._buffer.cursor)
+        self._top_line = min(self._top_line, cursor_line)
+        self._top_line = max(self._top_line, cursor_line - visible_lines + 1)
+
+    def _draw_text(self, screen, text_pos):
+        # the layout follows the edits of the buffer, the text is only joined on resize
+        if self._layout.width != self.rect.width - 2:
+            self._layout.update(self.value, self.rect.width - 2)
+        self._scroll_to_cursor()
+
+        text_x, text_y = text_pos
+        line_height = self._layout.line_height
+        for line_y, line in enumerate(self._layout.lines[self._top_line:]):
+            line_y = text_y + line_y * line_height
+            if line_y >= self.rect.bottom:
+                break
+            if line:
+                surface, _ = TEXT_CACHE.render(self.font, line, (0, 0, 0))
+                screen.blit(surface, (text_x, line_y))
+
+        if self.selected:
+            cursor_x, cursor_y = self._layout.position(self._buffer.cursor)
+            cursor_x += text_x + 1
+            cursor_y += text_y - self._top_line * line_height
+            pygame.draw.line(screen, (0, 0, 0), (cursor_x, cursor_y),
+                             (cursor_x, cursor_y + line_height))
 
     def handle_events(self, events):
+        # pylint: disable=too-many-branches
         super().handle_events(events)
 
         if self._always_selected:
@@ -167,16 +200,19 @@ class TextArea(TextBox):
                     self._insert_character("\n")
 
                 if event.key == pygame.K_LEFT:
-                    self._cursor_pos -= 1
+                    self._buffer.cursor -= 1
                 elif event.key == pygame.K_RIGHT:
-                    self._cursor_pos += 1
+                    self._buffer.cursor += 1
                 elif event.key == pygame.K_UP:
-                    self._cursor_pos = 0
+                    self._buffer.cursor = 0
                 elif event.key == pygame.K_DOWN:
-                    self._cursor_pos = len(self.value)
+                    self._buffer.cursor = len(self._buffer)
+                elif event.key == pygame.K_HOME:
+                    self._buffer.cursor = self._buffer.line_start()
+                elif event.key == pygame.K_END:
+                    self._buffer.cursor = self._buffer.line_end()
+                elif event.key == pygame.K_DELETE:
+                    self._buffer.delete_forward()
 
         if self._always_selected:
             self.selected = True
-
-        self._cursor_pos = min(self._cursor_pos, len(self.value))
-        self._cursor_pos = max(self._cursor_pos, 0)
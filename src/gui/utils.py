@@ -3,11 +3,16 @@
 # pylint: disable=too-few-public-methods
 
 import math
+import os
+import weakref
+from collections import OrderedDict
+
 import pygame
 
 
 class Button:
     """Class to assist in creation of buttons."""
+    # pylint: disable=too-many-instance-attributes
 
     def __init__(self, text, pos, size, action, params=None, enabled=True):
         """
@@ -26,13 +31,30 @@ class Button:
         self.params = params if params is not None else []
         self.enabled = enabled
         self._font = pygame.font.SysFont('comicsansms', 18)
+        self._drawn = None
+        # taken from the events instead of pygame.mouse, so replayed logs hover the same
+        self._mouse_pos = None
+
+    def _state(self):
+        hovered = self.enabled and self._mouse_pos is not None \
+            and self.rect.collidepoint(self._mouse_pos)
+        return self.text, tuple(self.rect), self.enabled, hovered
+
+    def dirty_rects(self):
+        """Get list of rects that changed since this button was last drawn."""
+        if self._state() == self._drawn:
+            return []
+        if self._drawn is not None and self._drawn[1] != tuple(self.rect):
+            return [pygame.Rect(self._drawn[1]), self.rect.copy()]
+        return [self.rect.copy()]
 
     def draw(self, screen):
         """Draw this button to screen."""
+        self._drawn = self._state()
         color = (255, 255, 255)
         text_color = (0, 0, 0) if self.enabled else (200, 200, 200)
 
-        if self.rect.collidepoint(pygame.mouse.get_pos()) and self.enabled:
+        if self._drawn[3]:
             color = (220, 220, 220)
 
         pygame.draw.rect(screen, color, self.rect)
@@ -42,6 +64,8 @@ class Button:
     def handle_events(self, events):
         """Handle events for this button."""
         for event in events:
+            if event.type in (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP):
+                self._mouse_pos = event.pos
             if event.type == pygame.MOUSEBUTTONUP and self.rect.collidepoint(event.pos):
                 if self.enabled:
                     self.action(*self.params)
@@ -133,6 +157,68 @@ def load_font():
     return myfont
 
 
+class TextCache:
+    """
+    Class to keep rendered lines of text so they are not rendered every frame.
+
+    Surfaces are kept in least recently used order, the oldest are dropped
+    once they take more than max_bytes.
+    """
+
+    def __init__(self, max_bytes=8 * 1024 * 1024):
+        """
+        Create an instance of TextCache.
+
+        :param max_bytes: Number of bytes of surfaces to keep at most.
+        """
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def render(self, font, text, color, background=None, antialias=True):
+        """
+        Get a rendered line of text, rendering it only if it is not cached.
+
+        :param font: Font to use.
+        :param text: Line of text.
+        :param color: Color of the font.
+        :param background: Color of the background.
+        :param antialias: True if text should be antialiased.
+        :returns: Tuple (surface, (width, height)), do not modify the surface.
+        """
+        key = (font, text, tuple(color), tuple(background) if background is not None else None,
+               antialias)
+        entry = self._surfaces.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return entry[:2]
+
+        self.misses += 1
+        surface = font.render(text, antialias, color, background)
+        size = font.size(text)
+        nbytes = surface.get_pitch() * surface.get_height()
+        self._surfaces[key] = (surface, size, nbytes)
+        self.bytes += nbytes
+
+        while self.bytes > self.max_bytes and len(self._surfaces) > 1:
+            self.bytes -= self._surfaces.popitem(last=False)[1][2]
+        return surface, size
+
+    def clear(self):
+        """Drop every cached surface and reset the counters."""
+        self._surfaces.clear()
+        self.bytes = self.hits = self.misses = 0
+
+
+TEXT_CACHE = TextCache()
+
+
 def draw_text(screen, font, text, pos, color=(0, 0, 0), *,
               background=None, center=False, split_char='\n'):
     """
@@ -152,12 +238,10 @@ def draw_text(screen, font, text, pos, color=(0, 0, 0), *,
     max_width, total_height = (0, 0)
 
     for line in text.split(split_char):
-        width, height = font.size(line)
+        surface, (width, height) = TEXT_CACHE.render(font, line, color, background)
         max_width = max(max_width, width)
         total_height += height
 
-        surface = font.render(line, True, color, background)
-
         if center:
             screen.blit(surface, (x - int(width / 2), int(y - height / 2)))
         else:
@@ -168,6 +252,111 @@ def draw_text(screen, font, text, pos, color=(0, 0, 0), *,
     return max_width, total_height
 
 
+class ImageCache:
+    """
+    Class to share decoded images, and scaled versions of them, between their users.
+
+    Images are keyed by path and modification time, so a changed file is
+    loaded again. The key is looked up when an image is acquired and reused
+    for scaling it while it is acquired, so resizing does not touch the
+    file. A full resolution image is kept while an owner that
+    acquired it is alive; released images and scaled images are kept in
+    least recently used order and dropped once everything takes more than
+    max_bytes.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        """
+        Create an instance of ImageCache.
+
+        :param max_bytes: Number of bytes of surfaces to keep at most.
+        """
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._images = OrderedDict()
+        self._refs = {}
+        # file key of each acquired path
+        self._keys = {}
+
+    def __len__(self):
+        return len(self._images)
+
+    def _get(self, key, load):
+        entry = self._images.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._images.move_to_end(key)
+            return entry[0]
+
+        self.misses += 1
+        surface = load()
+        nbytes = surface.get_pitch() * surface.get_height()
+        self._images[key] = (surface, nbytes)
+        self.bytes += nbytes
+
+        for old_key in list(self._images):
+            if self.bytes <= self.max_bytes or old_key == key:
+                break
+            # images still acquired by an owner are kept
+            if old_key[2] is None and self._refs.get(old_key[:2]):
+                continue
+            self.bytes -= self._images.pop(old_key)[1]
+        return surface
+
+    @staticmethod
+    def _file_key(path):
+        return os.path.abspath(path), os.stat(path).st_mtime_ns
+
+    def _full(self, file_key):
+        return self._get(file_key + (None,), lambda: pygame.image.load(file_key[0]))
+
+    def acquire(self, path, owner):
+        """
+        Get the full resolution image of a file, kept cached while owner is alive.
+
+        :param path: Path of the image file.
+        :param owner: Object using the image, it is released once owner is garbage collected.
+        :returns: pygame.Surface shared with other owners, do not modify it.
+        """
+        file_key = self._file_key(path)
+        self._keys[path] = file_key
+        self._refs[file_key] = self._refs.get(file_key, 0) + 1
+        weakref.finalize(owner, self._release, path, file_key)
+        return self._full(file_key)
+
+    def _release(self, path, file_key):
+        # only counts down, the image is dropped when a later image needs the room
+        self._refs[file_key] -= 1
+        if not self._refs[file_key]:
+            del self._refs[file_key]
+            if self._keys.get(path) == file_key:
+                del self._keys[path]
+
+    def scaled(self, path, size):
+        """
+        Get the image of a file scaled to size.
+
+        :param path: Path of the image file.
+        :param size: Size (width, height) to scale image to.
+        :returns: pygame.Surface shared with other users, do not modify it.
+        """
+        file_key = self._keys.get(path)
+        if file_key is None:
+            file_key = self._file_key(path)
+        return self._get(file_key + (tuple(size),),
+                         lambda: pygame.transform.smoothscale(self._full(file_key), size))
+
+    def clear(self):
+        """Drop every cached surface and reset the counters, acquired images load again."""
+        self._images.clear()
+        self.bytes = self.hits = self.misses = 0
+
+
+IMAGE_CACHE = ImageCache()
+
+
 def load_image(path, scale=None):
     """
     Load an image from some path.
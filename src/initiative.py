@@ -1,29 +1,346 @@
 """All utilities and classes for initiative tracking."""
+import weakref
+from bisect import bisect_left, bisect_right
+
+from .encounter_store import EncounterStore
+
+# Stats of every character that is not in a tracker, shared so each is not a store of its own
+_DETACHED = EncounterStore()
+
+
+class _SortedOrder:
+    """
+    Class to keep characters sorted by key in blocks of at most 2 * LOAD.
+
+    Finding a key bisects the last key of each block and then one block,
+    inserting or deleting only shifts the rest of one block, so updates
+    take O(log n) comparisons plus moving at most 2 * LOAD items. Positions
+    are counted with a Fenwick tree of the block lengths.
+    """
+
+    LOAD = 256
+
+    def __init__(self):
+        self._keys = []
+        self._values = []
+        self._maxes = []
+        self._tree = []
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for block in self._values:
+            yield from block
+
+    def _rebuild_tree(self):
+        # Fenwick tree of block lengths, built in O(number of blocks)
+        self._tree = [len(block) for block in self._keys]
+        for i, length in enumerate(self._tree):
+            parent = i | (i + 1)
+            if parent < len(self._tree):
+                self._tree[parent] += length
+
+    def _update_tree(self, block, change):
+        while block < len(self._tree):
+            self._tree[block] += change
+            block |= block + 1
+
+    def _before(self, block):
+        """Get the number of items in the blocks before block."""
+        total = 0
+        while block > 0:
+            total += self._tree[block - 1]
+            block &= block - 1
+        return total
+
+    def insert(self, key, value):
+        """Insert value at the place of key, key must not be in the order already."""
+        if not self._keys:
+            self._keys.append([key])
+            self._values.append([value])
+            self._maxes.append(key)
+            self._rebuild_tree()
+            self._len = 1
+            return
+
+        block = min(bisect_left(self._maxes, key), len(self._maxes) - 1)
+        keys = self._keys[block]
+        index = bisect_left(keys, key)
+        keys.insert(index, key)
+        self._values[block].insert(index, value)
+        self._maxes[block] = keys[-1]
+        self._len += 1
+
+        if len(keys) > 2 * self.LOAD:
+            self._keys[block:block + 1] = [keys[:self.LOAD], keys[self.LOAD:]]
+            values = self._values[block]
+            self._values[block:block + 1] = [values[:self.LOAD], values[self.LOAD:]]
+            self._maxes[block:block + 1] = [keys[self.LOAD - 1], keys[-1]]
+            self._rebuild_tree()
+        else:
+            self._update_tree(block, 1)
+
+    def remove(self, key):
+        """Remove the value at key."""
+        block = bisect_left(self._maxes, key)
+        keys = self._keys[block]
+        index = bisect_left(keys, key)
+        del keys[index]
+        del self._values[block][index]
+        self._len -= 1
+
+        if keys:
+            self._maxes[block] = keys[-1]
+            self._update_tree(block, -1)
+        else:
+            del self._keys[block]
+            del self._values[block]
+            del self._maxes[block]
+            self._rebuild_tree()
+
+    def bisect_left(self, key):
+        """Get the position of the first item with a key not less than key."""
+        block = bisect_left(self._maxes, key)
+        if block == len(self._maxes):
+            return self._len
+        return self._before(block) + bisect_left(self._keys[block], key)
+
+    def bisect_right(self, key):
+        """Get the position of the first item with a key greater than key."""
+        block = bisect_right(self._maxes, key)
+        if block == len(self._maxes):
+            return self._len
+        return self._before(block) + bisect_right(self._keys[block], key)
+
+    def keep(self, predicate):
+        """Remove every value predicate is False for, in one pass."""
+        items = [(key, value) for keys, values in zip(self._keys, self._values)
+                 for key, value in zip(keys, values) if predicate(value)]
+        self._keys = [[key for key, _ in items[i:i + self.LOAD]]
+                      for i in range(0, len(items), self.LOAD)]
+        self._values = [[value for _, value in items[i:i + self.LOAD]]
+                        for i in range(0, len(items), self.LOAD)]
+        self._maxes = [keys[-1] for keys in self._keys]
+        self._len = len(items)
+        self._rebuild_tree()
+
 
 class CharacterInitiative:
-    """Class to represent a single character's initiative."""
+    """
+    Class to represent a single character's initiative.
 
-    def __init__(self, name, initiative, health):
-        self.name = name
-        self.initiative = initiative
-        self.health = health
+    The stats live in a row of an EncounterStore, this is a view of that row.
+    Characters outside a tracker share one store, their rows are freed when
+    they are garbage collected.
+    """
+    __slots__ = ("_store", "_row", "_tracker", "_release", "__weakref__")
+
+    def __init__(self, name, initiative, health, *, max_health=None, armor_class=10, flags=0,
+                 store=None):
+        """
+        Create an instance of CharacterInitiative.
+
+        :param name: Name of the character.
+        :param initiative: Initiative score.
+        :param health: Current hit points.
+        :param max_health: Maximum hit points, defaults to health.
+        :param armor_class: Armor class.
+        :param flags: Bitwise or of encounter_store flags.
+        :param store: EncounterStore to keep stats in, the one shared outside trackers if None.
+        """
+        # pylint: disable=too-many-arguments
+        self._tracker = None
+        self._release = None
+        store = store if store is not None else _DETACHED
+        self._set_row(store, store.add(name, initiative, health, max_health=max_health,
+                                       armor_class=armor_class, flags=flags))
+
+    def _set_row(self, store, row):
+        """Point this character at a row, which holds its stats already."""
+        if self._release is not None:
+            self._release.detach()
+            self._release = None
+        self._store = store
+        self._row = row
+        if store is _DETACHED:
+            self._release = weakref.finalize(self, _DETACHED.remove, row)
+
+    def _move_to(self, store):
+        """Move this character's stats to a row of another EncounterStore."""
+        self._set_row(store, int(self._store.move([self._row], store)[0]))
+
+    def _set(self, field, value):
+        if self._tracker is not None:
+            self._tracker.set_field(self, field, value)
+        else:
+            self._store.set(self._row, field, value)
+
+    def stats(self):
+        """Get dictionary of the name and every stat of this character."""
+        return self._store.get(self._row)
+
+    @property
+    def row(self):
+        """Row of this character in its EncounterStore."""
+        return self._row
+
+    @property
+    def name(self):
+        """Get the name."""
+        return self._store.names[self._row]
+
+    @name.setter
+    def name(self, name):
+        self._set("name", name)
+
+    @property
+    def initiative(self):
+        """Get the initiative score."""
+        return int(self._store.initiative[self._row])
+
+    @initiative.setter
+    def initiative(self, initiative):
+        """Set the initiative score, keeping its tracker in order."""
+        self._set("initiative", initiative)
+
+    @property
+    def health(self):
+        """Get the current hit points."""
+        return int(self._store.health[self._row])
+
+    @health.setter
+    def health(self, health):
+        self._set("health", health)
+
+    @property
+    def max_health(self):
+        """Get the maximum hit points."""
+        return int(self._store.max_health[self._row])
+
+    @max_health.setter
+    def max_health(self, max_health):
+        self._set("max_health", max_health)
+
+    @property
+    def armor_class(self):
+        """Get the armor class."""
+        return int(self._store.armor_class[self._row])
+
+    @armor_class.setter
+    def armor_class(self, armor_class):
+        self._set("armor_class", armor_class)
+
+    @property
+    def flags(self):
+        """Get the encounter_store flags."""
+        return int(self._store.flags[self._row])
+
+    @flags.setter
+    def flags(self, flags):
+        self._set("flags", flags)
 
     def __str__(self): # pragma: no cover
         return f"({self.initiative}) {self.name}: {self.health}"
 
 class InitiativeTracker:
-    """Class to track intitative of players and monsters."""
+    """
+    Class to track intitative of players and monsters.
+
+    Characters are kept sorted as they are added, removed or have their
+    initiative changed, so getting the order never sorts.
+    A character can only be tracked by one tracker at a time, while tracked
+    its stats are kept in the tracker's store.
+
+    Functions in listeners are called with (operation, character, field, old, new)
+    after every "add", "remove" or "set" of a character's field. For "add"
+    and "remove" field is "sequence" and new or old its add order.
+    """
+    # pylint: disable=too-many-instance-attributes
 
     def __init__(self):
-        self._characters = []
+        self.store = EncounterStore()
+        self._by_row = {}
+        self.listeners = []
+        # add order of each character, in add order
+        self._sequence = {}
+        self._next_sequence = 0
 
-    def add_character(self, character):
+        self._order = _SortedOrder()
+        self._order_view = None
+
+    def __len__(self):
+        return len(self._order)
+
+    def __contains__(self, character):
+        return character in self._sequence
+
+    @property
+    def _characters(self):
+        """List of the characters in add order."""
+        return list(self._sequence)
+
+    def sequence(self, character):
+        """Get the add order of a character in this tracker, which breaks initiative ties."""
+        return self._sequence[character]
+
+    def key(self, character):
+        """
+        Get the sort key of a character in this tracker.
+
+        :param character: CharacterInitiative in this tracker.
+        :returns: Tuple (-initiative, add order)
+        """
+        return (-character.initiative, self._sequence[character])
+
+    def _insert(self, character):
+        self._order.insert(self.key(character), character)
+        self._order_view = None
+
+    def _remove(self, character):
+        self._order.remove(self.key(character))
+        self._order_view = None
+
+    def add_character(self, character, sequence=None):
         """
         Add a character to this initiative tracker.
 
         :param character: CharacterInitiative to add
+        :param sequence: Add order to break ties with, eg. the one it had before
+                         it was removed, None to add it last.
+        :raises ValueError: If the character is already in this tracker.
         """
-        self._characters.append(character)
+        # pylint: disable=protected-access
+        if character._tracker is self:
+            raise ValueError(f"{character.name} is already in this initiative tracker")
+        if character._tracker is not None:
+            # a character is in one tracker at a time, it moves to this one
+            character._tracker.remove_character(character)
+        if character._store is not self.store:
+            character._move_to(self.store)
+        if sequence is None:
+            sequence = self._next_sequence
+        self._next_sequence = max(self._next_sequence, sequence + 1)
+        self._by_row[character.row] = character
+        self._sequence[character] = sequence
+        self._insert(character)
+        character._tracker = self
+        self._notify("add", character, "sequence", None, sequence)
+
+    def create_character(self, name, initiative, health, **stats):
+        """
+        Create a character directly in this tracker's store and add it.
+
+        :param name: Name of the character.
+        :param initiative: Initiative score.
+        :param health: Current hit points.
+        :param stats: max_health, armor_class or flags of the character.
+        :returns: The new CharacterInitiative
+        """
+        character = CharacterInitiative(name, initiative, health, store=self.store, **stats)
+        self.add_character(character)
+        return character
 
     def remove_character(self, character):
         """
@@ -31,17 +348,115 @@ class InitiativeTracker:
 
         :param character: CharacterInitiative to remove
         """
-        self._characters.remove(character)
+        # pylint: disable=protected-access
+        self._remove(character)
+        sequence = self._sequence.pop(character)
+        del self._by_row[character.row]
+        character._tracker = None
+        character._move_to(_DETACHED)
+        self._notify("remove", character, "sequence", sequence)
+
+    def set_initiative(self, character, initiative):
+        """
+        Change the initiative of a character and move it to its new place.
+
+        :param character: CharacterInitiative in this tracker.
+        :param initiative: New initiative score.
+        """
+        self.set_field(character, "initiative", initiative)
+
+    def set_field(self, character, field, value):
+        """
+        Change the name or a stat of a character.
+
+        :param character: CharacterInitiative in this tracker.
+        :param field: "name" or one of EncounterStore.columns.
+        :param value: New value.
+        """
+        old = getattr(character, field)
+        if value == old:
+            return
+
+        if field == "initiative":
+            self._remove(character)
+            self.store.set(character.row, field, value)
+            self._insert(character)
+        else:
+            self.store.set(character.row, field, value)
+        self._notify("set", character, field, old, value)
+
+    def _notify(self, operation, character, field=None, old=None, new=None):
+        # pylint: disable=too-many-arguments
+        for listener in self.listeners:
+            listener(operation, character, field, old, new)
+
+    def apply_damage(self, characters, amounts):
+        """
+        Damage many characters at once, health stops at 0.
+
+        :param characters: List of CharacterInitiative in this tracker.
+        :param amounts: Damage for each character, or one amount for all of them.
+        """
+        rows = [character.row for character in characters]
+        old = self.store.health[rows]
+        self.store.damage(rows, amounts)
+
+        if self.listeners:
+            for character, old_health in zip(characters, old.tolist()):
+                if character.health != old_health:
+                    self._notify("set", character, "health", old_health, character.health)
+
+    def remove_defeated(self):
+        """
+        Remove every character with 0 or less health.
+
+        :returns: List of removed CharacterInitiative
+        """
+        # pylint: disable=protected-access
+        rows = self.store.defeated()
+        defeated = [self._by_row.pop(row) for row in rows.tolist()]
+        if not defeated:
+            return defeated
+
+        removed = set(defeated)
+        self._order.keep(lambda character: character not in removed)
+        self._order_view = None
+
+        for character, row in zip(defeated, self.store.move(rows, _DETACHED).tolist()):
+            sequence = self._sequence.pop(character)
+            character._tracker = None
+            character._set_row(_DETACHED, row)
+            self._notify("remove", character, "sequence", sequence)
+        return defeated
+
+    def index(self, character):
+        """
+        Get the position of a character in character_order().
+
+        :param character: CharacterInitiative in this tracker.
+        """
+        return self._order.bisect_left(self.key(character))
+
+    def index_after(self, key):
+        """
+        Get the position in character_order() of the first character after a sort key.
+
+        :param key: Sort key from key(), the character need not be tracked anymore.
+        """
+        return self._order.bisect_right(key)
 
     def character_order(self):
         """
         Get list of chacters ordered by initiative score.
 
         ties will be broken by add order.
+        The same list is returned until the order changes, do not modify it.
 
         :returns: List of CharacterInitiative
         """
-        return sorted(self._characters, key=lambda c: c.initiative, reverse=True)
+        if self._order_view is None:
+            self._order_view = list(self._order)
+        return self._order_view
 
     def __str__(self): # pragma: no cover
         return str([str(char) for char in self.character_order()])
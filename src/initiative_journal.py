@@ -0,0 +1,212 @@
+"""All utilities and classes for journaling changes to initiative trackers."""
+import json
+import os
+
+from .initiative import CharacterInitiative
+
+_SNAPSHOT_PREFIX = '{"op": "snapshot"'
+
+
+class InitiativeJournal:
+    """
+    Class to record every change to an InitiativeTracker for undo and redo.
+
+    Changes are appended to a file as JSON lines. Every snapshot_interval
+    changes, and on close, the file is replaced by a snapshot of the whole
+    tracker, so it stays small and loading only replays the changes after it.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, tracker, path=None, snapshot_interval=500):
+        """
+        Create an instance of InitiativeJournal and start recording tracker.
+
+        :param tracker: InitiativeTracker to record.
+        :param path: File to append the journal to, None to keep it in memory only.
+        :param snapshot_interval: Number of changes between snapshots.
+        """
+        self.tracker = tracker
+        self.path = path
+        self.snapshot_interval = snapshot_interval
+
+        self._operations = []
+        self._position = 0
+        self._since_snapshot = 0
+        self._ids = {}
+        self._characters = {}
+        self._next_id = 0
+        self._replaying = False
+        self._file = None
+
+        tracker.listeners.append(self._record)
+
+    def _id(self, character):
+        if character not in self._ids:
+            self._ids[character] = self._next_id
+            self._characters[self._next_id] = character
+            self._next_id += 1
+        return self._ids[character]
+
+    def _write(self, entry):
+        if self.path is None:
+            return
+        if self._file is None:
+            # pylint: disable=consider-using-with
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+
+    def _record(self, operation, character, field, old, new):
+        """Listener of the tracker, journals one change."""
+        # pylint: disable=too-many-arguments
+        if self._replaying:
+            return
+
+        entry = {"op": operation, "id": self._id(character)}
+        if operation == "set":
+            entry.update(field=field, old=old, new=new)
+        else:
+            entry["stats"] = character.stats()
+            entry["sequence"] = new if operation == "add" else old
+
+        del self._operations[self._position:]
+        self._operations.append(entry)
+        self._position += 1
+        self._write(entry)
+
+        self._since_snapshot += 1
+        if self._since_snapshot >= self.snapshot_interval:
+            self.snapshot()
+
+    def _apply(self, entry, undo=False):
+        """Apply an operation to the tracker, or its inverse if undo."""
+        operation = entry["op"]
+        if undo and operation != "set":
+            operation = "remove" if operation == "add" else "add"
+
+        character = self._characters.get(entry["id"])
+        self._replaying = True
+        try:
+            if operation == "add":
+                if character is None:
+                    stats = dict(entry["stats"])
+                    character = CharacterInitiative(stats.pop("name"), stats.pop("initiative"),
+                                                    stats.pop("health"), **stats)
+                    self._characters[entry["id"]] = character
+                    self._ids[character] = entry["id"]
+                self.tracker.add_character(character, entry.get("sequence"))
+            elif operation == "remove":
+                self.tracker.remove_character(character)
+            else:
+                self.tracker.set_field(character, entry["field"],
+                                       entry["old"] if undo else entry["new"])
+        finally:
+            self._replaying = False
+
+    @property
+    def can_undo(self):
+        """True if there is a change to undo."""
+        return self._position > 0
+
+    @property
+    def can_redo(self):
+        """True if there is an undone change to redo."""
+        return self._position < len(self._operations)
+
+    def undo(self):
+        """
+        Undo the last change.
+
+        :returns: True if a change was undone.
+        """
+        if not self.can_undo:
+            return False
+        self._position -= 1
+        self._apply(self._operations[self._position], undo=True)
+        self._write({"op": "undo", "entry": self._operations[self._position]})
+        return True
+
+    def redo(self):
+        """
+        Redo the last undone change.
+
+        :returns: True if a change was redone.
+        """
+        if not self.can_redo:
+            return False
+        self._apply(self._operations[self._position])
+        self._write({"op": "redo", "entry": self._operations[self._position]})
+        self._position += 1
+        return True
+
+    def snapshot(self):
+        """Replace the journal file with a snapshot of the tracker, undo history stays in memory."""
+        # pylint: disable=protected-access
+        self._since_snapshot = 0
+        if self.path is None:
+            return
+
+        characters = [dict(character.stats(), id=self._id(character),
+                           sequence=self.tracker.sequence(character))
+                      for character in self.tracker._characters]
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        # written to a new file first, so a crash leaves the old journal intact
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as snapshot_file:
+            snapshot_file.write(json.dumps({"op": "snapshot", "characters": characters}) + "\n")
+        os.replace(temporary_path, self.path)
+
+    def load(self):
+        """
+        Load the tracker from the journal file.
+
+        Starts from the last snapshot and replays the changes after it.
+        """
+        if self.path is None or not os.path.isfile(self.path):
+            return
+
+        entries = []
+        with open(self.path, "r", encoding="utf-8") as journal_file:
+            for line in journal_file:
+                if line.startswith(_SNAPSHOT_PREFIX):
+                    entries = []
+                entries.append(line)
+
+        self._since_snapshot = len(entries)
+        for line in entries:
+            entry = json.loads(line)
+            if entry["op"] == "snapshot":
+                for stats in entry["characters"]:
+                    self._apply({"op": "add", "id": stats.pop("id"),
+                                 "sequence": stats.pop("sequence", None), "stats": stats})
+                self._next_id = max(self._characters, default=-1) + 1
+            elif entry["op"] == "undo":
+                # The undone change may be from before the snapshot, so it is
+                # stored in the entry and put back into the history if missing
+                self._apply(entry["entry"], undo=True)
+                if self.can_undo and self._operations[self._position - 1] == entry["entry"]:
+                    self._position -= 1
+                else:
+                    self._operations.insert(self._position, entry["entry"])
+            elif entry["op"] == "redo":
+                self._apply(entry["entry"])
+                if not self.can_redo or self._operations[self._position] != entry["entry"]:
+                    self._operations.insert(self._position, entry["entry"])
+                self._position += 1
+            else:
+                self._apply(entry)
+                self._next_id = max(self._next_id, entry["id"] + 1)
+                del self._operations[self._position:]
+                self._operations.append(entry)
+                self._position += 1
+
+    def close(self):
+        """Write a snapshot and close the journal file."""
+        if self.path is not None:
+            self.snapshot()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
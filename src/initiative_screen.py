@@ -1,8 +1,10 @@
 """All utilities and classes for Initiative Tracking Graphical Display"""
+import os
 
 import pygame
 
 from .initiative import InitiativeTracker, CharacterInitiative
+from .initiative_journal import InitiativeJournal
 from .gui.screen import Screen
 from .gui.textbox import TextBox, NUMERIC_KEYS
 from .gui.utils import draw_text, Button
@@ -12,9 +14,14 @@ from .gui.utils import load_font
 class InitiativeTrackerScreen(Screen):
     """Class to Start Graphical Initiative Tracker"""
 
+    journal_path = os.path.join(".", "assets", "saves", "initiative.jsonl")
+
     def __init__(self, tracker=None):
         super().__init__()
         self.tracker = tracker if tracker is not None else InitiativeTracker()
+        self.journal = InitiativeJournal(self.tracker, self.journal_path)
+        if tracker is None:
+            self.journal.load()
 
         self._namebox = TextBox((0, 0), (200, 30), "Bilbo")
         self._initiativebox = TextBox((0, 0), (60, 30), "1", allowed=NUMERIC_KEYS, center=True)
@@ -27,8 +34,8 @@ class InitiativeTrackerScreen(Screen):
             if char not in self._entries:
                 self._entries[char] = _InitiativeEntry(self.tracker, char)
 
-        for char in self._entries:
-            if char not in self._entries:
+        for char in list(self._entries):
+            if char not in self.tracker:
                 del self._entries[char]
 
         self._add_button.enabled = self._valid_input()
@@ -38,6 +45,9 @@ class InitiativeTrackerScreen(Screen):
         self._draw_input(screen, (10, screen.get_height() - self._namebox.rect.height - 10))
 
     def _handle_events(self, events):
+        # the base class exits on QUIT, so the journal is closed first
+        if any(event.type == pygame.QUIT for event in events):
+            self.journal.close()
         super()._handle_events(events)
 
         for char in self.tracker.character_order():
@@ -49,10 +59,17 @@ class InitiativeTrackerScreen(Screen):
         self._add_button.handle_events(events)
 
         for event in events:
+            if event.type == pygame.KEYDOWN and event.mod & pygame.KMOD_CTRL:
+                if event.key == pygame.K_z:
+                    self.journal.undo()
+                if event.key == pygame.K_y:
+                    self.journal.redo()
+
             if event.type == pygame.KEYUP:
                 if event.key == pygame.K_RETURN:
                     self._add_character()
                 if event.key == pygame.K_ESCAPE:
+                    self.journal.close()
                     self.close()
 
     def _draw_input(self, screen, pos):
@@ -167,11 +184,18 @@ class _AttributeBox(TextBox):
         raise NotImplementedError
 
     def handle_events(self, events):
+        was_selected = self.selected
         super().handle_events(events)
 
-        if not self.selected:
+        if was_selected and not self.selected:
             self._set_attribute(self.value)
 
+        if not self.selected:
+            # show changes made elsewhere, eg. undo
+            value = str(self._get_attribute())
+            if value != self.value:
+                self.value = value
+
 
 class _HealthAttrBox(_AttributeBox):
 
@@ -1,4 +1,5 @@
 """ All utilities and classes for Map and Character Graphical Display """
+import math
 import pickle
 import os
 
@@ -6,7 +7,10 @@ import pygame
 
 from .file_loader import CharacterFileLoader, MapFileLoader
 from .gui.screen import Screen
-from .gui.utils import DraggableMixin, DragAndScaleMixin, load_image, draw_text
+from .gui.utils import DraggableMixin, DragAndScaleMixin, IMAGE_CACHE, draw_text
+from .map_view import MapView
+from .spatial_index import GridIndex
+from .tiled_map import load_map
 
 
 class MapAndCharacterScreen(Screen):
@@ -17,6 +21,7 @@ class MapAndCharacterScreen(Screen):
 
     map_loader = MapFileLoader()
     character_loader = CharacterFileLoader()
+    retained_mode = True
 
     def __init__(self):
         super().__init__()
@@ -25,9 +30,14 @@ class MapAndCharacterScreen(Screen):
 
         self._characters = pickle.load(open(self.path_save_char, "rb"))\
             if os.path.isfile(self.path_save_char) else []
-        self._map = load_image(pickle.load(open(self.path_save_maps, "rb")),
-                               scale=(self.screen_width, self.screen_height)) \
+        self._map = self._load_map_view(pickle.load(open(self.path_save_maps, "rb"))) \
             if os.path.isfile(self.path_save_maps) else None
+        # characters indexed by their rect on the unzoomed map, so panning and zooming keep it valid
+        self._index = GridIndex()
+        for character in self._characters:
+            self._index.insert(character, character.map_rect)
+        # characters being dragged or scaled, the only ones mouse motion is passed to
+        self._active = []
         self._remove_mode = False
         self.zoom = 1.0
         self._zoom_offset = (0, 0)
@@ -51,21 +61,69 @@ class MapAndCharacterScreen(Screen):
         path = self.map_loader.file_dialog()
         if path != "":
             pickle.dump(path, open(self.path_save_maps, "wb+"))
-            self._map = load_image(path, scale=(self.screen_width, self.screen_height))
+            if self._map:
+                self._map.close()
+            self._map = self._load_map_view(path)
+
+    def _load_map_view(self, path):
+        size = (self.screen_width, self.screen_height)
+        return MapView(load_map(path, size), size)
 
     def _load_character(self):
         path = self.character_loader.file_dialog()
         if path != "":
-            self._characters.append(_Character(path, zoom=self.zoom, zoom_offset=self.zoom_offset))
+            self._add_character(_Character(path, zoom=self.zoom, zoom_offset=self.zoom_offset))
+
+    def _add_character(self, character):
+        self._characters.append(character)
+        self._index.insert(character, character.map_rect)
+
+    def _map_pos(self, pos):
+        """Get the position on the unzoomed map of a position on screen."""
+        return ((pos[0] - self.zoom_offset[0]) / self.zoom,
+                (pos[1] - self.zoom_offset[1]) / self.zoom)
+
+    def _place(self, characters):
+        """
+        Put characters at the current zoom and offset of the map.
+
+        Only the characters that are drawn or under the mouse are placed, so
+        zooming and panning cost nothing for the rest of the map.
+        """
+        offset = self.zoom_offset
+        for character in characters:
+            character.zoom = self.zoom
+            character.zoom_offset = offset
+        return characters
+
+    def _characters_at(self, pos):
+        """Get the characters under a position on screen, bottom first."""
+        return [character for character in self._place(self._index.at(self._map_pos(pos)))
+                if character.rect.collidepoint(pos)]
+
+    def _visible_characters(self):
+        """Get the characters on screen, in the order they are drawn."""
+        left, top = self._map_pos((0, 0))
+        return self._place(self._index.in_rect(
+            pygame.Rect(int(left), int(top), int(self.screen_width / self.zoom) + 1,
+                        int(self.screen_height / self.zoom) + 1)))
+
+    def _remove_characters(self, pos):
+        removed = set(self._characters_at(pos))
+        if not removed:
+            return
+        for character in removed:
+            self._index.remove(character)
+        # one pass over the list, removing each character would be quadratic
+        self._characters = [character for character in self._characters
+                            if character not in removed]
 
     def _draw(self, screen):
         """ Draw function to draw all necessary maps and characters on the screen """
         if self._map:
-            img = pygame.transform.smoothscale(self._map, (int(screen.get_width() * self.zoom),
-                                                           int(screen.get_height() * self.zoom)))
-            screen.blit(img, self.zoom_offset)
+            self._map.draw(screen, self.zoom, self.zoom_offset)
 
-        for character in self._characters:
+        for character in self._visible_characters():
             character.draw(screen)
 
         for button in self._buttons:
@@ -85,33 +143,54 @@ class MapAndCharacterScreen(Screen):
         top = min(max(zoom_offset[1], self.screen_height * (1 - self.zoom)), 0)
 
         self._zoom_offset = (left / self.zoom, top / self.zoom)
-        self._update_zooms(self.zoom, self.zoom_offset)
-
-    def _update_zooms(self, zoom, offset):
-        for character in self._characters:
-            character.zoom = zoom
-            character.zoom_offset = offset
 
     def _zoom_in(self):
         self.zoom = min(self.zoom * 1.2, self.MAX_ZOOM)
         self.zoom_offset = self.zoom_offset
-        self._update_zooms(self.zoom, self.zoom_offset)
 
     def _zoom_out(self):
         self.zoom = max(self.zoom * 0.8, self.MIN_ZOOM)
         self.zoom_offset = self.zoom_offset
-        self._update_zooms(self.zoom, self.zoom_offset)
+
+    def _dirty_components(self):
+        return self._buttons
+
+    def _needs_continuous_updates(self):
+        # tiles of the map that are still loading show up as soon as they are loaded
+        if self._map and self._map.loading:
+            return True
+        return self.draggable_selected or any(character.draggable_selected
+                                              for character in self._active)
+
+    def _handle_character_events(self, events):
+        """Pass mouse events to the characters they concern, returns True if one is selected."""
+        for event in events:
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button in (1, 3):
+                targets = self._active + [character for character in self._characters_at(event.pos)
+                                          if character not in self._active]
+            elif event.type in (pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION):
+                targets = self._active
+            else:
+                continue
+
+            for character in self._place(targets):
+                character.handle_events([event])
+                self._index.move(character, character.map_rect)
+            self._active = [character for character in targets if character.selected]
+
+        return any(character.draggable_selected for character in self._active)
 
     def _handle_events(self, events):
         """ Handle events in maps """
+        # pylint: disable=too-many-branches
         super()._handle_events(events)
 
-        char_selected = False
-        for character in self._characters:
-            character.handle_events(events)
-            char_selected = char_selected or character.draggable_selected
+        # only moving the mouse without dragging leaves the map and characters as they are
+        if any(event.type != pygame.MOUSEMOTION or any(event.buttons) for event in events) \
+                or (self._map and self._map.loading):
+            self.mark_dirty()
 
-        if not char_selected:
+        if not self._handle_character_events(events):
             DraggableMixin.handle_events(self, events)
 
         for button in self._buttons:
@@ -119,9 +198,7 @@ class MapAndCharacterScreen(Screen):
 
         for event in events:
             if event.type == pygame.MOUSEBUTTONUP and self._remove_mode:
-                for character in self._characters:
-                    if character.rect.collidepoint(event.pos):
-                        self._characters.remove(character)
+                self._remove_characters(event.pos)
 
             if event.type == pygame.KEYUP:
                 if event.key == pygame.K_ESCAPE:
@@ -142,13 +219,13 @@ class _Character(DragAndScaleMixin):
 
     def __init__(self, img, pos=(0, 0), size=(100, 100), zoom=1.0, zoom_offset=(0, 0)):
         # pylint: disable=too-many-arguments
-        self.full_res_img = load_image(img)
+        self.full_res_img = IMAGE_CACHE.acquire(img, self)
         self._zoom = None
         self._pos = pos
 
         self._size = size
         self._img_path = img
-        self.img = load_image(img, size)
+        self.img = None
         self.zoom_offset = zoom_offset
         self.zoom = zoom
 
@@ -167,6 +244,17 @@ class _Character(DragAndScaleMixin):
         rect.topleft = self.pos
         return rect
 
+    @property
+    def map_rect(self):
+        """Rect of the character on the unzoomed map, rounded outwards."""
+        return pygame.Rect(math.floor(self._pos[0]), math.floor(self._pos[1]),
+                           math.ceil(self.size[0]) + 1, math.ceil(self.size[1]) + 1)
+
+    @property
+    def selected(self):
+        """True while the character is being dragged or scaled."""
+        return self.draggable_selected or self._scalable_selected
+
     def draw(self, screen):
         """Draw this element to screen."""
         screen.blit(self.img, self.pos)
@@ -179,8 +267,9 @@ class _Character(DragAndScaleMixin):
     @zoom.setter
     def zoom(self, zoom):
         """Set the percentage zoomed."""
-        self._zoom = zoom
-        self._resize_img()
+        if zoom != self._zoom:
+            self._zoom = zoom
+            self._resize_img()
 
     @property
     def size(self):
@@ -206,9 +295,11 @@ class _Character(DragAndScaleMixin):
                      (pos[1] - self.zoom_offset[1]) / self.zoom)
 
     def _resize_img(self):
-        self.img = pygame.transform.smoothscale(self.full_res_img,
-                                                (int(self.size[0] * self.zoom),
-                                                 int(self.size[1] * self.zoom)))
+        size = (int(self.size[0] * self.zoom), int(self.size[1] * self.zoom))
+        # panning the map sets the zoom of every character, only a new size needs scaling
+        if self.img is not None and self.img.get_size() == size:
+            return
+        self.img = IMAGE_CACHE.scaled(self._img_path, size)
 
     def __getstate__(self):
         """Export function for pickle."""
@@ -222,5 +313,5 @@ class _Character(DragAndScaleMixin):
     def __setstate__(self, newstate):
         """Import function for pickle."""
         self.__dict__.update(newstate)
-        self.full_res_img = load_image(self._img_path)
+        self.full_res_img = IMAGE_CACHE.acquire(self._img_path, self)
         self._resize_img()
@@ -0,0 +1,150 @@
+"""All utilities and classes for drawing zoomed maps."""
+import math
+
+import pygame
+
+
+def level_sizes(size, min_size):
+    """
+    Get the size of each level of a pyramid, each half the size of the one before.
+
+    :param size: Size (width, height) of the full resolution map.
+    :param min_size: Size (width, height) the smallest level is at least.
+    :returns: List of sizes, largest first.
+    """
+    sizes = [tuple(size)]
+    while sizes[-1][0] // 2 >= min_size[0] and sizes[-1][1] // 2 >= min_size[1]:
+        sizes.append((sizes[-1][0] // 2, sizes[-1][1] // 2))
+    return sizes
+
+
+class SurfacePyramid:
+    """
+    Class to keep a map in memory as levels, each half the size of the one before.
+
+    Levels are made down to the first one smaller than min_size.
+    """
+
+    def __init__(self, image, min_size):
+        """
+        Create an instance of SurfacePyramid.
+
+        :param image: Full resolution pygame.Surface of the map.
+        :param min_size: Size (width, height) the smallest level is at least.
+        """
+        self.levels = [image]
+        for size in level_sizes(image.get_size(), min_size)[1:]:
+            self.levels.append(pygame.transform.smoothscale(self.levels[-1], size))
+
+    @property
+    def sizes(self):
+        """List of the size of each level, largest first."""
+        return [level.get_size() for level in self.levels]
+
+    def read(self, index, rect):
+        """
+        Get part of a level.
+
+        :param index: Index of the level.
+        :param rect: pygame.Rect inside the level.
+        :returns: Tuple (surface, True if complete, always True here)
+        """
+        return self.levels[index].subsurface(rect), True
+
+    def close(self):
+        """Release the pyramid, nothing to do as it is all in memory."""
+
+
+class MapView:
+    """
+    Class to draw the visible part of a map at any zoom.
+
+    The map comes from a pyramid of levels, eg. SurfacePyramid, and each
+    frame only the visible part of the closest level is scaled. The scaled
+    part is cached with a margin around it, so panning only blits until the
+    view leaves the margin or the zoom changes.
+
+    A pyramid that loads parts in the background returns them incomplete,
+    until they are complete loading is True and they are scaled again each frame.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, pyramid, size, margin=0.5):
+        """
+        Create an instance of MapView.
+
+        :param pyramid: Pyramid of the map, or a pygame.Surface to make a SurfacePyramid of.
+        :param size: Size (width, height) of the map at zoom 1, the screen size.
+        :param margin: Part of size to scale beyond each edge of the view.
+        """
+        if isinstance(pyramid, pygame.Surface):
+            pyramid = SurfacePyramid(pyramid, size)
+        self.pyramid = pyramid
+        self.size = size
+        self.margin = margin
+        self.loading = False
+
+        self._zoomed_size = None
+        self._cache = None
+        self._cache_rect = None
+
+    def _level(self, zoomed_size):
+        """Get index of the smallest level with at least as many pixels as zoomed_size."""
+        sizes = self.pyramid.sizes
+        ratio = sizes[0][0] / zoomed_size[0]
+        index = int(math.log2(ratio)) if ratio >= 1 else 0
+        return min(index, len(sizes) - 1)
+
+    def _scale(self, region, zoomed_size):
+        """Scale the part of the map in region of the map zoomed to zoomed_size."""
+        index = self._level(zoomed_size)
+        width, height = self.pyramid.sizes[index]
+        scale_x = width / zoomed_size[0]
+        scale_y = height / zoomed_size[1]
+        source = pygame.Rect(int(region.x * scale_x), int(region.y * scale_y),
+                             math.ceil(region.width * scale_x), math.ceil(region.height * scale_y))
+        source = source.clip(pygame.Rect(0, 0, width, height))
+
+        surface, complete = self.pyramid.read(index, source)
+        self.loading = not complete
+        return pygame.transform.smoothscale(surface, region.size)
+
+    def visible_rect(self, zoom, offset):
+        """
+        Get the part of the zoomed map that is on screen.
+
+        :param zoom: Zoom of the map.
+        :param offset: Position (x, y) of the top left of the zoomed map on screen.
+        :returns: pygame.Rect in zoomed map pixels.
+        """
+        zoomed_rect = pygame.Rect(0, 0, round(self.size[0] * zoom), round(self.size[1] * zoom))
+        return pygame.Rect(-round(offset[0]), -round(offset[1]), *self.size).clip(zoomed_rect)
+
+    def draw(self, screen, zoom, offset):
+        """
+        Draw the map to screen.
+
+        :param screen: Screen to draw to.
+        :param zoom: Zoom of the map.
+        :param offset: Position (x, y) of the top left of the zoomed map on screen.
+        """
+        zoomed_size = (round(self.size[0] * zoom), round(self.size[1] * zoom))
+        visible = self.visible_rect(zoom, offset)
+        if not visible.width or not visible.height:
+            return
+
+        if self.loading or zoomed_size != self._zoomed_size \
+                or not self._cache_rect.contains(visible):
+            region = visible.inflate(int(self.size[0] * self.margin * 2),
+                                     int(self.size[1] * self.margin * 2))
+            region = region.clip(pygame.Rect((0, 0), zoomed_size))
+            self._cache = self._scale(region, zoomed_size)
+            self._cache_rect = region
+            self._zoomed_size = zoomed_size
+
+        screen.blit(self._cache, (visible.x + round(offset[0]), visible.y + round(offset[1])),
+                    visible.move(-self._cache_rect.x, -self._cache_rect.y))
+
+    def close(self):
+        """Release the pyramid of the map, eg. the threads loading its tiles."""
+        self.pyramid.close()
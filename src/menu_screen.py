@@ -1,37 +1,135 @@
 """Main Menu Screen"""
+import importlib
+import threading
+from concurrent.futures import Future
 
 from .gui.screen import Screen
 from .gui.utils import Button
-from .initiative_screen import InitiativeTrackerScreen
-from .map_screen import MapAndCharacterScreen
-from .dice_roller_screen import DiceRollerScreen
-from .sound_screen import SoundPlayerScreen
-from .notes_screen import NotesScreen
-from .weather_time_screen import WeatherAndTimeScreen
-from .spell_list import SpellList
+from .startup import PROFILER
 
 
 class MainMenuScreen(Screen):
-    """Class to create a main menu screen."""
+    """
+    Class to create a main menu screen.
 
-    def __init__(self):
+    Screens, and the modules they are in, are loaded when first opened.
+    Once the menu is showing, a background thread imports the modules of
+    the expensive ones and the menu creates one of them per frame. Screens
+    are only created on the main thread, as they load images and sounds.
+    Screens are named "module.Class" relative to this package, pyinstaller
+    only bundles them with --collect-submodules src.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    preload_screens = ("map_screen.MapAndCharacterScreen", "sound_screen.SoundPlayerScreen",
+                       "spell_list.SpellList", "dice_roller_screen.DiceRollerScreen")
+
+    def __init__(self, preload=True):
+        """
+        Create an instance of MainMenuScreen.
+
+        :param preload: True to create preload_screens in the background.
+        """
         super().__init__()
+        self._screens = {}
+        self._classes = {}
+        self._classes_lock = threading.Lock()
+        self._preloader = None
+        self._preloading = []
+        self._preload = preload
+        self._drawn = False
 
         x_pos = self.screen_width / 2 - 200
         button_size = (400, 30)
 
-        self._buttons = [
-            Button("Maps", (x_pos, 10), button_size, MapAndCharacterScreen().open),
-            Button("Initiative", (x_pos, 50), button_size, InitiativeTrackerScreen().open),
-            Button("Dice Roller", (x_pos, 90), button_size, DiceRollerScreen().open),
-            Button("Sound Player", (x_pos, 130), button_size, SoundPlayerScreen().open),
-            Button("Notes", (x_pos, 170), button_size, NotesScreen().open),
-            Button("Weather and Time", (x_pos, 210), button_size, WeatherAndTimeScreen().open),
-            Button("Spells List", (x_pos, 250), button_size, SpellList().open)]
+        screens = [("Maps", "map_screen.MapAndCharacterScreen"),
+                   ("Initiative", "initiative_screen.InitiativeTrackerScreen"),
+                   ("Dice Roller", "dice_roller_screen.DiceRollerScreen"),
+                   ("Sound Player", "sound_screen.SoundPlayerScreen"),
+                   ("Notes", "notes_screen.NotesScreen"),
+                   ("Weather and Time", "weather_time_screen.WeatherAndTimeScreen"),
+                   ("Spells List", "spell_list.SpellList")]
+        self._buttons = [Button(text, (x_pos, 10 + i * 40), button_size,
+                                self._open_screen, [screen_class])
+                         for i, (text, screen_class) in enumerate(screens)]
+
+    def screen(self, screen_class):
+        """
+        Get the screen of a class, creating it the first time.
+
+        Only call this on the main thread.
+
+        :param screen_class: Class of the screen, or its "module.Class" name.
+        """
+        if screen_class not in self._screens:
+            name = screen_class if isinstance(screen_class, str) else screen_class.__name__
+            with PROFILER.section(name):
+                self._screens[screen_class] = self._load_class(screen_class)()
+        return self._screens[screen_class]
+
+    def _load_class(self, screen_class):
+        """
+        Get the class of a screen, importing its module the first time.
+
+        If another thread is importing it, this waits for that screen only.
+        """
+        if not isinstance(screen_class, str):
+            return screen_class
+
+        with self._classes_lock:
+            future = self._classes.get(screen_class)
+            importing = future is None
+            if importing:
+                future = self._classes[screen_class] = Future()
+
+        if importing:
+            try:
+                module, _, class_name = screen_class.rpartition(".")
+                module = importlib.import_module(f".{module}", __package__)
+                future.set_result(getattr(module, class_name))
+            except Exception as error: # pylint: disable=broad-except
+                future.set_exception(error)
+        return future.result()
+
+    def _open_screen(self, screen_class):
+        self.screen(screen_class).open()
+
+    def _preload_all(self):
+        for screen_class in self.preload_screens:
+            try:
+                self._load_class(screen_class)
+            except Exception: # pylint: disable=broad-except
+                # raised again when the screen is opened
+                pass
+
+    def _needs_continuous_updates(self):
+        return bool(self._preloading)
+
+    def _preload_next(self):
+        """Create the next preloaded screen, once its module is imported."""
+        screen_class = self._preloading[0]
+        future = self._classes.get(screen_class)
+        if isinstance(screen_class, str) and (future is None or not future.done()):
+            return
+        del self._preloading[0]
+        if future is None or future.exception() is None:
+            self.screen(screen_class)
+
+    def _update(self):
+        # started after the first frame so the menu shows without waiting
+        if self._preload and self._preloader is None and self._drawn:
+            self._preloading = list(self.preload_screens)
+            self._preloader = threading.Thread(target=self._preload_all, daemon=True)
+            self._preloader.start()
+        elif self._preloading:
+            self._preload_next()
 
     def _draw(self, screen):
         for button in self._buttons:
             button.draw(screen)
+        if not self._drawn:
+            PROFILER.mark("first menu frame drawn")
+            self._drawn = True
 
     def _handle_events(self, events):
         super()._handle_events(events)
@@ -0,0 +1,129 @@
+"""All utilities and classes for dice probability distributions."""
+from functools import lru_cache
+
+import numpy as np
+
+DIE_SIDES = (4, 6, 8, 10, 12, 20, 100)
+
+# Convolutions with more multiplications than this are done with an FFT
+FFT_THRESHOLD = 50000
+
+
+class Distribution:
+    """Class to represent the probability distribution of a dice roll."""
+
+    def __init__(self, pmf, minimum, mean, variance):
+        """
+        Create an instance of Distribution.
+
+        :param pmf: Array of probabilities of the values minimum, minimum + 1, ...
+        :param minimum: Smallest value that can be rolled.
+        :param mean: Expected value of the roll.
+        :param variance: Variance of the roll.
+        """
+        self.pmf = pmf
+        self.pmf.flags.writeable = False
+        self.minimum = minimum
+        self.maximum = minimum + len(pmf) - 1
+        self.mean = mean
+        self.variance = variance
+        self._cdf = None
+
+    @property
+    def values(self):
+        """Array of every value that can be rolled."""
+        return np.arange(self.minimum, self.maximum + 1)
+
+    @property
+    def std(self):
+        """Standard deviation of the roll."""
+        return self.variance ** 0.5
+
+    def cdf(self):
+        """Get array of probabilities of rolling at most each of values."""
+        if self._cdf is None:
+            self._cdf = np.minimum(np.cumsum(self.pmf), 1.0)
+            self._cdf.flags.writeable = False
+        return self._cdf
+
+    def probability(self, value):
+        """Get the probability of rolling exactly value."""
+        if not self.minimum <= value <= self.maximum:
+            return 0.0
+        return float(self.pmf[value - self.minimum])
+
+    def at_least(self, value):
+        """Get the probability of rolling value or higher."""
+        if value <= self.minimum:
+            return 1.0
+        if value > self.maximum:
+            return 0.0
+        return float(1.0 - self.cdf()[value - self.minimum - 1])
+
+    def percentile(self, percent):
+        """
+        Get the smallest value that is rolled at least percent % of the time or lower.
+
+        :param percent: Number between 0 and 100.
+        """
+        index = np.searchsorted(self.cdf(), percent / 100 - 1e-12)
+        return int(self.minimum + min(index, len(self.pmf) - 1))
+
+
+def _convolve(first, second):
+    """Convolve two probability arrays, using an FFT for large arrays."""
+    if len(first) * len(second) <= FFT_THRESHOLD:
+        return np.convolve(first, second)
+
+    size = len(first) + len(second) - 1
+    result = np.fft.irfft(np.fft.rfft(first, size) * np.fft.rfft(second, size), size)
+    # FFT round off leaves tiny negative values where the probability is ~0
+    np.maximum(result, 0.0, out=result)
+    return result / result.sum()
+
+
+@lru_cache(maxsize=256)
+def _dice_pmf(times, sides):
+    """Get probabilities of the totals times..times * sides of rolling times dice."""
+    if times == 0:
+        return np.ones(1)
+    if times == 1:
+        return np.full(sides, 1 / sides)
+
+    half = _dice_pmf(times // 2, sides)
+    pmf = _convolve(half, half)
+    if times % 2:
+        pmf = _convolve(pmf, _dice_pmf(1, sides))
+    return pmf
+
+
+@lru_cache(maxsize=1024)
+def _pool_distribution(dice_counts, modifier, die_sides):
+    pmf = np.ones(1)
+    minimum, mean, variance = modifier, modifier, 0.0
+
+    for times, sides in zip(dice_counts, die_sides):
+        if times:
+            pmf = _convolve(pmf, _dice_pmf(times, sides))
+            minimum += times
+            mean += times * (sides + 1) / 2
+            variance += times * (sides ** 2 - 1) / 12
+
+    return Distribution(pmf, minimum, mean, variance)
+
+
+def pool_distribution(dice_counts, modifier=0, die_sides=DIE_SIDES):
+    """
+    Get the exact distribution of rolling a pool of dice plus a modifier.
+
+    Results are cached so asking for the same pool again is free.
+
+    :param dice_counts: Number of dice to roll of each of die_sides.
+    :param modifier: Number added to the total.
+    :param die_sides: Sides of the dice counted by dice_counts.
+    :returns: Distribution
+    """
+    dice_counts = tuple(int(times) for times in dice_counts)
+    if any(times < 0 for times in dice_counts):
+        raise ValueError(f"can not roll a negative number of dice {dice_counts}")
+    return _pool_distribution(dice_counts, int(modifier), tuple(die_sides))
@@ -0,0 +1,119 @@
+"""All utilities and classes for seeded random number streams."""
+import zlib
+
+import numpy as np
+
+DICE_STREAM = "dice"
+WEATHER_STREAM = "weather"
+ENCOUNTER_STREAM = "encounters"
+
+# First element of the spawn key, keeps named streams and children apart
+_NAMED, _CHILD = 0, 1
+
+
+class RandomStreams:
+    """
+    Class to hand out independent, reproducible random number streams.
+
+    Every subsystem (dice, weather, encounters, ...) draws from its own
+    named stream, so seeding a RandomStreams replays all of them exactly
+    and one subsystem drawing more numbers never changes another's rolls.
+    """
+
+    def __init__(self, seed=None, spawn_key=()):
+        """
+        Create an instance of RandomStreams.
+
+        :param seed: Integer seed, if None a random seed is picked.
+        :param spawn_key: Key of this RandomStreams in its parent, see spawn.
+        """
+        self._seed_sequence = np.random.SeedSequence(seed, spawn_key=spawn_key)
+        self._streams = {}
+        self._children = 0
+
+    @property
+    def seed(self):
+        """Seed to pass to RandomStreams to replay these streams."""
+        return self._seed_sequence.entropy
+
+    @property
+    def spawn_key(self):
+        """Key of this RandomStreams in its parent, () if it has none."""
+        return self._seed_sequence.spawn_key
+
+    def reseed(self, seed=None):
+        """
+        Restart every stream from a new seed.
+
+        :param seed: Integer seed, if None a random seed is picked.
+        """
+        self._seed_sequence = np.random.SeedSequence(seed, spawn_key=self.spawn_key)
+        self._streams = {}
+        self._children = 0
+
+    def stream(self, name):
+        """
+        Get the numpy Generator of a named stream.
+
+        :param name: Name of the subsystem using the stream, eg. DICE_STREAM.
+        """
+        if name not in self._streams:
+            self._streams[name] = self._new_stream(name)
+        return self._streams[name]
+
+    def _new_stream(self, name):
+        key = self.spawn_key + (_NAMED, zlib.crc32(name.encode("utf-8")))
+        seed_sequence = np.random.SeedSequence(self.seed, spawn_key=key)
+        return np.random.Generator(np.random.PCG64(seed_sequence))
+
+    def spawn(self, count):
+        """
+        Split off independent child RandomStreams, eg. one per worker process.
+
+        Children are numbered, so the same seed always spawns the same children.
+
+        :param count: Number of children to create.
+        :returns: List of RandomStreams
+        """
+        children = [RandomStreams(self.seed, self.spawn_key + (_CHILD, self._children + i))
+                    for i in range(count)]
+        self._children += count
+        return children
+
+    def fast_forward(self, name, draws):
+        """
+        Restart a named stream at the state it has after some number of draws.
+
+        :param name: Name of the stream.
+        :param draws: Number of raw 64 bit outputs drawn from the stream.
+        :returns: The restarted numpy Generator.
+        """
+        self._streams[name] = self._new_stream(name)
+        self._streams[name].bit_generator.advance(draws)
+        return self._streams[name]
+
+    def state(self):
+        """Get the state of every stream started so far."""
+        return {name: stream.bit_generator.state for name, stream in self._streams.items()}
+
+    def set_state(self, state):
+        """
+        Restore streams to a state returned by state().
+
+        :param state: Dictionary of stream name to bit generator state.
+        """
+        for name, stream_state in state.items():
+            self.stream(name).bit_generator.state = stream_state
+
+
+_SESSION = RandomStreams()
+
+
+def session():
+    """Get the RandomStreams of this session."""
+    return _SESSION
+
+
+def get_stream(name):
+    """Get the numpy Generator of a named stream of this session."""
+    return _SESSION.stream(name)
@@ -22,6 +22,7 @@ class SoundPlayerScreen(Screen):
 
     music_loader = MusicFileLoader()
     sound_loader = SoundFileLoader()
+    retained_mode = True
 
     def __init__(self):
         super().__init__()
@@ -114,6 +115,7 @@ class SoundPlayerScreen(Screen):
         pickle.dump(self._sound_names, open(os.path.join(".", "assets", "saves", "sounds.pkl"),
                                             "wb"))
         self._sound_iterator += 1
+        self.mark_dirty()
 
     def _pickle_music(self, path):
         if pygame.mixer.music.get_busy():
@@ -122,6 +124,11 @@ class SoundPlayerScreen(Screen):
         self._music_name = os.path.basename(path)
         pickle.dump(self._music_name, open(os.path.join(".", "assets", "saves", "music.pkl"),
                                            "wb"))
+        self.mark_dirty()
+
+    def _dirty_components(self):
+        return (self._music_function_buttons + self._sound_play_buttons +
+                self._sound_pause_buttons + self._sound_stop_buttons + self._load_buttons)
 
     def _draw(self, screen):
         """ Draws to the screen """
@@ -0,0 +1,102 @@
+"""Class for finding the items at a point or in an area of a map."""
+from collections import defaultdict
+
+import pygame
+
+
+class GridIndex:
+    """
+    Class to index the rects of items in a uniform grid.
+
+    Each item is kept in every cell its rect touches, so finding the items
+    at a point only looks at one cell. Queries return items in the order
+    they were inserted, which is the order they are drawn in.
+    """
+
+    def __init__(self, cell_size=128):
+        """
+        Create an instance of GridIndex.
+
+        :param cell_size: Width and height of a cell, about the size of an item works best.
+        """
+        self.cell_size = cell_size
+        self._cells = defaultdict(set)
+        self._items = {}
+        self._order = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def _cell_keys(self, rect):
+        return [(column, row)
+                for row in range(rect.top // self.cell_size,
+                                 (rect.bottom - 1) // self.cell_size + 1)
+                for column in range(rect.left // self.cell_size,
+                                    (rect.right - 1) // self.cell_size + 1)]
+
+    def insert(self, item, rect):
+        """
+        Add an item, on top of the items already in the index.
+
+        :param item: Hashable item.
+        :param rect: pygame.Rect of the item.
+        """
+        self._order += 1
+        self._add(item, pygame.Rect(rect), self._order)
+
+    def _add(self, item, rect, order):
+        self._items[item] = (order, rect)
+        for key in self._cell_keys(rect):
+            self._cells[key].add(item)
+
+    def remove(self, item):
+        """Remove an item."""
+        _, rect = self._items.pop(item)
+        for key in self._cell_keys(rect):
+            cell = self._cells[key]
+            cell.discard(item)
+            if not cell:
+                del self._cells[key]
+
+    def move(self, item, rect):
+        """
+        Update the rect of an item after it moved or was resized, it keeps its place in the order.
+
+        :param item: Item in the index.
+        :param rect: New pygame.Rect of the item.
+        """
+        order, old_rect = self._items[item]
+        if old_rect == rect:
+            return
+        self.remove(item)
+        self._add(item, pygame.Rect(rect), order)
+
+    def _sorted(self, items):
+        return sorted(items, key=lambda item: self._items[item][0])
+
+    def at(self, pos):
+        """
+        Get the items whose rect contains a point.
+
+        :param pos: Position (x, y).
+        :returns: List of items, bottom first.
+        """
+        key = (int(pos[0] // self.cell_size), int(pos[1] // self.cell_size))
+        return self._sorted(item for item in self._cells.get(key, ())
+                            if self._items[item][1].collidepoint(pos))
+
+    def in_rect(self, rect):
+        """
+        Get the items whose rect overlaps an area.
+
+        :param rect: pygame.Rect of the area.
+        :returns: List of items, bottom first.
+        """
+        rect = pygame.Rect(rect)
+        items = set()
+        for key in self._cell_keys(rect):
+            items.update(self._cells.get(key, ()))
+        return self._sorted(item for item in items if self._items[item][1].colliderect(rect))
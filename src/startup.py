@@ -0,0 +1,89 @@
+"""All utilities and classes for measuring how long startup takes."""
+import builtins
+import importlib.util
+import sys
+import time
+from contextlib import contextmanager
+
+
+class StartupProfiler:
+    """
+    Class to time the imports and initialization steps of the app.
+
+    While started, every import of a module that is not loaded yet is timed,
+    including the modules it imports in turn.
+    """
+
+    def __init__(self):
+        self.imports = []
+        self.sections = []
+        self.marks = []
+
+        self._start = time.perf_counter()
+        self._depth = 0
+        self._original_import = None
+
+    def start(self):
+        """Start timing imports, times are relative to when start() was called."""
+        self._start = time.perf_counter()
+        if self._original_import is None:
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._import
+
+    def stop(self):
+        """Stop timing imports."""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # pylint: disable=redefined-builtin,too-many-arguments
+        module = name
+        if level:
+            package = (globals or {}).get("__package__") or ""
+            module = importlib.util.resolve_name("." * level + name, package)
+
+        if module in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        index = len(self.imports)
+        self.imports.append(None)
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            self._depth -= 1
+            self.imports[index] = (module, time.perf_counter() - start, self._depth)
+
+    @contextmanager
+    def section(self, name):
+        """Time the block of a with statement, eg. creating a screen."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.sections.append((name, time.perf_counter() - start))
+
+    def mark(self, name):
+        """Record the time since start(), eg. when the first frame is drawn."""
+        self.marks.append((name, time.perf_counter() - self._start))
+
+    def report(self):
+        """Get a text report of every import, section and mark in milliseconds."""
+        lines = ["imports (including the imports they make):"]
+        lines += [f"{seconds * 1000:9.2f} ms  {'  ' * depth}{module}"
+                  for module, seconds, depth in self.imports if module is not None]
+        lines.append("sections:")
+        lines += [f"{seconds * 1000:9.2f} ms  {name}" for name, seconds in self.sections]
+        lines.append("marks (since start):")
+        lines += [f"{seconds * 1000:9.2f} ms  {name}" for name, seconds in self.marks]
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Write report() to a file."""
+        with open(path, "w", encoding="utf-8") as report:
+            report.write(self.report())
+
+
+PROFILER = StartupProfiler()
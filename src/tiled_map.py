@@ -0,0 +1,460 @@
+"""All utilities and classes for loading large maps in tiles.
+
+A large map is decoded once and split into a pyramid of tiles on disk,
+
+    <directory>/meta.json
+    <directory>/<level>/<column>_<row>.<format>
+
+after that opening it only reads the tiles that are drawn.
+"""
+import hashlib
+import json
+import os
+import shutil
+import struct
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from .map_view import SurfacePyramid, level_sizes
+
+TILE_SIZE = 512
+TILE_ROOT = os.path.join(".", "assets", "saves", "tiles")
+
+# Maps with a side longer than this are tiled
+TILED_THRESHOLD = 4096
+
+# Seconds before a tile directory without meta.json counts as an interrupted build
+INTERRUPTED_AGE = 3600
+
+_JPEG_FRAME_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def tile_directory(path, root=TILE_ROOT):
+    """
+    Get the directory the tiles of a map file are kept in.
+
+    The directory changes when the file is modified, so stale tiles are never used.
+    """
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}"
+    return os.path.join(root, hashlib.sha1(key.encode("utf-8")).hexdigest()[:16])
+
+
+def _jpeg_size(image_file):
+    while True:
+        marker = image_file.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        if marker[1] in (0x01, 0xFF) or 0xD0 <= marker[1] <= 0xD8:
+            # no length, 0xFF is padding before the next marker
+            if marker[1] == 0xFF:
+                image_file.seek(-1, os.SEEK_CUR)
+            continue
+
+        length = image_file.read(2)
+        if len(length) < 2:
+            return None
+        if marker[1] in _JPEG_FRAME_MARKERS:
+            frame = image_file.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack(">HH", frame[1:])
+            return width, height
+        image_file.seek(struct.unpack(">H", length)[0] - 2, os.SEEK_CUR)
+
+
+def image_size(path):
+    """
+    Get the size of an image from its header, without decoding it.
+
+    :param path: Path of a PNG, JPEG, GIF or BMP file.
+    :returns: Size (width, height), None if the format is not one of those.
+    """
+    with open(path, "rb") as image_file:
+        header = image_file.read(26)
+        if header.startswith(b"\x89PNG\r\n\x1a\n") and header[12:16] == b"IHDR":
+            return struct.unpack(">II", header[16:24])
+        if header[:6] in (b"GIF87a", b"GIF89a"):
+            return struct.unpack("<HH", header[6:10])
+        if header.startswith(b"BM") and len(header) >= 26:
+            width, height = struct.unpack("<ii", header[18:26])
+            return width, abs(height)
+        if header.startswith(b"\xff\xd8"):
+            image_file.seek(2)
+            return _jpeg_size(image_file)
+    return None
+
+
+def _strips(image, tile_size):
+    """Split a level into strips one row of tiles high."""
+    width, height = image.get_size()
+    for top in range(0, height, tile_size):
+        yield image.subsurface(pygame.Rect(0, top, width, min(tile_size, height - top)))
+
+
+def _halve(pair, width, flags):
+    height = sum(strip.get_height() for strip in pair)
+    joined = pygame.Surface((pair[0].get_width(), height), flags, 32)
+    top = 0
+    for strip in pair:
+        # copies alpha as is, a plain blit would blend it with the empty surface
+        joined.blit(strip, (0, top), special_flags=pygame.BLEND_RGBA_MAX)
+        top += strip.get_height()
+    return pygame.transform.smoothscale(joined, (width, height // 2))
+
+
+def _halved_strips(strips, width, flags):
+    """Scale each pair of strips of a level to a strip of the next level, width wide."""
+    pair = []
+    for strip in strips:
+        pair.append(strip)
+        if len(pair) == 2:
+            yield _halve(pair, width, flags)
+            pair = []
+    if pair and pair[0].get_height() // 2:
+        yield _halve(pair, width, flags)
+
+
+def _write_tiles(strips, directory, tile_size, image_format, stop):
+    """Save the tiles of each strip of a level and pass the strip on."""
+    os.makedirs(directory, exist_ok=True)
+    for row, strip in enumerate(strips):
+        if stop is not None and stop.is_set():
+            return
+        for left in range(0, strip.get_width(), tile_size):
+            rect = pygame.Rect(left, 0, tile_size, tile_size).clip(strip.get_rect())
+            name = f"{left // tile_size}_{row}.{image_format}"
+            pygame.image.save(strip.subsurface(rect), os.path.join(directory, name))
+        yield strip
+
+
+def build_tiles(image, directory, min_size, tile_size=TILE_SIZE, *, source=None, stop=None):
+    """
+    Split a map into a pyramid of tiles on disk.
+
+    The levels are made a strip of tiles at a time, each strip is passed
+    down the levels as soon as it is saved, so next to the image only about
+    two strips per level are in memory.
+
+    :param image: Full resolution pygame.Surface of the map.
+    :param directory: Directory to write the tiles to.
+    :param min_size: Size (width, height) the smallest level is at least.
+    :param tile_size: Width and height of a tile.
+    :param source: Path of the map file, prune_tiles() removes the tiles once it changes.
+    :param stop: threading.Event to stop building, the directory is left without meta.json.
+    """
+    # pylint: disable=too-many-arguments
+    flags = image.get_flags() & pygame.SRCALPHA
+    image_format = "png" if flags else "jpg"
+    sizes = level_sizes(image.get_size(), min_size)
+
+    strips = _strips(image, tile_size)
+    for index, size in enumerate(sizes):
+        if index:
+            strips = _halved_strips(strips, size[0], flags)
+        strips = _write_tiles(strips, os.path.join(directory, str(index)), tile_size,
+                              image_format, stop)
+    for _ in strips:
+        pass
+
+    if stop is not None and stop.is_set():
+        return
+
+    # written last, a directory without it is an interrupted build
+    with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as meta:
+        json.dump({"sizes": sizes, "tile_size": tile_size, "format": image_format,
+                   "source": os.path.abspath(source) if source is not None else None}, meta)
+
+
+def _stale(directory, root):
+    meta_path = os.path.join(directory, "meta.json")
+    if not os.path.isfile(meta_path):
+        return time.time() - os.path.getmtime(directory) > INTERRUPTED_AGE
+
+    try:
+        with open(meta_path, "r", encoding="utf-8") as meta:
+            source = json.load(meta).get("source")
+    except ValueError:
+        return True
+    if source is None or not os.path.isfile(source):
+        return True
+    return os.path.basename(tile_directory(source, root)) != os.path.basename(directory)
+
+
+def prune_tiles(root=TILE_ROOT, keep=()):
+    """
+    Remove the tiles of maps that were modified or deleted, and of interrupted builds.
+
+    :param root: Directory tiles are kept in.
+    :param keep: Tile directories to keep, eg. the one being built.
+    :returns: List of the directories removed.
+    """
+    if not os.path.isdir(root):
+        return []
+
+    keep = {os.path.abspath(directory) for directory in keep}
+    removed = []
+    for name in os.listdir(root):
+        directory = os.path.join(root, name)
+        if os.path.isdir(directory) and os.path.abspath(directory) not in keep \
+                and _stale(directory, root):
+            shutil.rmtree(directory, ignore_errors=True)
+            removed.append(directory)
+    return removed
+
+
+class TiledPyramid:
+    """
+    Class to read a pyramid of tiles from disk as they are needed.
+
+    Tiles load in a thread pool and are kept in least recently used order
+    until they take more than memory_budget bytes. The smallest level is
+    always in memory and stands in for tiles that are still loading, or
+    that failed to load.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, directory, memory_budget=128 * 1024 * 1024, workers=4):
+        """
+        Create an instance of TiledPyramid.
+
+        :param directory: Directory written by build_tiles.
+        :param memory_budget: Number of bytes of tiles to keep in memory at most.
+        :param workers: Number of threads loading tiles.
+        """
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as meta:
+            meta = json.load(meta)
+
+        self.directory = directory
+        self.sizes = [tuple(size) for size in meta["sizes"]]
+        self.tile_size = meta["tile_size"]
+        self.memory_budget = memory_budget
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._format = meta["format"]
+        self._tiles = OrderedDict()
+        self._pending = {}
+        self._failed = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(workers)
+
+        top = len(self.sizes) - 1
+        self._preview = pygame.Surface(self.sizes[top])
+        for key in self._tile_keys(top, pygame.Rect((0, 0), self.sizes[top])):
+            self._preview.blit(pygame.image.load(self._tile_path(key)), self._tile_rect(key))
+
+    def _tile_path(self, key):
+        index, column, row = key
+        return os.path.join(self.directory, str(index), f"{column}_{row}.{self._format}")
+
+    def _tile_rect(self, key):
+        _, column, row = key
+        return pygame.Rect(column * self.tile_size, row * self.tile_size,
+                           self.tile_size, self.tile_size)
+
+    def _tile_keys(self, index, rect):
+        """Get keys (level, column, row) of the tiles of a level that rect touches."""
+        return [(index, column, row)
+                for row in range(rect.top // self.tile_size,
+                                 (rect.bottom - 1) // self.tile_size + 1)
+                for column in range(rect.left // self.tile_size,
+                                    (rect.right - 1) // self.tile_size + 1)]
+
+    def _load(self, key):
+        tile = None
+        try:
+            tile = pygame.image.load(self._tile_path(key))
+        except (pygame.error, OSError):
+            pass
+        finally:
+            with self._lock:
+                del self._pending[key]
+                if tile is None:
+                    # not loaded again, the preview stands in for it from now on
+                    self._failed.add(key)
+                else:
+                    nbytes = tile.get_pitch() * tile.get_height()
+                    self._tiles[key] = (tile, nbytes)
+                    self.bytes += nbytes
+                    while self.bytes > self.memory_budget and len(self._tiles) > 1:
+                        self.bytes -= self._tiles.popitem(last=False)[1][1]
+
+    def _tile(self, key):
+        """
+        Get a tile, None if it is not loaded yet, in which case it starts loading.
+
+        :returns: Tuple (tile or None, True if the tile failed to load)
+        """
+        with self._lock:
+            entry = self._tiles.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._tiles.move_to_end(key)
+                return entry[0], False
+
+            if key in self._failed:
+                return None, True
+            if key not in self._pending:
+                self.misses += 1
+                self._pending[key] = self._executor.submit(self._load, key)
+            return None, False
+
+    def read(self, index, rect):
+        """
+        Get part of a level, missing tiles are filled in from the smallest level.
+
+        Tiles that failed to load are filled in too, but do not make it incomplete.
+
+        :param index: Index of the level.
+        :param rect: pygame.Rect inside the level.
+        :returns: Tuple (surface, True if every tile was loaded)
+        """
+        surface = pygame.Surface(rect.size)
+        complete = True
+        scale_x = self.sizes[-1][0] / self.sizes[index][0]
+        scale_y = self.sizes[-1][1] / self.sizes[index][1]
+
+        for key in self._tile_keys(index, rect):
+            tile_rect = self._tile_rect(key)
+            tile, failed = self._tile(key)
+            area = tile_rect.clip(rect)
+            if tile is not None:
+                surface.blit(tile, area.move(-rect.x, -rect.y),
+                             area.move(-tile_rect.x, -tile_rect.y))
+                continue
+
+            if not failed:
+                complete = False
+            preview_area = pygame.Rect(int(area.x * scale_x), int(area.y * scale_y),
+                                       max(int(area.width * scale_x), 1),
+                                       max(int(area.height * scale_y), 1))
+            preview_area = preview_area.clip(self._preview.get_rect())
+            if preview_area.width and preview_area.height:
+                surface.blit(pygame.transform.scale(self._preview.subsurface(preview_area),
+                                                    area.size),
+                             area.move(-rect.x, -rect.y))
+
+        return surface, complete
+
+    def wait(self):
+        """Wait until every tile that started loading is loaded."""
+        with self._lock:
+            pending = list(self._pending.values())
+        for future in pending:
+            future.result()
+
+    def close(self):
+        """Stop the loading threads, tiles that did not start loading are dropped."""
+        with self._lock:
+            for future in self._pending.values():
+                future.cancel()
+        self._executor.shutdown(wait=False)
+
+
+class BuildingPyramid:
+    """
+    Class for a large map whose tiles are built in a background thread.
+
+    Its sizes come from the header of the map file, so it can be drawn at
+    once. Until the tiles are built it reads blank and incomplete, after
+    that it reads from the TiledPyramid of the tiles.
+    """
+
+    def __init__(self, path, directory, sizes, min_size, image=None):
+        """
+        Create an instance of BuildingPyramid and start building the tiles.
+
+        :param path: Path of the map file.
+        :param directory: Directory to write the tiles to.
+        :param sizes: Size (width, height) of each level, largest first.
+        :param min_size: Size (width, height) the smallest level is at least.
+        :param image: The map file decoded already, None to decode it in the thread.
+        """
+        # pylint: disable=too-many-arguments
+        self.directory = directory
+        self.sizes = sizes
+        self.pyramid = None
+        self.error = None
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._build, args=(path, min_size, image),
+                                        daemon=True)
+        self._thread.start()
+
+    def _build(self, path, min_size, image):
+        try:
+            prune_tiles(os.path.dirname(self.directory), keep=[self.directory])
+            if image is None:
+                image = pygame.image.load(path)
+            build_tiles(image, self.directory, min_size, source=path, stop=self._stop)
+            del image
+            if not self._stop.is_set():
+                self.pyramid = TiledPyramid(self.directory)
+                if self._stop.is_set():
+                    self.pyramid.close()
+        except Exception as error: # pylint: disable=broad-except
+            self.error = error
+
+    def read(self, index, rect):
+        """
+        Get part of a level, blank until the tiles are built.
+
+        :param index: Index of the level.
+        :param rect: pygame.Rect inside the level.
+        :returns: Tuple (surface, True if complete)
+        :raises Exception: The error building the tiles failed with.
+        """
+        if self.error is not None:
+            raise self.error
+        if self.pyramid is None:
+            return pygame.Surface(rect.size), False
+        return self.pyramid.read(index, rect)
+
+    def wait(self):
+        """Wait until the tiles are built and every tile that started loading is loaded."""
+        self._thread.join()
+        if self.pyramid is not None:
+            self.pyramid.wait()
+
+    def close(self):
+        """Stop building the tiles, or the threads loading them."""
+        self._stop.set()
+        if self.pyramid is not None:
+            self.pyramid.close()
+
+
+def load_map(path, size, root=TILE_ROOT, threshold=TILED_THRESHOLD):
+    """
+    Load a map file as a pyramid, large maps are tiled.
+
+    The size of a map is read from the header of its file. The first time
+    a large map is loaded it is split into tiles in a background thread,
+    after that only its tiles are read. Maps in formats without a header
+    image_size() reads are decoded here to find their size.
+
+    :param path: Path of the map file.
+    :param size: Size (width, height) of the screen the map is drawn on.
+    :param root: Directory to keep tiles in.
+    :param threshold: Maps with a side longer than this many pixels are tiled.
+    :returns: SurfacePyramid, TiledPyramid or BuildingPyramid
+    """
+    directory = tile_directory(path, root)
+    if os.path.isfile(os.path.join(directory, "meta.json")):
+        return TiledPyramid(directory)
+
+    image = None
+    map_size = image_size(path)
+    if map_size is None:
+        image = pygame.image.load(path)
+        map_size = image.get_size()
+
+    if max(map_size) <= threshold:
+        return SurfacePyramid(image if image is not None else pygame.image.load(path), size)
+
+    return BuildingPyramid(path, directory, level_sizes(map_size, size), size, image)
@@ -0,0 +1,251 @@
+"""All utilities and classes for running turns and rounds of an encounter."""
+import heapq
+import itertools
+
+START_OF_TURN = 0
+END_OF_TURN = 1
+
+
+class Effect:
+    """Class to represent a timed condition, eg. stunned."""
+
+    def __init__(self, name, character, expires):
+        """
+        Create an instance of Effect.
+
+        :param name: Name of the effect.
+        :param character: CharacterInitiative whose turns time the effect, None
+                          if it is timed by rounds.
+        :param expires: Turn of character, or round, the effect expires in.
+        """
+        self.name = name
+        self.character = character
+        self.expires = expires
+
+    def __str__(self): # pragma: no cover
+        return self.name
+
+
+class TurnEngine:
+    """
+    Class to step through the turns of an InitiativeTracker.
+
+    Effects are kept in heaps ordered by when they expire, one heap per
+    character plus one for effects that last a number of rounds, so ending
+    a turn only looks at the effects that are actually expiring. Everything
+    kept for a character is dropped when it is removed from the tracker.
+    """
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(self, tracker):
+        """
+        Create an instance of TurnEngine.
+
+        :param tracker: InitiativeTracker to take turns in.
+        """
+        self.tracker = tracker
+        self.round = 0
+        self.current = None
+        self.readied = {}
+        self.delayed = set()
+        self.expired = []
+
+        self._current_key = None
+        self._resume_key = None
+        self._order = None
+        self._index = -1
+        self._turns = {}
+        self._acted = {}
+        self._effects = {}
+        self._round_effects = []
+        self._sequence = itertools.count()
+        tracker.listeners.append(self._tracker_changed)
+
+    def _tracker_changed(self, operation, character, *_):
+        if operation == "remove":
+            self._turns.pop(character, None)
+            self._acted.pop(character, None)
+            self._effects.pop(character, None)
+            self.readied.pop(character, None)
+            self.delayed.discard(character)
+
+    def close(self):
+        """Stop following the tracker, so a discarded engine is no longer kept alive by it."""
+        if self._tracker_changed in self.tracker.listeners:
+            self.tracker.listeners.remove(self._tracker_changed)
+
+    def turns_taken(self, character):
+        """Get the number of turns character has started."""
+        return self._turns.get(character, 0)
+
+    def next_turn(self):
+        """
+        End the current turn and start the next one.
+
+        Characters that are delayed, or already had a turn this round
+        because their initiative changed, are skipped. If every character
+        is delayed the round ends and the delays are over, so turns start
+        again in initiative order. Effects that expired are put in self.expired.
+
+        :returns: CharacterInitiative whose turn it is, None if there are no characters.
+        """
+        self.expired = []
+        if self.current is not None:
+            self._end_turn(self.current)
+
+        if self._resume_key is not None:
+            self._current_key, self._resume_key = self._resume_key, None
+            self._order = None
+
+        if self.delayed and len(self.delayed) == len(self.tracker):
+            self.delayed.clear()
+            self._current_key = None
+            self._order = None
+
+        for _ in range(len(self.tracker) + 1):
+            character = self._advance()
+            if character is None or (character not in self.delayed
+                                     and self._acted.get(character) != self.round):
+                break
+
+        self.current = character
+        if character is not None:
+            self._start_turn(character)
+        return character
+
+    def _advance(self):
+        """Move to the next character in order, starting new rounds as needed."""
+        order = self.tracker.character_order()
+        if not order:
+            self._current_key = None
+            return None
+
+        if order is self._order:
+            index = self._index + 1
+        elif self._current_key is None:
+            index = len(order)
+        else:
+            index = self.tracker.index_after(self._current_key)
+
+        if index >= len(order):
+            self._start_round()
+            index = 0
+
+        self._order, self._index = order, index
+        self._current_key = self.tracker.key(order[index])
+        return order[index]
+
+    def _start_round(self):
+        if self.round:
+            self._expire(self._round_effects, (self.round, END_OF_TURN))
+        self.round += 1
+
+    def _start_turn(self, character):
+        self._turns[character] = self.turns_taken(character) + 1
+        self._acted[character] = self.round
+        self.readied.pop(character, None)
+        self._expire(self._effects.get(character), (self._turns[character], START_OF_TURN))
+
+    def _end_turn(self, character):
+        self._expire(self._effects.get(character), (self.turns_taken(character), END_OF_TURN))
+
+    def _expire(self, heap, until):
+        while heap and heap[0][:2] <= until:
+            self.expired.append(heapq.heappop(heap)[-1])
+
+    def add_effect(self, character, name, turns=1, ends=END_OF_TURN):
+        """
+        Give a character an effect that lasts a number of its turns.
+
+        eg. "stunned until the end of its next turn" is turns=1, ends=END_OF_TURN.
+
+        :param character: CharacterInitiative timing the effect.
+        :param name: Name of the effect.
+        :param turns: Number of the character's turns to last, 0 during its own
+                      turn means until the end of that turn.
+        :param ends: START_OF_TURN or END_OF_TURN.
+        :returns: Effect
+        """
+        effect = Effect(name, character, self.turns_taken(character) + turns)
+        heapq.heappush(self._effects.setdefault(character, []),
+                       (effect.expires, ends, next(self._sequence), effect))
+        return effect
+
+    def add_round_effect(self, name, rounds=1):
+        """
+        Add an effect that lasts until the end of a number of rounds, 1 being this round.
+
+        :param name: Name of the effect.
+        :param rounds: Number of rounds to last.
+        :returns: Effect
+        """
+        effect = Effect(name, None, self.round + rounds - 1)
+        heapq.heappush(self._round_effects,
+                       (effect.expires, END_OF_TURN, next(self._sequence), effect))
+        return effect
+
+    def effects(self, character=None):
+        """
+        Get list of effects that have not expired.
+
+        :param character: CharacterInitiative to get effects of, None for round effects.
+        """
+        heap = self._effects.get(character, []) if character is not None else self._round_effects
+        return [entry[-1] for entry in sorted(heap)]
+
+    def remove_effect(self, effect):
+        """Remove an effect before it expires."""
+        heap = self._effects.get(effect.character, []) if effect.character is not None \
+            else self._round_effects
+        heap[:] = [entry for entry in heap if entry[-1] is not effect]
+        heapq.heapify(heap)
+
+    def ready(self, action):
+        """
+        Ready an action for the current character until the start of its next turn.
+
+        :param action: Description of the action and its trigger.
+        """
+        self.readied[self.current] = action
+
+    def trigger(self, character):
+        """
+        Use the readied action of a character.
+
+        :returns: The readied action, None if the character has none.
+        """
+        return self.readied.pop(character, None)
+
+    def delay(self):
+        """
+        Delay the current character's turn, then start the next turn.
+
+        The character is skipped until resume() is called for it.
+
+        :returns: CharacterInitiative whose turn it is.
+        """
+        self.delayed.add(self.current)
+        return self.next_turn()
+
+    def resume(self, character):
+        """
+        End a delayed character's delay and give it a turn right now.
+
+        Its initiative is set to the current character's, so in later
+        rounds it takes its turn at this point. Once its turn is over
+        next_turn() continues after the current character.
+
+        :param character: Delayed CharacterInitiative.
+        """
+        self.delayed.discard(character)
+        self.expired = []
+        if self.current is not None:
+            self._end_turn(self.current)
+            self._resume_key = self._current_key
+            character.initiative = self.current.initiative
+
+        self._order = None
+        self._current_key = self.tracker.key(character)
+        self.current = character
+        self._start_turn(character)
+        return character
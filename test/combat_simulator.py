@@ -0,0 +1,53 @@
+import unittest
+
+from src.combat_simulator import Attack, Target, simulate_combat, _normal_quantile
+
+
+class TestSimulateCombat(unittest.TestCase):
+
+    def test_always_hit(self):
+        # only a natural 1 misses, a natural 20 doubles the dice
+        report = simulate_combat([Attack(100, "1d6+2")], Target(10, 1000), tolerance=0.005,
+                                 batch_size=20000, workers=1, seed=1)
+
+        expected = 0.9 * 5.5 + 0.05 * 9
+        low, high = report.damage_per_round_interval
+        self.assertLess(low, report.damage_per_round)
+        self.assertLess(report.damage_per_round, high)
+        self.assertAlmostEqual(report.damage_per_round, expected, delta=0.05)
+        self.assertGreater(report.trials_per_second, 0)
+
+    def test_rounds_to_kill(self):
+        report = simulate_combat([Attack(100, "10")], Target(10, 25), max_trials=1000,
+                                 batch_size=1000, workers=1, seed=1)
+
+        self.assertEqual(report.trials, 1000)
+        self.assertEqual(report.survival_rate, 0)
+        self.assertGreaterEqual(report.rounds_to_kill, 3)
+        self.assertEqual(report.kill_probability(2), 0)
+        self.assertEqual(report.kill_probability(100), 1)
+
+    def test_never_hit(self):
+        report = simulate_combat([Attack(-100, "1d8")], Target(30, 100), max_rounds=5,
+                                 max_trials=500, batch_size=500, workers=1, seed=1)
+
+        self.assertEqual(report.survival_rate, 1)
+        self.assertAlmostEqual(report.damage_per_round, 0.05 * 9, delta=0.2)
+
+    def test_reproducible(self):
+        def run(workers):
+            return simulate_combat([Attack(5, "2d6+3", advantage=True)], Target(15, 40),
+                                   tolerance=0, max_trials=4000, batch_size=1000,
+                                   workers=workers, seed=3).damage_histogram.tolist()
+
+        self.assertEqual(run(1), run(2))
+
+    def test_normal_quantile(self):
+        # values of statistics.NormalDist().inv_cdf, which Python 3.7 does not have
+        for probability, expected in [(0.5, 0.0), (0.975, 1.959963984540054),
+                                      (0.995, 2.5758293035489004), (0.8, 0.8416212335729143),
+                                      (0.001, -3.090232306167813), (1e-6, -4.753424308822899)]:
+            self.assertAlmostEqual(_normal_quantile(probability), expected, places=7)
+        with self.assertRaises(ValueError):
+            _normal_quantile(1)
+
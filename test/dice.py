@@ -1,7 +1,13 @@
 import unittest
-import random
-from unittest.mock import patch
-from src.dice import roll_results, advantage_disadvantage, roll_dice
+from unittest.mock import MagicMock
+
+import numpy as np
+from src.dice import roll_results, advantage_disadvantage, roll_dice, roll_batch
+
+
+def fixed_rng(*values):
+    """numpy Generator stand-in that returns values in order."""
+    return MagicMock(integers=MagicMock(return_value=np.array(values)))
 
 
 class TestDiceFunctions(unittest.TestCase):
@@ -14,16 +20,33 @@ class TestDiceFunctions(unittest.TestCase):
         self.assertTrue(1 <= roll_dice('d12') <= 12)
         self.assertTrue(1 <= roll_dice('d20') <= 20)
         self.assertTrue(1 <= roll_dice('d100') <= 100)
+        self.assertIsNone(roll_dice('d7'))
 
     def test_roll_results(self):
-        random.seed(10)
-        self.assertEqual(roll_results(1, 'd4', True, 2), [[1], 2, 3])
-        self.assertEqual(roll_results(1, 'd6', True, 7), [[4], 7, 11])
-        self.assertEqual(roll_results(1, 'd6', False, 7), [[4], 7, 4])
+        self.assertEqual(roll_results(1, 'd4', True, 2, rng=fixed_rng(1)), [[1], 2, 3])
+        self.assertEqual(roll_results(1, 'd6', True, 7, rng=fixed_rng(4)), [[4], 7, 11])
+        self.assertEqual(roll_results(1, 'd6', False, 7, rng=fixed_rng(4)), [[4], 7, 4])
+        self.assertEqual(roll_results(0, 'd6', True, 7), [[], 7, 7])
 
     def test_advantage_disadvantage(self):
-        with patch('random.randint', side_effect=[3, 5]):
-            self.assertEqual(advantage_disadvantage(True, 'd6'), ([3, 5], 5))
+        self.assertEqual(advantage_disadvantage(True, 'd6', rng=fixed_rng(3, 5)), ([3, 5], 5))
+        self.assertEqual(advantage_disadvantage(False, 'd4', rng=fixed_rng(6, 4)), ([6, 4], 4))
+
+    def test_roll_batch(self):
+        result = roll_batch([2, 0, 3], [4, 6, 8], [1, 2, -3], rng=fixed_rng(1, 4, 8, 8, 2))
+
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result.rolls(0).tolist(), [1, 4])
+        self.assertEqual(result.rolls(1).tolist(), [])
+        self.assertEqual(result.rolls(2).tolist(), [8, 8, 2])
+        self.assertEqual(result.totals.tolist(), [6, 2, 15])
+        self.assertEqual(result.modifiers.tolist(), [1, 2, -3])
+
+    def test_roll_batch_range(self):
+        result = roll_batch([1000] * 4, [4, 6, 20, 100], rng=np.random.default_rng(10))
 
-        with patch('random.randint', side_effect=[6, 4]):
-            self.assertEqual(advantage_disadvantage(False, 'd4'), ([6, 4], 4))
+        for group, sides in enumerate([4, 6, 20, 100]):
+            rolls = result.rolls(group)
+            self.assertEqual(rolls.min(), 1)
+            self.assertEqual(rolls.max(), sides)
+        self.assertEqual(result.totals.tolist(), [result.rolls(i).sum() for i in range(4)])
@@ -0,0 +1,60 @@
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+from src.dice_expression import compile_expression, DiceTerm
+
+
+def fixed_rng(*rolls):
+    """numpy Generator stand-in that returns each array of rolls in order."""
+    return MagicMock(integers=MagicMock(side_effect=[np.array(roll) for roll in rolls]))
+
+
+class TestCompileExpression(unittest.TestCase):
+
+    def test_parse(self):
+        expression = compile_expression("4d6kh3 + 2d8! - d%r2 + 5 - 1")
+
+        self.assertEqual(expression.modifier, 4)
+        self.assertListEqual(expression.terms, [
+            DiceTerm(1, 4, 6, 0, False, True, 3),
+            DiceTerm(1, 2, 8, 0, True, True, None),
+            DiceTerm(-1, 1, 100, 2, False, True, None),
+        ])
+
+    def test_keep_and_drop(self):
+        self.assertEqual(compile_expression("2d20kl1").terms[0].keep, 1)
+        self.assertFalse(compile_expression("2d20kl1").terms[0].keep_highest)
+        self.assertEqual(compile_expression("5d6dl2").terms[0][5:], (True, 3))
+        self.assertEqual(compile_expression("5d6dh1").terms[0][5:], (False, 4))
+
+    def test_invalid(self):
+        for text in ["", "d", "2d6+", "2d6 3", "fire bolt", "2d6kh3", "1d1!", "2d0"]:
+            with self.assertRaises(ValueError, msg=text):
+                compile_expression(text)
+
+    def test_cached(self):
+        self.assertIs(compile_expression("1d20+4"), compile_expression("1d20+4"))
+
+    def test_roll(self):
+        expression = compile_expression("4d6kh3-1d4r1+2")
+        rng = fixed_rng([[1, 6, 3, 4]], [[1]], [3])
+
+        self.assertEqual(expression.roll(rng), [[3, 4, 6, -3], 2, 12])
+
+    def test_roll_exploding(self):
+        expression = compile_expression("2d6!")
+        rng = fixed_rng([[6, 2]], [6], [1])
+
+        self.assertEqual(expression.roll(rng), [[13, 2], 0, 15])
+
+    def test_roll_batch(self):
+        totals = compile_expression("4d6kh3+2").roll_batch(10000, np.random.default_rng(3))
+
+        self.assertEqual(totals.shape, (10000,))
+        self.assertEqual((totals.min(), totals.max()), (5, 20))
+        self.assertAlmostEqual(totals.mean(), 14.24, delta=0.1)
+
+    def test_distribution(self):
+        self.assertAlmostEqual(compile_expression("2d6+1d4+3").distribution().mean, 12.5)
+        self.assertIsNone(compile_expression("2d6!").distribution())
@@ -0,0 +1,26 @@
+import unittest
+
+from src.dice_roller_screen import DiceRollerScreen, _Macro
+
+
+class TestDiceRollerScreen(unittest.TestCase):
+
+    def test_use_macro(self):
+        screen = DiceRollerScreen()
+        screen._macros = {"fireball": _Macro("Fireball", [0, 8], 0)}
+
+        screen._macro_input.value = "Fireball"
+        screen._use_macro()
+        self.assertRegex(screen._macro_output, r"= \d+ \(avg 28\)$")
+
+    def test_invalid_saved_macro(self):
+        screen = DiceRollerScreen()
+        screen._macros = {"broken": _Macro("broken", [1, -2], 0)}
+
+        screen._macro_input.value = "broken"
+        screen._use_macro()
+        self.assertEqual(screen._macro_output, 'Invalid macro "broken"')
+
+
+if __name__ == '__main__':
+    unittest.main()
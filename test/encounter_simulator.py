@@ -0,0 +1,57 @@
+import subprocess
+import sys
+import unittest
+
+from src.encounter_simulator import Combatant, simulate_encounters
+
+
+def fight(**kwargs):
+    party = [Combatant("Bilbo", "party", 30, 16, 8, damage="1d8+4", initiative_bonus=3),
+             Combatant("Gandalf", "party", 25, 12, 6, damage="2d6+3", policy="weakest")]
+    goblins = [Combatant(f"goblin {i}", "goblins", 7, 13, 4, damage="1d6+2", policy="first")
+               for i in range(3)]
+    return simulate_encounters(party + goblins, **kwargs)
+
+
+class TestSimulateEncounters(unittest.TestCase):
+
+    def test_simulate(self):
+        report = fight(encounters=300, workers=1, seed=1)
+
+        self.assertEqual(report.encounters, 300)
+        self.assertAlmostEqual(sum(report.win_rates.values()), 1)
+        self.assertGreater(report.win_rates["party"], 0.5)
+        self.assertGreater(report.mean_rounds, 1)
+        self.assertEqual(report.rounds_histogram[0], 0)
+        self.assertGreater(report.mean_damage_taken[2], 0)
+
+    def test_same_names(self):
+        goblins = [Combatant("goblin", "goblins", 7, 13, 4, damage="1d6+2") for _ in range(2)]
+        ogre = Combatant("ogre", "ogres", 60, 11, 6, damage="2d8+4", policy="first")
+        report = simulate_encounters(goblins + [ogre], encounters=50, workers=1, seed=2)
+
+        self.assertEqual(len(report.mean_damage_taken), 3)
+        self.assertGreater(report.mean_damage_taken[0], 0)
+
+    def test_draw(self):
+        walls = [Combatant("wall", "a", 100, 30, 0, damage="1"),
+                 Combatant("other wall", "b", 100, 30, 0, damage="1")]
+        report = simulate_encounters(walls, 20, max_rounds=3, workers=1, seed=1)
+
+        self.assertEqual(report.win_rates, {None: 1.0})
+        self.assertEqual(report.rounds_histogram[3], 20)
+
+    def test_reproducible(self):
+        first = fight(encounters=50, workers=2, seed=5)
+        second = fight(encounters=50, workers=2, seed=5)
+
+        self.assertEqual(first.wins, second.wins)
+        self.assertEqual(first.damage_taken.tolist(), second.damage_taken.tolist())
+
+    def test_invalid_policy(self):
+        with self.assertRaises(ValueError):
+            Combatant("ogre", "ogres", 50, 11, 6, damage="2d8+4", policy="smartest")
+
+    def test_no_pygame(self):
+        code = "import sys, src.encounter_simulator; sys.exit('pygame' in sys.modules)"
+        self.assertEqual(subprocess.run([sys.executable, "-c", code]).returncode, 0)
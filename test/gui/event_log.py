@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+import pygame
+
+from src.gui.event_log import EventPlayer, EventRecorder, replay
+
+
+class TestEventLog(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "events.wwlog")
+
+    def test_record_replay(self):
+        frames = [[pygame.event.Event(pygame.MOUSEMOTION, pos=(10, 20), rel=(1, 2),
+                                      buttons=(1, 0, 0))],
+                  [],
+                  [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, unicode="a", mod=0),
+                   pygame.event.Event(pygame.KEYUP, key=pygame.K_a, mod=0)]]
+
+        recorder = EventRecorder(self.path, seed=2 ** 100 + 7)
+        for events in frames:
+            recorder.record(events)
+        recorder.close()
+        self.assertEqual(recorder.frames, 2)
+
+        player = EventPlayer(self.path)
+        self.assertEqual(player.seed, 2 ** 100 + 7)
+        self.assertEqual(len(player), 2)
+
+        motion, = player.next_events()
+        self.assertEqual(motion.type, pygame.MOUSEMOTION)
+        self.assertEqual((motion.pos, motion.rel, motion.buttons), ((10, 20), (1, 2), (1, 0, 0)))
+
+        keydown, keyup = player.next_events()
+        self.assertEqual((keydown.type, keydown.key, keydown.unicode),
+                         (pygame.KEYDOWN, pygame.K_a, "a"))
+        self.assertEqual(keyup.type, pygame.KEYUP)
+
+        self.assertTrue(player.done)
+        self.assertIsNone(player.next_events())
+
+    def test_replay(self):
+        recorder = EventRecorder(self.path)
+        recorder.record([pygame.event.Event(pygame.MOUSEBUTTONUP, pos=(1, 1), button=1)])
+        recorder.record([pygame.event.Event(pygame.MOUSEBUTTONUP, pos=(2, 2), button=1)])
+        recorder.close()
+
+        player = EventPlayer(self.path, realtime=True)
+        self.assertIsNone(player.seed)
+
+        screen = MagicMock()
+        frame_times = replay(screen, player, "display")
+
+        self.assertEqual(len(frame_times), 2)
+        self.assertEqual([call.args[1][0].pos for call in screen._frame.call_args_list],
+                         [(1, 1), (2, 2)])
+
+    def test_not_a_log(self):
+        with open(self.path, "wb") as log:
+            log.write(b"not a log")
+
+        with self.assertRaises(ValueError):
+            EventPlayer(self.path)
+
+    def test_truncated(self):
+        recorder = EventRecorder(self.path, seed=5)
+        recorder.record([pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, unicode="a", mod=0)])
+        recorder.close()
+        with open(self.path, "rb") as log:
+            data = log.read()
+
+        for end in [3, 6, len(data) - 30, len(data) - 1]:
+            with open(self.path, "wb") as log:
+                log.write(data[:end])
+            with self.assertRaises(ValueError, msg=f"cut at {end}"):
+                EventPlayer(self.path)
+
+        with open(self.path, "wb") as log:
+            log.write(data[:-3] + b"}}}")
+        with self.assertRaises(ValueError):
+            EventPlayer(self.path)
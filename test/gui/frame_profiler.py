@@ -0,0 +1,58 @@
+import os
+import pstats
+import tempfile
+import unittest
+
+import pygame
+
+from src.gui.frame_profiler import FrameProfiler, PHASES
+
+
+class TestFrameProfiler(unittest.TestCase):
+
+    def frame(self, profiler):
+        profiler.begin_frame()
+        for _ in PHASES:
+            profiler.mark()
+        profiler.end_frame()
+
+    def test_timings(self):
+        profiler = FrameProfiler(frames=3)
+        self.assertEqual(profiler.summary(), {})
+
+        for _ in range(5):
+            self.frame(profiler)
+
+        self.assertEqual(len(profiler.timings), 3)
+        self.assertEqual(len(profiler.timings[0]), len(PHASES))
+        summary = profiler.summary()
+        self.assertEqual(list(summary), list(PHASES) + ["frame"])
+        for mean, peak in summary.values():
+            self.assertLessEqual(mean, peak)
+
+    def test_capture(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "frames.prof")
+
+        profiler = FrameProfiler()
+        profiler.capture(path, frames=2)
+        self.assertTrue(profiler.capturing)
+
+        self.frame(profiler)
+        self.assertFalse(os.path.exists(path))
+        self.frame(profiler)
+
+        self.assertFalse(profiler.capturing)
+        self.assertEqual(profiler.last_capture, path)
+        pstats.Stats(path)
+
+    def test_draw(self):
+        profiler = FrameProfiler()
+        self.frame(profiler)
+        screen = pygame.Surface((640, 480))
+        screen.fill((255, 255, 255))
+
+        profiler.draw(screen, pygame.font.SysFont('comicsansms', 18))
+        self.assertNotEqual(screen.get_at((639, 0)), pygame.Color(255, 255, 255))
+        self.assertEqual(screen.get_at((0, 479)), pygame.Color(255, 255, 255))
@@ -0,0 +1,118 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pygame
+
+from src.gui.screen import Screen
+from src.gui.utils import Button
+
+
+class ButtonScreen(Screen):
+    retained_mode = True
+
+    def __init__(self):
+        super().__init__()
+        self.button = Button("button", (0, 0), (100, 30), MagicMock())
+        self.draws = 0
+
+    def _draw(self, screen):
+        self.draws += 1
+        self.button.draw(screen)
+
+    def _handle_events(self, events):
+        super()._handle_events(events)
+        self.button.handle_events(events)
+
+    def _dirty_components(self):
+        return [self.button]
+
+
+class TestScreen(unittest.TestCase):
+
+    def frame(self, screen, events=(), mouse=None):
+        events = list(events)
+        if mouse is not None:
+            events.append(pygame.event.Event(pygame.MOUSEMOTION, pos=mouse, rel=(0, 0),
+                                             buttons=(0, 0, 0)))
+        # the live mouse is ignored, hover follows the events
+        with patch("pygame.mouse.get_pos", return_value=(50, 10)), \
+                patch("pygame.display.flip") as flip, \
+                patch("pygame.display.update") as update:
+            screen._frame(pygame.Surface((Screen.screen_width, Screen.screen_height)), events)
+        return flip, update
+
+    def test_retained_mode(self):
+        screen = ButtonScreen()
+
+        flip, update = self.frame(screen)
+        flip.assert_called_once()
+        update.assert_not_called()
+
+        flip, update = self.frame(screen)
+        flip.assert_not_called()
+        update.assert_not_called()
+        self.assertEqual(screen.draws, 1)
+
+        flip, update = self.frame(screen, mouse=(50, 10))
+        flip.assert_not_called()
+        update.assert_called_once_with([pygame.Rect(0, 0, 100, 30)])
+        self.assertEqual(screen.draws, 2)
+
+        screen.mark_dirty((10, 10, 5, 5))
+        flip, update = self.frame(screen)
+        update.assert_called_once_with([pygame.Rect(10, 10, 5, 5)])
+
+        flip, update = self.frame(screen, [MagicMock(type=pygame.WINDOWEXPOSED)])
+        flip.assert_called_once()
+
+    def test_immediate_mode(self):
+        screen = ButtonScreen()
+        screen.retained_mode = False
+
+        self.frame(screen)
+        flip, _ = self.frame(screen)
+        flip.assert_called_once()
+        self.assertEqual(screen.draws, 2)
+
+    @patch("pygame.event.get", return_value=[])
+    @patch("pygame.event.wait", return_value=MagicMock(type=pygame.NOEVENT))
+    def test_next_events(self, wait, get):
+        screen = ButtonScreen()
+        screen.busy_frames = screen._busy_frames = 2
+        clock = MagicMock()
+
+        for _ in range(2):
+            self.assertEqual(screen._next_events(clock), [])
+        wait.assert_not_called()
+        clock.tick.assert_called_with(screen.frames_per_second)
+
+        self.assertEqual(screen._next_events(clock), [])
+        wait.assert_called_once_with(screen.idle_timeout)
+
+        click = MagicMock(type=pygame.MOUSEBUTTONUP)
+        wait.return_value = click
+        self.assertEqual(screen._next_events(clock), [click])
+        wait.reset_mock()
+        screen._next_events(clock)
+        wait.assert_not_called()
+
+        screen._busy_frames = 0
+        with patch.object(screen, "_needs_continuous_updates", return_value=True):
+            screen._next_events(clock)
+        wait.assert_not_called()
+
+    def test_profiler_keys(self):
+        screen = ButtonScreen()
+        self.frame(screen)
+
+        with patch.object(Screen, "profiler") as profiler:
+            profiler.visible = False
+            flip, _ = self.frame(screen, [MagicMock(type=pygame.KEYUP, key=pygame.K_F3)])
+            self.assertTrue(profiler.visible)
+            profiler.draw.assert_called_once()
+            flip.assert_called_once()
+
+            self.frame(screen, [MagicMock(type=pygame.KEYUP, key=pygame.K_F4)])
+            path, frames = profiler.capture.call_args.args
+            self.assertTrue(path.endswith(".prof"))
+            self.assertEqual(frames, screen.profile_frames)
@@ -0,0 +1,75 @@
+import unittest
+
+from src.gui.text_buffer import GapBuffer
+
+
+class TestGapBuffer(unittest.TestCase):
+
+    def test_insert_delete(self):
+        buffer = GapBuffer("hello world", gap=2)
+        self.assertEqual(buffer.cursor, 11)
+
+        buffer.cursor = 5
+        buffer.insert(",")
+        buffer.insert(" there")
+        self.assertEqual(buffer.value, "hello, there world")
+        self.assertEqual(buffer.cursor, 12)
+
+        buffer.delete(6)
+        buffer.delete_forward(1)
+        self.assertEqual(buffer.value, "hello,world")
+
+        buffer.cursor = 0
+        buffer.delete()
+        buffer.cursor = 100
+        buffer.delete_forward()
+        self.assertEqual(buffer.value, "hello,world")
+        self.assertEqual(buffer.cursor, 11)
+        self.assertEqual(len(buffer), 11)
+
+    def test_value(self):
+        buffer = GapBuffer("abc")
+        value = buffer.value
+        version = buffer.version
+
+        buffer.cursor = 1
+        self.assertIs(buffer.value, value)
+        self.assertEqual(buffer.version, version)
+
+        buffer.insert("x")
+        self.assertEqual(str(buffer), "axbc")
+        self.assertGreater(buffer.version, version)
+
+        buffer.value = "new"
+        self.assertEqual((buffer.value, buffer.cursor), ("new", 3))
+
+        version = buffer.version
+        buffer.cursor = 1
+        buffer.value = "new"
+        self.assertEqual((buffer.version, buffer.cursor), (version, 1), "same text is not set")
+
+    def test_listeners(self):
+        buffer = GapBuffer("one two", gap=2)
+        edits = []
+        buffer.listeners.append(lambda *edit: edits.append(edit))
+
+        buffer.cursor = 3
+        buffer.insert("!")
+        buffer.delete(2)
+        buffer.delete_forward(3)
+        buffer.value = "new"
+
+        self.assertEqual(edits, [(3, "", "!"), (2, "e!", ""), (2, " tw", ""), (0, "ono", "new")])
+
+    def test_lines(self):
+        buffer = GapBuffer("one\ntwo\nthree")
+        buffer.cursor = 5
+
+        self.assertEqual(buffer[4], "t")
+        self.assertEqual(buffer[-1], "e")
+        self.assertEqual(buffer.line_start(), 4)
+        self.assertEqual(buffer.line_end(), 7)
+        self.assertEqual(buffer.line_start(2), 0)
+        self.assertEqual(buffer.line_end(9), 13)
+        with self.assertRaises(IndexError):
+            buffer[13] # pylint: disable=pointless-statement
@@ -0,0 +1,73 @@
+import random
+import unittest
+from unittest.mock import patch
+
+import pygame
+
+from src.gui.text_layout import TextLayout
+
+
+class TestTextLayout(unittest.TestCase):
+
+    def setUp(self):
+        self.font = pygame.font.SysFont('comicsansms', 18)
+
+    def test_wrap(self):
+        width = max(self.font.size("hello ")[0], self.font.size("world")[0])
+        layout = TextLayout(self.font, width)
+        layout.update("hello world\n\nhello")
+
+        self.assertEqual(layout.lines, ["hello ", "world", "", "hello"])
+        self.assertEqual(layout.starts, [0, 6, 12, 13])
+
+    def test_long_word(self):
+        width, _ = self.font.size("abc")
+        layout = TextLayout(self.font, width)
+        layout.update("abcabcab")
+
+        self.assertEqual("".join(layout.lines), "abcabcab")
+        self.assertGreater(len(layout.lines), 1)
+        for line in layout.lines:
+            self.assertLessEqual(self.font.size(line)[0], width)
+
+    def test_edit(self):
+        layout = TextLayout(self.font, 500)
+        layout.update("one\ntwo\nthree")
+
+        with patch.object(layout, "_wrap", wraps=layout._wrap) as wrap:
+            layout.edit(7, "", "!")
+            wrap.assert_called_once_with("two!")
+
+            wrap.reset_mock()
+            layout.edit(3, "\ntwo!", "")
+            wrap.assert_called_once_with("one")
+
+        self.assertEqual(layout.lines, ["one", "three"])
+        self.assertEqual(layout.starts, [0, 4])
+
+    def test_edit_matches_update(self):
+        generator = random.Random(3)
+        width, _ = self.font.size("abc de")
+        text = ""
+        layout = TextLayout(self.font, width)
+        layout.update(text)
+
+        for _ in range(300):
+            offset = generator.randint(0, len(text))
+            removed = text[offset:offset + generator.randint(0, 3) * generator.randint(0, 1)]
+            inserted = "".join(generator.choice("ab \n") for _ in range(generator.randint(0, 4)))
+            text = text[:offset] + inserted + text[offset + len(removed):]
+            layout.edit(offset, removed, inserted)
+
+            expected = TextLayout(self.font, width)
+            expected.update(text)
+            self.assertEqual((layout.lines, layout.starts), (expected.lines, expected.starts))
+
+    def test_position(self):
+        layout = TextLayout(self.font, 500)
+        layout.update("ab\ncd")
+
+        self.assertEqual(layout.position(0), (0, 0))
+        self.assertEqual(layout.position(2), (self.font.size("ab")[0], 0))
+        self.assertEqual(layout.position(4), (self.font.size("c")[0], layout.line_height))
+        self.assertEqual(layout.line_of(5), 1)
@@ -16,13 +16,12 @@ class TestTextBox(unittest.TestCase):
         tb = TextBox((0, 0), (200, 200))
         self.assertFalse(tb.selected, "initial state")
 
-        with patch("pygame.mouse.get_pos", return_value=(100, 100)):
-            tb.handle_events([MagicMock(type=pygame.MOUSEBUTTONUP)])
-            self.assertTrue(tb.selected, "click on box")
-
         with patch("pygame.mouse.get_pos", return_value=(300, 300)):
-            tb.handle_events([MagicMock(type=pygame.MOUSEBUTTONUP)])
-            self.assertFalse(tb.selected, "click outside of box")
+            tb.handle_events([MagicMock(type=pygame.MOUSEBUTTONUP, pos=(100, 100))])
+            self.assertTrue(tb.selected, "click on box, where the event was")
+
+        tb.handle_events([MagicMock(type=pygame.MOUSEBUTTONUP, pos=(300, 300))])
+        self.assertFalse(tb.selected, "click outside of box")
 
         tb.selected = True
         tb.handle_events([MagicMock(type=pygame.KEYDOWN, key=pygame.K_RETURN)])
@@ -109,3 +108,23 @@ class TestTextArea(unittest.TestCase):
         ta.handle_events([MagicMock(type=pygame.KEYDOWN, key=pygame.K_1, unicode='!')])
 
         self.assertEqual(ta.value, "Hello,\nWorld!")
+
+    def test_draw_does_not_join(self):
+        ta = TextArea((0, 0), (100, 100), initial_value="one\ntwo", always_selected=True)
+        ta.handle_events([MagicMock(type=pygame.KEYDOWN, key=pygame.K_1, unicode='!')])
+
+        ta.draw(pygame.Surface((100, 100)))
+        self.assertIsNone(ta._buffer._value)
+        self.assertEqual(ta._layout.lines, ["one", "two!"])
+
+    def test_lines(self):
+        ta = TextArea((0, 0), (100, 100), initial_value="one\ntwo", always_selected=True)
+
+        ta.handle_events([MagicMock(type=pygame.KEYDOWN, key=pygame.K_HOME, unicode='')])
+        ta.handle_events([MagicMock(type=pygame.KEYDOWN, key=pygame.K_DELETE, unicode='')])
+        ta.handle_events([MagicMock(type=pygame.KEYDOWN, key=pygame.K_t, unicode='T')])
+        ta.handle_events([MagicMock(type=pygame.KEYDOWN, key=pygame.K_UP, unicode='')])
+        ta.handle_events([MagicMock(type=pygame.KEYDOWN, key=pygame.K_END, unicode='')])
+        ta.handle_events([MagicMock(type=pygame.KEYDOWN, key=pygame.K_1, unicode='!')])
+
+        self.assertEqual(ta.value, "one!\nTwo")
@@ -1,9 +1,12 @@
+import gc
+import os
+import tempfile
 import unittest
 from unittest.mock import MagicMock, patch
 
 import pygame
 
-from src.gui.utils import DragAndScaleMixin, Button
+from src.gui.utils import DragAndScaleMixin, Button, ImageCache, TextCache
 
 
 class RectDraggable(DragAndScaleMixin):
@@ -72,3 +75,116 @@ class TestButton(unittest.TestCase):
 
         action.assert_not_called()
         action.reset_mock()
+
+
+class TestTextCache(unittest.TestCase):
+
+    def setUp(self):
+        self.font = pygame.font.SysFont('comicsansms', 18)
+
+    def test_render(self):
+        cache = TextCache()
+
+        surface, size = cache.render(self.font, "hello", (0, 0, 0))
+        self.assertEqual(size, self.font.size("hello"))
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+        self.assertIs(cache.render(self.font, "hello", [0, 0, 0])[0], surface)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        self.assertIsNot(cache.render(self.font, "hello", (255, 0, 0))[0], surface)
+        self.assertIsNot(cache.render(self.font, "hello", (0, 0, 0), (255, 255, 255))[0], surface)
+        self.assertEqual((cache.hits, cache.misses), (1, 3))
+        self.assertEqual(len(cache), 3)
+
+        cache.clear()
+        self.assertEqual((len(cache), cache.bytes, cache.hits, cache.misses), (0, 0, 0, 0))
+
+    def test_max_bytes(self):
+        sizes = TextCache()
+        for text in "abc":
+            sizes.render(self.font, text, (0, 0, 0))
+        cache = TextCache(max_bytes=sizes.bytes - 1)
+
+        cache.render(self.font, "a", (0, 0, 0))
+        cache.render(self.font, "b", (0, 0, 0))
+        cache.render(self.font, "a", (0, 0, 0))
+        cache.render(self.font, "c", (0, 0, 0))
+
+        self.assertLessEqual(cache.bytes, cache.max_bytes)
+        cache.render(self.font, "a", (0, 0, 0))
+        self.assertEqual(cache.hits, 2)
+        cache.render(self.font, "b", (0, 0, 0))
+        self.assertEqual(cache.misses, 4)
+
+
+class Owner:
+    pass
+
+
+class TestImageCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.paths = []
+        for name in "abc":
+            self.paths.append(os.path.join(self.directory.name, name + ".png"))
+            pygame.image.save(pygame.Surface((100, 100)), self.paths[-1])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_shared(self):
+        cache = ImageCache()
+        first, second = Owner(), Owner()
+
+        image = cache.acquire(self.paths[0], first)
+        self.assertIs(cache.acquire(self.paths[0], second), image)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        scaled = cache.scaled(self.paths[0], (50, 50))
+        self.assertEqual(scaled.get_size(), (50, 50))
+        self.assertIs(cache.scaled(self.paths[0], (50, 50)), scaled)
+        self.assertEqual(len(cache), 2)
+
+        os.utime(self.paths[0], ns=(0, 0))
+        self.assertIsNot(cache.acquire(self.paths[0], first), image)
+
+        cache.clear()
+        self.assertEqual((len(cache), cache.bytes, cache.hits, cache.misses), (0, 0, 0, 0))
+
+    def test_scaled_reuses_key(self):
+        cache = ImageCache()
+        owner = Owner()
+        cache.acquire(self.paths[0], owner)
+        os.rename(self.paths[0], self.paths[0] + ".moved")
+
+        with patch("os.stat", wraps=os.stat) as stat:
+            for size in range(10, 100, 10):
+                self.assertEqual(cache.scaled(self.paths[0], (size, size)).get_size(),
+                                 (size, size))
+            stat.assert_not_called()
+
+        del owner
+        gc.collect()
+        with self.assertRaises(FileNotFoundError):
+            cache.scaled(self.paths[0], (5, 5))
+
+    def test_max_bytes(self):
+        sizes = ImageCache()
+        owner = Owner()
+        sizes.acquire(self.paths[0], owner)
+        cache = ImageCache(max_bytes=sizes.bytes * 2)
+
+        image = cache.acquire(self.paths[0], owner)
+        cache.scaled(self.paths[1], (100, 100))
+        cache.scaled(self.paths[2], (100, 100))
+        self.assertLessEqual(cache.bytes, cache.max_bytes)
+        # the acquired image is kept, the oldest released one is dropped
+        self.assertIs(cache.acquire(self.paths[0], owner), image)
+
+        del owner
+        gc.collect()
+        cache.scaled(self.paths[1], (100, 100))
+        self.assertIsNot(cache.acquire(self.paths[0], Owner()), image)
+
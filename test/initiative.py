@@ -1,5 +1,9 @@
+import gc
+import random
 import unittest
-from src.initiative import InitiativeTracker, CharacterInitiative
+from unittest.mock import patch
+
+from src.initiative import InitiativeTracker, CharacterInitiative, _SortedOrder, _DETACHED
 
 class TestInitiativeTracker(unittest.TestCase):
 
@@ -17,6 +21,37 @@ class TestInitiativeTracker(unittest.TestCase):
 
         self.assertListEqual(tracker._characters, [john])
 
+    def test_add_twice(self):
+        john = CharacterInitiative("john", 1, 2)
+        tracker = InitiativeTracker()
+        tracker.add_character(john)
+
+        with self.assertRaises(ValueError):
+            tracker.add_character(john)
+        self.assertEqual(len(tracker), 1)
+        self.assertListEqual(tracker.character_order(), [john])
+
+    def test_add_from_other_tracker(self):
+        first, second = InitiativeTracker(), InitiativeTracker()
+        john = first.create_character("john", 5, 2)
+        mary = first.create_character("mary", 3, 4)
+        changes = []
+        first.listeners.append(lambda *change: changes.append(change[:2]))
+
+        second.add_character(john)
+
+        self.assertEqual(changes, [("remove", john)])
+        self.assertListEqual(first.character_order(), [mary])
+        self.assertEqual(len(first.store), 1)
+        self.assertNotIn(john, first)
+        self.assertListEqual(second.character_order(), [john])
+        self.assertIs(john._store, second.store)
+        self.assertEqual((mary.name, mary.health), ("mary", 4))
+        self.assertEqual((john.name, john.health), ("john", 2))
+
+        john.initiative = 1
+        self.assertListEqual(first.character_order(), [mary])
+
     def test_character_order(self):
         alex = CharacterInitiative("Alex", 5, 4)
         anthony_h = CharacterInitiative("Anthony H", 9, 3)
@@ -34,3 +69,96 @@ class TestInitiativeTracker(unittest.TestCase):
 
         order = tracker.character_order()
         self.assertListEqual(order, [anthony_h, antonio, seth, alex, jeff, anthony_t])
+
+    def test_change_initiative(self):
+        alex = CharacterInitiative("Alex", 5, 4)
+        jeff = CharacterInitiative("Jeff", 5, 6)
+        seth = CharacterInitiative("Seth", 8, 3)
+
+        tracker = InitiativeTracker()
+        for character in [alex, jeff, seth]:
+            tracker.add_character(character)
+
+        order = tracker.character_order()
+        self.assertIs(tracker.character_order(), order, "cached until changed")
+
+        alex.initiative = 10
+        self.assertListEqual(tracker.character_order(), [alex, seth, jeff])
+        self.assertListEqual(order, [seth, alex, jeff], "old order not modified")
+
+        alex.initiative = 5
+        self.assertListEqual(tracker.character_order(), [seth, alex, jeff], "ties by add order")
+        self.assertEqual(tracker.index(jeff), 2)
+
+        tracker.remove_character(seth)
+        seth.initiative = 1
+        self.assertNotIn(seth, tracker)
+        self.assertEqual(len(tracker), 2)
+        self.assertListEqual(tracker.character_order(), [alex, jeff])
+
+    def test_store(self):
+        tracker = InitiativeTracker()
+        bilbo = CharacterInitiative("Bilbo", 12, 10, armor_class=14)
+        tracker.add_character(bilbo)
+        goblins = [tracker.create_character(f"goblin {i}", i, 7) for i in range(40)]
+
+        self.assertIs(bilbo._store, tracker.store)
+        self.assertEqual((bilbo.name, bilbo.health, bilbo.max_health, bilbo.armor_class),
+                         ("Bilbo", 10, 10, 14))
+        self.assertEqual(len(tracker.store), 41)
+
+        tracker.apply_damage(goblins[:20], [5, 10] * 10)
+        tracker.apply_damage([bilbo], 3)
+        self.assertEqual([goblin.health for goblin in goblins[:4]], [2, 0, 2, 0])
+        self.assertEqual(bilbo.health, 7)
+
+        defeated = tracker.remove_defeated()
+        self.assertListEqual(defeated, goblins[1:20:2])
+        self.assertEqual(len(tracker), 31)
+        self.assertEqual(len(tracker.store), 31)
+        self.assertNotIn(goblins[1], tracker.character_order())
+        self.assertEqual(goblins[1].name, "goblin 1", "removed characters keep their stats")
+
+        tracker.remove_character(bilbo)
+        self.assertEqual(bilbo.armor_class, 14)
+        self.assertListEqual(tracker.character_order(),
+                             sorted(goblins[0:20:2] + goblins[20:],
+                                    key=lambda c: c.initiative, reverse=True))
+
+    def test_many_characters(self):
+        generator = random.Random(4)
+        with patch.object(_SortedOrder, "LOAD", 4):
+            tracker = InitiativeTracker()
+            characters = [tracker.create_character(str(i), generator.randint(1, 20), 5)
+                          for i in range(200)]
+            for character in generator.sample(characters, 100):
+                character.initiative = generator.randint(1, 20)
+            for character in generator.sample(characters, 60):
+                tracker.remove_character(character)
+                characters.remove(character)
+
+            expected = sorted(characters, key=tracker.key)
+            self.assertListEqual(tracker.character_order(), expected)
+            for index, character in enumerate(expected):
+                self.assertEqual(tracker.index(character), index)
+            self.assertEqual(tracker.index_after(tracker.key(expected[9])), 10)
+
+    def test_detached_store(self):
+        tracker = InitiativeTracker()
+        before = len(_DETACHED)
+        frodo = CharacterInitiative("Frodo", 3, 9)
+        goblins = [tracker.create_character(f"goblin {i}", i, 0) for i in range(5)]
+        self.assertIs(frodo._store, _DETACHED)
+        self.assertEqual(len(_DETACHED), before + 1)
+
+        tracker.add_character(frodo)
+        self.assertEqual(len(_DETACHED), before)
+        defeated = tracker.remove_defeated()
+        self.assertTrue(all(goblin._store is _DETACHED for goblin in defeated))
+        self.assertEqual([goblin.name for goblin in defeated], [f"goblin {i}" for i in range(5)])
+        self.assertEqual(len(_DETACHED), before + 5)
+
+        del defeated, goblins
+        gc.collect()
+        self.assertEqual(len(_DETACHED), before)
+
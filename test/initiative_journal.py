@@ -0,0 +1,120 @@
+import os
+import tempfile
+import unittest
+
+from src.initiative import InitiativeTracker, CharacterInitiative
+from src.initiative_journal import InitiativeJournal
+
+
+def state(tracker):
+    return [(c.name, c.initiative, c.health) for c in tracker.character_order()]
+
+
+class TestInitiativeJournal(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "initiative.jsonl")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_undo_redo(self):
+        tracker = InitiativeTracker()
+        journal = InitiativeJournal(tracker)
+        john = CharacterInitiative("john", 1, 2)
+        mary = CharacterInitiative("mary", 3, 4)
+
+        tracker.add_character(john)
+        tracker.add_character(mary)
+        john.initiative = 5
+        john.health = 1
+        tracker.remove_character(mary)
+        self.assertListEqual(state(tracker), [("john", 5, 1)])
+
+        self.assertTrue(journal.undo())
+        self.assertListEqual(state(tracker), [("john", 5, 1), ("mary", 3, 4)])
+        journal.undo()
+        journal.undo()
+        self.assertListEqual(state(tracker), [("mary", 3, 4), ("john", 1, 2)])
+
+        journal.redo()
+        self.assertListEqual(state(tracker), [("john", 5, 2), ("mary", 3, 4)])
+
+        mary.health = 0
+        self.assertFalse(journal.can_redo, "new change drops undone changes")
+        self.assertFalse(journal.redo())
+
+        for _ in range(4):
+            journal.undo()
+        self.assertListEqual(state(tracker), [])
+        self.assertFalse(journal.undo())
+
+    def test_load(self):
+        tracker = InitiativeTracker()
+        journal = InitiativeJournal(tracker, self.path, snapshot_interval=3)
+        goblins = [tracker.create_character(f"goblin {i}", i, 7) for i in range(5)]
+        tracker.apply_damage(goblins[:2], 10)
+        tracker.remove_defeated()
+        goblins[4].name = "boss"
+        for _ in range(4):
+            journal.undo()
+        journal.redo()
+        expected = state(tracker)
+
+        loaded = InitiativeTracker()
+        loaded_journal = InitiativeJournal(loaded, self.path)
+        loaded_journal.load()
+        self.assertListEqual(state(loaded), expected)
+
+        journal.undo()
+        loaded_journal.undo()
+        self.assertListEqual(state(loaded), state(tracker), "undo history after last snapshot")
+        journal.close()
+        loaded_journal.close()
+
+    def test_close(self):
+        tracker = InitiativeTracker()
+        journal = InitiativeJournal(tracker, self.path)
+        tracker.create_character("bilbo", 12, 10).health = 3
+        journal.close()
+
+        loaded = InitiativeTracker()
+        loaded_journal = InitiativeJournal(loaded, self.path)
+        loaded_journal.load()
+        self.assertListEqual(state(loaded), [("bilbo", 12, 3)])
+        self.assertFalse(loaded_journal.can_undo, "closing writes a snapshot")
+
+    def test_snapshot_compacts(self):
+        tracker = InitiativeTracker()
+        journal = InitiativeJournal(tracker, self.path, snapshot_interval=4)
+        bilbo = tracker.create_character("bilbo", 12, 10)
+        for health in range(9):
+            bilbo.health = health
+        with open(self.path, "r", encoding="utf-8") as journal_file:
+            self.assertEqual(len(journal_file.readlines()), 3, "snapshot and the changes after it")
+
+        journal.close()
+        journal.close()
+        with open(self.path, "r", encoding="utf-8") as journal_file:
+            self.assertEqual(len(journal_file.readlines()), 1)
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_undo_remove_keeps_tie_order(self):
+        tracker = InitiativeTracker()
+        journal = InitiativeJournal(tracker, self.path)
+        first = tracker.create_character("first", 10, 5)
+        tracker.create_character("second", 10, 5)
+        tracker.remove_character(first)
+        journal.undo()
+        self.assertListEqual(state(tracker), [("first", 10, 5), ("second", 10, 5)])
+
+        journal.close()
+        loaded = InitiativeTracker()
+        InitiativeJournal(loaded, self.path).load()
+        self.assertListEqual(state(loaded), state(tracker))
+
+    def test_load_missing(self):
+        tracker = InitiativeTracker()
+        InitiativeJournal(tracker, self.path).load()
+        self.assertEqual(len(tracker), 0)
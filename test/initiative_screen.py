@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pygame
+
+from src.initiative import InitiativeTracker
+from src.initiative_screen import InitiativeTrackerScreen
+
+
+class TestInitiativeTrackerScreen(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "initiative.jsonl")
+        self.tracker = InitiativeTracker()
+        self.tracker.create_character("bilbo", 12, 10)
+        with patch.object(InitiativeTrackerScreen, "journal_path", self.path):
+            self.screen = InitiativeTrackerScreen(self.tracker)
+        self.screen._update()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_attribute_boxes_unchanged(self):
+        entry = self.screen._entries[self.tracker.character_order()[0]]
+        version = entry._healthbox._buffer.version
+        for _ in range(3):
+            self.screen._handle_events([])
+        self.assertEqual(entry._healthbox._buffer.version, version)
+
+        self.tracker.character_order()[0].health = 4
+        self.screen._handle_events([])
+        self.assertEqual(entry._healthbox.value, "4")
+
+    def test_quit_closes_journal(self):
+        with self.assertRaises(SystemExit):
+            self.screen._handle_events([pygame.event.Event(pygame.QUIT)])
+        self.assertTrue(os.path.isfile(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import os
+import pickle
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pygame
+
+from src.map_screen import MapAndCharacterScreen, _Character
+
+
+class TestCharacter(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "goblin.png")
+        pygame.image.save(pygame.Surface((200, 200)), self.path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_pan_does_not_scale(self):
+        character = _Character(self.path, size=(100, 100), zoom=2.0)
+        self.assertEqual(character.img.get_size(), (200, 200))
+
+        with patch("pygame.transform.smoothscale", wraps=pygame.transform.smoothscale) as scale:
+            for offset in range(10):
+                character.zoom_offset = (offset, offset)
+                character.zoom = 2.0
+            scale.assert_not_called()
+
+            character.zoom = 3.0
+            character.size = (50, 50)
+            self.assertEqual(scale.call_count, 2)
+        self.assertEqual(character.img.get_size(), (150, 150))
+
+    def test_shared_images(self):
+        characters = [_Character(self.path, size=(100, 100), zoom=2.0) for _ in range(10)]
+        self.assertTrue(all(character.full_res_img is characters[0].full_res_img
+                            for character in characters))
+        self.assertTrue(all(character.img is characters[0].img for character in characters))
+
+    def test_pickle(self):
+        character = pickle.loads(pickle.dumps(_Character(self.path, size=(100, 100), zoom=2.0)))
+        self.assertEqual(character.zoom, 1.0)
+        self.assertEqual(character.img.get_size(), (100, 100))
+
+
+
+def click(pos, button=1):
+    return [pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=button),
+            pygame.event.Event(pygame.MOUSEBUTTONUP, pos=pos, button=button)]
+
+
+class TestMapAndCharacterScreen(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "goblin.png")
+        pygame.image.save(pygame.Surface((100, 100)), self.path)
+        self.screen = MapAndCharacterScreen()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def add(self, pos):
+        with patch.object(self.screen.character_loader, "file_dialog", return_value=self.path):
+            self.screen._load_character()
+        character = self.screen._characters[-1]
+        character.pos = pos
+        self.screen._index.move(character, character.map_rect)
+        return character
+
+    def test_remove_overlapping(self):
+        first, second = self.add((200, 200)), self.add((250, 250))
+        third = self.add((400, 200))
+
+        self.screen._remove_mode = True
+        self.screen._handle_events(click((260, 260)))
+
+        self.assertEqual(self.screen._characters, [third])
+        self.assertNotIn(first, self.screen._index)
+        self.assertNotIn(second, self.screen._index)
+
+    def test_remove_keeps_order(self):
+        first, second = self.add((100, 100)), self.add((300, 100))
+        third = self.add((500, 100))
+
+        self.screen._remove_mode = True
+        self.screen._handle_events(click((310, 110)))
+        self.screen._handle_events(click((700, 500)))
+
+        self.assertEqual(self.screen._characters, [first, third])
+        self.assertNotIn(second, self.screen._index)
+
+    def test_drag(self):
+        first, second = self.add((200, 200)), self.add((400, 200))
+
+        self.screen._handle_events([
+            pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(210, 210), button=1),
+            pygame.event.Event(pygame.MOUSEMOTION, pos=(310, 110), rel=(100, -100),
+                               buttons=(1, 0, 0)),
+            pygame.event.Event(pygame.MOUSEBUTTONUP, pos=(310, 110), button=1)])
+
+        self.assertEqual(first.pos, (300, 100))
+        self.assertEqual(second.pos, (400, 200))
+        self.assertEqual(self.screen._characters_at((310, 110)), [first])
+        self.assertEqual(self.screen._characters_at((210, 210)), [])
+
+    def test_zoomed(self):
+        first = self.add((200, 200))
+        self.screen.zoom = 2.0
+        self.screen.zoom_offset = (-100, -100)
+
+        self.assertEqual(self.screen._visible_characters(), [first])
+        self.assertEqual(first.pos, (300, 300))
+        self.assertEqual(self.screen._characters_at((310, 310)), [first])
+        self.assertEqual(self.screen._characters_at((210, 210)), [])
+
+        self.screen.zoom_offset = (-640, -480)
+        self.assertEqual(self.screen._visible_characters(), [])
+
+    def test_zoom_places_visible_only(self):
+        near, far = self.add((100, 100)), self.add((600, 400))
+        self.screen.zoom = 2.0
+
+        with patch.object(_Character, "_resize_img") as resize:
+            self.screen.zoom_offset = (0, 0)
+            resize.assert_not_called()
+            self.screen._draw(pygame.Surface((640, 480)))
+            resize.assert_called_once_with()
+
+        self.assertEqual((near.zoom, far.zoom), (2.0, 1.0))
+        self.assertEqual(near.pos, (200, 200))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from unittest.mock import patch
+
+import pygame
+
+from src.map_view import MapView
+
+RED = pygame.Color(255, 0, 0)
+BLUE = pygame.Color(0, 0, 255)
+
+
+class TestMapView(unittest.TestCase):
+
+    def setUp(self):
+        image = pygame.Surface((2560, 1920))
+        image.fill(RED)
+        image.fill(BLUE, pygame.Rect(1280, 0, 1280, 1920))
+        self.view = MapView(image, (640, 480))
+        self.screen = pygame.Surface((640, 480))
+
+    def test_levels(self):
+        self.assertEqual(self.view.pyramid.sizes, [(2560, 1920), (1280, 960), (640, 480)])
+        self.assertEqual(self.view._level((640, 480)), 2)
+        self.assertEqual(self.view._level((1000, 750)), 1)
+        self.assertEqual(self.view._level((5000, 3750)), 0)
+
+    def test_draw(self):
+        self.view.draw(self.screen, 1.0, (0, 0))
+        self.assertEqual(self.screen.get_at((10, 10)), RED)
+        self.assertEqual(self.screen.get_at((630, 10)), BLUE)
+
+        self.view.draw(self.screen, 2.0, (0, 0))
+        self.assertEqual(self.screen.get_at((630, 10)), RED)
+
+        self.view.draw(self.screen, 2.0, (-640, -480))
+        self.assertEqual(self.screen.get_at((10, 10)), BLUE)
+
+    def test_pan_cached(self):
+        with patch("pygame.transform.smoothscale", wraps=pygame.transform.smoothscale) as scale:
+            self.view.draw(self.screen, 5.0, (-1000, -1000))
+            self.view.draw(self.screen, 5.0, (-1100, -1050))
+            self.assertEqual(scale.call_count, 1)
+            self.assertEqual(scale.call_args.args[1], (1280, 960))
+
+            self.view.draw(self.screen, 5.0, (-2000, -1000))
+            self.view.draw(self.screen, 4.0, (-2000, -1000))
+            self.assertEqual(scale.call_count, 3)
@@ -0,0 +1,78 @@
+import unittest
+from concurrent.futures import Future
+from unittest.mock import MagicMock, patch
+
+import pygame
+
+from src.menu_screen import MainMenuScreen
+from src.spell_list import SpellList
+
+
+def screen_class_mock():
+    screen_class = MagicMock()
+    screen_class.__name__ = "MockScreen"
+    return screen_class
+
+
+class TestMainMenuScreen(unittest.TestCase):
+
+    def test_lazy_screens(self):
+        screen_class = screen_class_mock()
+        menu = MainMenuScreen(preload=False)
+
+        self.assertIs(menu.screen(screen_class), menu.screen(screen_class))
+        screen_class.assert_called_once_with()
+
+    def test_screen_by_name(self):
+        menu = MainMenuScreen(preload=False)
+        self.assertIsInstance(menu.screen("spell_list.SpellList"), SpellList)
+
+    def test_open_on_click(self):
+        menu = MainMenuScreen(preload=False)
+        button = menu._buttons[0]
+        screen_class = screen_class_mock()
+        button.params = [screen_class]
+
+        screen_class.assert_not_called()
+        menu._handle_events([MagicMock(type=pygame.MOUSEBUTTONUP, pos=button.rect.center)])
+        screen_class.return_value.open.assert_called_once_with()
+
+    def test_preload(self):
+        screen_classes = (screen_class_mock(), screen_class_mock())
+        menu = MainMenuScreen()
+
+        with patch.object(MainMenuScreen, "preload_screens", screen_classes):
+            menu._update()
+            self.assertIsNone(menu._preloader)
+
+            menu._draw(pygame.Surface((640, 480)))
+            menu._update()
+            menu._preloader.join()
+            self.assertTrue(menu._needs_continuous_updates())
+            for screen_class in screen_classes:
+                screen_class.assert_not_called()
+
+            menu._update()
+            screen_classes[0].assert_called_once_with()
+            screen_classes[1].assert_not_called()
+            menu._update()
+            self.assertFalse(menu._needs_continuous_updates())
+
+        for screen_class in screen_classes:
+            self.assertIs(menu.screen(screen_class), screen_class.return_value)
+            screen_class.assert_called_once_with()
+
+    def test_preload_by_name(self):
+        menu = MainMenuScreen()
+        with patch.object(MainMenuScreen, "preload_screens", ("spell_list.SpellList",)):
+            menu._drawn = True
+            menu._update()
+            menu._preloader.join()
+            menu._update()
+        self.assertIsInstance(menu._screens["spell_list.SpellList"], SpellList)
+
+    def test_waits_only_for_own_screen(self):
+        menu = MainMenuScreen(preload=False)
+        menu._classes["map_screen.MapAndCharacterScreen"] = Future()
+
+        self.assertIsInstance(menu.screen("spell_list.SpellList"), SpellList)
@@ -0,0 +1,41 @@
+import unittest
+
+import numpy as np
+from src.probability import pool_distribution
+
+
+class TestPoolDistribution(unittest.TestCase):
+
+    def test_two_d6(self):
+        dist = pool_distribution([0, 2], 3)
+
+        self.assertEqual((dist.minimum, dist.maximum), (5, 15))
+        self.assertAlmostEqual(dist.probability(10), 6 / 36)
+        self.assertAlmostEqual(dist.probability(5), 1 / 36)
+        self.assertEqual(dist.probability(16), 0.0)
+        self.assertAlmostEqual(dist.at_least(14), 3 / 36)
+        self.assertAlmostEqual(dist.mean, 10)
+        self.assertAlmostEqual(dist.variance, 70 / 12)
+        self.assertEqual(dist.percentile(50), 10)
+        self.assertEqual(dist.percentile(100), 15)
+
+    def test_empty_pool(self):
+        dist = pool_distribution([0] * 7, -4)
+
+        self.assertEqual(dist.values.tolist(), [-4])
+        self.assertEqual(dist.probability(-4), 1.0)
+
+    def test_large_pool(self):
+        dist = pool_distribution([0, 0, 0, 0, 0, 0, 300])
+
+        self.assertEqual((dist.minimum, dist.maximum), (300, 30000))
+        self.assertAlmostEqual(dist.pmf.sum(), 1.0)
+        self.assertAlmostEqual(float(np.dot(dist.values, dist.pmf)), dist.mean, places=3)
+        self.assertEqual(dist.percentile(50), 15150)
+
+    def test_negative_count(self):
+        with self.assertRaises(ValueError):
+            pool_distribution([0, -2])
+
+    def test_cached(self):
+        self.assertIs(pool_distribution([3, 1], 2), pool_distribution((3, 1), 2))
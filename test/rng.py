@@ -0,0 +1,71 @@
+import unittest
+
+from src.rng import RandomStreams, session, DICE_STREAM, WEATHER_STREAM
+from src.dice import roll_results
+
+
+def draw(streams, name, count=5):
+    return streams.stream(name).integers(0, 1000, size=count).tolist()
+
+
+class TestRandomStreams(unittest.TestCase):
+
+    def test_seeded(self):
+        self.assertEqual(draw(RandomStreams(42), DICE_STREAM), draw(RandomStreams(42), DICE_STREAM))
+        self.assertNotEqual(draw(RandomStreams(42), DICE_STREAM),
+                            draw(RandomStreams(43), DICE_STREAM))
+
+    def test_streams_independent(self):
+        streams = RandomStreams(42)
+        expected = draw(RandomStreams(42), DICE_STREAM)
+
+        draw(streams, WEATHER_STREAM, 100)
+        self.assertEqual(draw(streams, DICE_STREAM), expected)
+        self.assertNotEqual(draw(RandomStreams(42), WEATHER_STREAM), expected)
+
+    def test_spawn(self):
+        first, second = [draw(child, DICE_STREAM) for child in RandomStreams(42).spawn(2)]
+        again = [draw(child, DICE_STREAM) for child in RandomStreams(42).spawn(3)]
+
+        self.assertNotEqual(first, second)
+        self.assertNotEqual(first, draw(RandomStreams(42), DICE_STREAM))
+        self.assertEqual([first, second], again[:2])
+
+    def test_fast_forward(self):
+        streams = RandomStreams(42)
+        streams.stream(DICE_STREAM).random(10)
+        expected = draw(streams, DICE_STREAM)
+
+        streams.fast_forward(DICE_STREAM, 10)
+        self.assertEqual(draw(streams, DICE_STREAM), expected)
+
+    def test_state(self):
+        streams = RandomStreams(42)
+        state = streams.state()
+        self.assertEqual(state, {})
+
+        draw(streams, DICE_STREAM)
+        state = streams.state()
+        expected = draw(streams, DICE_STREAM)
+
+        streams.set_state(state)
+        self.assertEqual(draw(streams, DICE_STREAM), expected)
+
+    def test_session(self):
+        # reseeding replaces the seed and streams, so restoring them leaves
+        # the session as it was for the tests after this one
+        self.addCleanup(vars(session()).update, dict(vars(session())))
+
+        session().reseed(7)
+        first = roll_results(10, 'd20', False, 0)
+        session().reseed(7)
+        self.assertEqual(roll_results(10, 'd20', False, 0), first)
+        self.assertEqual(session().seed, 7)
+
+    def test_session_restored(self):
+        streams = dict(vars(session()))
+        self.test_session()
+        self.doCleanups()
+
+        self.assertEqual(vars(session()), streams)
+        self.assertNotEqual(session().seed, 7)
@@ -0,0 +1,42 @@
+import unittest
+
+import pygame
+
+from src.spatial_index import GridIndex
+
+
+class TestGridIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = GridIndex(cell_size=100)
+        self.index.insert("a", pygame.Rect(0, 0, 50, 50))
+        self.index.insert("b", pygame.Rect(90, 90, 50, 50))
+        self.index.insert("c", pygame.Rect(120, 120, 200, 200))
+
+    def test_at(self):
+        self.assertEqual(self.index.at((10, 10)), ["a"])
+        self.assertEqual(self.index.at((130, 130)), ["b", "c"])
+        self.assertEqual(self.index.at((60, 60)), [])
+        self.assertEqual(self.index.at((-10, 10)), [])
+
+    def test_in_rect(self):
+        self.assertEqual(self.index.in_rect(pygame.Rect(0, 0, 100, 100)), ["a", "b"])
+        self.assertEqual(self.index.in_rect(pygame.Rect(0, 0, 1000, 1000)), ["a", "b", "c"])
+        self.assertEqual(self.index.in_rect(pygame.Rect(400, 0, 100, 100)), [])
+
+    def test_move_and_remove(self):
+        self.index.move("a", pygame.Rect(300, 300, 50, 50))
+        self.assertEqual(self.index.at((10, 10)), [])
+        # moving keeps the order the items were inserted in
+        self.assertEqual(self.index.at((310, 310)), ["a", "c"])
+
+        self.index.remove("c")
+        self.assertEqual(self.index.at((310, 310)), ["a"])
+        self.assertNotIn("c", self.index)
+        self.assertEqual(len(self.index), 2)
+        # the emptied cells of c are dropped, b spans four cells and a one
+        self.assertEqual(len(self.index._cells), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
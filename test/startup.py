@@ -0,0 +1,55 @@
+import builtins
+import os
+import sys
+import tempfile
+import unittest
+
+from src.startup import StartupProfiler
+
+
+class TestStartupProfiler(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        with open(os.path.join(self.directory, "startup_outer.py"), "w") as module:
+            module.write("import startup_inner\n")
+        with open(os.path.join(self.directory, "startup_inner.py"), "w") as module:
+            module.write("VALUE = 1\n")
+
+        sys.path.insert(0, self.directory)
+        self.addCleanup(sys.path.remove, self.directory)
+        for name in ("startup_outer", "startup_inner"):
+            self.addCleanup(sys.modules.pop, name, None)
+
+    def test_imports(self):
+        original_import = builtins.__import__
+        profiler = StartupProfiler()
+        profiler.start()
+        try:
+            import startup_outer
+            import startup_outer
+        finally:
+            profiler.stop()
+
+        self.assertIs(builtins.__import__, original_import)
+        self.assertEqual([(module, depth) for module, _, depth in profiler.imports],
+                         [("startup_outer", 0), ("startup_inner", 1)])
+        self.assertGreaterEqual(profiler.imports[0][1], profiler.imports[1][1])
+
+    def test_report(self):
+        profiler = StartupProfiler()
+        profiler.start()
+        with profiler.section("create screen"):
+            pass
+        profiler.mark("first frame")
+        profiler.stop()
+
+        path = os.path.join(self.directory, "startup.txt")
+        profiler.write(path)
+        with open(path) as report:
+            text = report.read()
+
+        self.assertIn("create screen", text)
+        self.assertIn("first frame", text)
@@ -0,0 +1,203 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+import pygame
+
+from src.map_view import MapView, SurfacePyramid
+from src.tiled_map import BuildingPyramid, TiledPyramid, build_tiles, image_size, load_map, \
+    prune_tiles, tile_directory
+
+RED = pygame.Color(255, 0, 0)
+BLUE = pygame.Color(0, 0, 255)
+
+
+def similar(color, expected):
+    """Opaque maps are tiled as jpg, which changes colors slightly."""
+    return all(abs(a - b) < 16 for a, b in zip(color, expected))
+
+
+class TestTiledMap(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.tiles = os.path.join(self.directory.name, "tiles")
+        self.path = os.path.join(self.directory.name, "map.png")
+
+        image = pygame.Surface((1280, 960))
+        image.fill(RED)
+        image.fill(BLUE, pygame.Rect(640, 0, 640, 960))
+        pygame.image.save(image, self.path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_build_tiles(self):
+        build_tiles(pygame.image.load(self.path), self.tiles, (320, 240), tile_size=256)
+        pyramid = TiledPyramid(self.tiles)
+
+        self.assertEqual(pyramid.sizes, [(1280, 960), (640, 480), (320, 240)])
+        self.assertEqual(len(os.listdir(os.path.join(self.tiles, "0"))), 5 * 4)
+        pyramid.close()
+
+    def test_read(self):
+        build_tiles(pygame.image.load(self.path), self.tiles, (320, 240), tile_size=256)
+        pyramid = TiledPyramid(self.tiles)
+
+        rect = pygame.Rect(600, 100, 80, 300)
+        surface, complete = pyramid.read(0, rect)
+        self.assertFalse(complete)
+        self.assertEqual(surface.get_size(), rect.size)
+        self.assertEqual(pyramid.misses, 2)
+
+        pyramid.wait()
+        surface, complete = pyramid.read(0, rect)
+        self.assertTrue(complete)
+        self.assertEqual(pyramid.hits, 2)
+        self.assertTrue(similar(surface.get_at((10, 0)), RED))
+        self.assertTrue(similar(surface.get_at((70, 299)), BLUE))
+        pyramid.close()
+
+    def test_corrupt_tile(self):
+        build_tiles(pygame.image.load(self.path), self.tiles, (320, 240), tile_size=256)
+        with open(os.path.join(self.tiles, "0", "2_0.jpg"), "wb") as tile:
+            tile.write(b"not an image")
+        pyramid = TiledPyramid(self.tiles)
+
+        rect = pygame.Rect(600, 100, 80, 300)
+        pyramid.read(0, rect)
+        pyramid.wait()
+        self.assertEqual(pyramid._pending, {})
+
+        # the preview stands in for the tile, which is not loaded again
+        surface, complete = pyramid.read(0, rect)
+        self.assertTrue(complete)
+        self.assertEqual(pyramid.misses, 2)
+        self.assertTrue(similar(surface.get_at((10, 0)), RED))
+        self.assertTrue(similar(surface.get_at((70, 299)), BLUE))
+        pyramid.close()
+
+    def test_memory_budget(self):
+        build_tiles(pygame.image.load(self.path), self.tiles, (320, 240), tile_size=256)
+        pyramid = TiledPyramid(self.tiles, memory_budget=5 * 256 * 256 * 4)
+
+        pyramid.read(0, pygame.Rect(0, 0, 1280, 960))
+        pyramid.wait()
+        self.assertLessEqual(pyramid.bytes, pyramid.memory_budget)
+        self.assertLess(len(pyramid._tiles), 5 * 4)
+        pyramid.close()
+
+    def test_levels_match_surface_pyramid(self):
+        # sides that halve evenly, otherwise smoothscale weighs pixels by the uneven ratio
+        image = pygame.Surface((704, 512), pygame.SRCALPHA)
+        for x in range(0, 704, 7):
+            image.fill((x % 256, (x * 3) % 256, 90), pygame.Rect(x, x % 512, 7, 90))
+        build_tiles(image, self.tiles, (80, 60), tile_size=64)
+        pyramid = TiledPyramid(self.tiles)
+        expected = SurfacePyramid(image, (80, 60))
+
+        self.assertEqual(pyramid.sizes, expected.sizes)
+        for index, level in enumerate(expected.levels):
+            # read() draws the tiles on an opaque black surface
+            opaque = pygame.Surface(level.get_size())
+            opaque.blit(level, (0, 0))
+            pyramid.read(index, level.get_rect())
+            pyramid.wait()
+            surface, complete = pyramid.read(index, level.get_rect())
+            self.assertTrue(complete)
+            for x in range(0, level.get_width(), 13):
+                for y in range(0, level.get_height(), 11):
+                    self.assertTrue(all(abs(a - b) <= 2 for a, b in
+                                        zip(surface.get_at((x, y)), opaque.get_at((x, y)))),
+                                    f"level {index} at {(x, y)}")
+        pyramid.close()
+
+    def test_image_size(self):
+        self.assertEqual(image_size(self.path), (1280, 960))
+        for extension in ("jpg", "bmp"):
+            path = os.path.join(self.directory.name, f"map.{extension}")
+            pygame.image.save(pygame.Surface((300, 200)), path)
+            self.assertEqual(image_size(path), (300, 200), extension)
+
+        path = os.path.join(self.directory.name, "map.tga")
+        pygame.image.save(pygame.Surface((300, 200)), path)
+        self.assertIsNone(image_size(path))
+
+    def test_load_map(self):
+        threads = []
+
+        def load_image(path):
+            threads.append(threading.current_thread())
+            return image_load(path)
+
+        image_load = pygame.image.load
+        with patch("pygame.image.load", side_effect=load_image) as load:
+            self.assertIsInstance(load_map(self.path, (320, 240), self.tiles), SurfacePyramid)
+            self.assertFalse(os.path.exists(self.tiles))
+            load.assert_called_once_with(self.path)
+
+            load.reset_mock()
+            pyramid = load_map(self.path, (320, 240), self.tiles, threshold=1000)
+            self.assertIsInstance(pyramid, BuildingPyramid)
+            self.assertEqual(pyramid.sizes, [(1280, 960), (640, 480), (320, 240)])
+            pyramid.wait()
+            self.assertEqual(threads[:1], [threading.main_thread()], "only the small map")
+        self.assertEqual(pyramid.directory, tile_directory(self.path, self.tiles))
+        self.assertIsInstance(pyramid.pyramid, TiledPyramid)
+        pyramid.close()
+
+        # the tiles are reused until the map file changes
+        with patch("src.tiled_map.build_tiles") as build:
+            pyramid = load_map(self.path, (320, 240), self.tiles)
+            self.assertIsInstance(pyramid, TiledPyramid)
+            pyramid.close()
+            build.assert_not_called()
+
+        os.utime(self.path, ns=(0, 0))
+        self.assertNotEqual(tile_directory(self.path, self.tiles), pyramid.directory)
+
+    def test_prune_tiles(self):
+        pyramid = load_map(self.path, (320, 240), self.tiles, threshold=1000)
+        pyramid.wait()
+        pyramid.close()
+        interrupted = os.path.join(self.tiles, "interrupted")
+        os.makedirs(interrupted)
+
+        self.assertEqual(prune_tiles(self.tiles), [])
+        os.utime(interrupted, (0, 0))
+        self.assertEqual(prune_tiles(self.tiles), [interrupted])
+
+        os.utime(self.path, ns=(0, 0))
+        self.assertEqual(prune_tiles(self.tiles, keep=[pyramid.directory]), [])
+        self.assertEqual(prune_tiles(self.tiles), [pyramid.directory])
+        self.assertEqual(os.listdir(self.tiles), [])
+
+    def test_close_while_building(self):
+        pyramid = BuildingPyramid(self.path, os.path.join(self.tiles, "map"),
+                                  [(1280, 960), (640, 480), (320, 240)], (320, 240))
+        pyramid.close()
+        pyramid.wait()
+        self.assertFalse(os.path.exists(os.path.join(self.tiles, "map", "meta.json")))
+
+    def test_map_view_loading(self):
+        view = MapView(load_map(self.path, (320, 240), self.tiles, threshold=1000), (320, 240))
+        screen = pygame.Surface((320, 240))
+
+        view.draw(screen, 4.0, (0, 0))
+        self.assertTrue(view.loading, "tiles are building")
+
+        view.pyramid.wait()
+        view.draw(screen, 4.0, (0, 0))
+        self.assertTrue(view.loading, "tiles are loading")
+
+        view.pyramid.wait()
+        view.draw(screen, 4.0, (0, 0))
+        self.assertFalse(view.loading)
+        self.assertTrue(similar(screen.get_at((10, 10)), RED))
+        view.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import gc
+import unittest
+import weakref
+
+from src.initiative import InitiativeTracker
+from src.turn_engine import TurnEngine, START_OF_TURN
+
+
+class TestTurnEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.tracker = InitiativeTracker()
+        self.alex = self.tracker.create_character("Alex", 15, 10)
+        self.jeff = self.tracker.create_character("Jeff", 10, 10)
+        self.seth = self.tracker.create_character("Seth", 5, 10)
+        self.engine = TurnEngine(self.tracker)
+
+    def turns(self, count):
+        return [(self.engine.round, self.engine.next_turn().name) for _ in range(count)]
+
+    def test_next_turn(self):
+        self.assertListEqual(self.turns(4), [(0, "Alex"), (1, "Jeff"), (1, "Seth"), (1, "Alex")])
+        self.assertEqual(self.engine.round, 2)
+        self.assertEqual(self.engine.turns_taken(self.alex), 2)
+
+    def test_next_turn_empty(self):
+        self.assertIsNone(TurnEngine(InitiativeTracker()).next_turn())
+
+    def test_order_changes(self):
+        self.engine.next_turn()
+        ogre = self.tracker.create_character("Ogre", 12, 30)
+        self.tracker.remove_character(self.alex)
+        self.assertEqual(self.engine.next_turn(), ogre)
+
+        self.seth.initiative = 20
+        self.assertEqual(self.engine.next_turn(), self.jeff)
+        self.assertEqual(self.engine.next_turn(), self.seth)
+        self.assertEqual(self.engine.round, 2)
+
+    def test_effects(self):
+        self.engine.next_turn()
+        stunned = self.engine.add_effect(self.jeff, "stunned", turns=1)
+        blessed = self.engine.add_effect(self.jeff, "blessed", turns=2, ends=START_OF_TURN)
+        fog = self.engine.add_round_effect("fog", rounds=2)
+        self.assertListEqual(self.engine.effects(self.jeff), [stunned, blessed])
+
+        self.engine.next_turn()
+        self.assertListEqual(self.engine.expired, [])
+        self.engine.next_turn()
+        self.assertListEqual(self.engine.expired, [stunned])
+
+        self.turns(2)
+        self.assertListEqual(self.engine.expired, [blessed])
+
+        self.engine.next_turn()
+        self.assertListEqual(self.engine.effects(), [fog])
+        self.engine.next_turn()
+        self.assertListEqual(self.engine.expired, [fog])
+        self.assertListEqual(self.engine.effects(), [])
+
+    def test_remove_effect(self):
+        poisoned = self.engine.add_effect(self.seth, "poisoned", turns=3)
+        self.engine.remove_effect(poisoned)
+        self.assertListEqual(self.engine.effects(self.seth), [])
+
+    def test_ready(self):
+        self.engine.next_turn()
+        self.engine.ready("attack when the door opens")
+        self.assertEqual(self.engine.trigger(self.alex), "attack when the door opens")
+        self.assertIsNone(self.engine.trigger(self.alex))
+
+        self.engine.ready("shoot")
+        self.turns(3)
+        self.assertIsNone(self.engine.trigger(self.alex), "expires on next turn")
+
+    def test_delay(self):
+        self.turns(2)
+        self.assertEqual(self.engine.delay(), self.seth)
+        self.assertEqual(self.engine.next_turn(), self.alex)
+        self.assertIn(self.jeff, self.engine.delayed)
+
+        self.assertEqual(self.engine.resume(self.jeff), self.jeff)
+        self.assertEqual(self.jeff.initiative, 15)
+        self.assertEqual(self.engine.next_turn(), self.seth)
+        self.assertListEqual(self.turns(3), [(2, "Alex"), (3, "Jeff"), (3, "Seth")])
+
+    def test_all_delayed(self):
+        self.engine.next_turn()
+        self.engine.delay()
+        self.engine.delay()
+        self.assertEqual(self.engine.delay(), self.alex)
+        self.assertEqual(self.engine.round, 2)
+        self.assertEqual(self.engine.delayed, set())
+        self.assertListEqual(self.turns(2), [(2, "Jeff"), (2, "Seth")])
+
+    def test_removed_pruned(self):
+        self.engine.next_turn()
+        self.engine.add_effect(self.alex, "stunned")
+        self.engine.ready("attack")
+        self.engine.delay()
+
+        self.tracker.remove_character(self.alex)
+        self.tracker.remove_character(self.jeff)
+        for kept in (self.engine._turns, self.engine._acted, self.engine._effects,
+                     self.engine.readied):
+            self.assertNotIn(self.alex, kept)
+        self.assertNotIn(self.jeff, self.engine._turns)
+        self.assertEqual(self.engine.next_turn(), self.seth)
+
+    def test_close(self):
+        engine = TurnEngine(self.tracker)
+        engine.close()
+        engine.close()
+        self.assertEqual(self.tracker.listeners, [self.engine._tracker_changed])
+
+        reference = weakref.ref(engine)
+        del engine
+        gc.collect()
+        self.assertIsNone(reference())
+
+    def test_delay_skipped(self):
+        self.engine.next_turn()
+        self.engine.delay()
+        self.assertListEqual(self.turns(3), [(1, "Seth"), (1, "Jeff"), (2, "Seth")])